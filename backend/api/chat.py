@@ -1,13 +1,28 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from models.database import db, ChatSession, ChatMessage, Product
 from utils.chatbot_engine import ChatbotEngine
+from utils.projection import parse_projection
+from utils.product_json import product_fragments, fragments_response
+from utils.compression import compression
+from utils.chat_sessions import session_resolver
+from utils.chat_templates import response_templates
+from utils.chat_writer import chat_writer, flush_chat_writes
+from utils.conditional import conditional_get, chat_session_stamp
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_filter
+from config.config import Config
 import uuid
 from datetime import datetime
 
 chat_bp = Blueprint('chat', __name__)
-chatbot = ChatbotEngine()
+chatbot = ChatbotEngine(
+    search_backend=Config.CHAT_SEARCH_BACKEND,
+    search_mode=Config.CHAT_SEARCH_MODE,
+    cache_size=Config.CHAT_CACHE_SIZE,
+    cache_ttl=Config.CHAT_CACHE_TTL
+)
 
 @chat_bp.route('/message', methods=['POST'])
+@compression(gzip_level=Config.CHAT_COMPRESSION_GZIP_LEVEL, brotli_quality=Config.CHAT_COMPRESSION_BROTLI_QUALITY)
 def process_message():
     """Process chatbot message and return response"""
     try:
@@ -22,69 +37,159 @@ def process_message():
         if not message:
             return jsonify({'error': 'Message cannot be empty'}), 400
         
-        # Get or create chat session
-        chat_session = ChatSession.query.filter_by(session_id=session_id).first()
-        if not chat_session:
-            chat_session = ChatSession(session_id=session_id)
-            db.session.add(chat_session)
-            db.session.commit()
+        try:
+            projection = parse_projection(data.get('fields'), data.get('view', Config.CHAT_PRODUCT_VIEW))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Get or create chat session; cached sessions resolve without a query
+        session_pk = session_resolver().resolve(session_id)
         
         # Process message with chatbot engine
         response_data = chatbot.process_message(message)
         
-        # Save message and response to database
-        chat_message = ChatMessage(
-            session_id=chat_session.id,
-            message=message,
-            response=response_data['response'],
-            message_type=response_data.get('type', 'text')
-        )
-        db.session.add(chat_message)
-        
-        # Update session timestamp
-        chat_session.updated_at = datetime.utcnow()
-        db.session.commit()
-        
-        return jsonify({
+        # Save message and response, updating the session counters; fixed replies are stored
+        # by reference, and with write-behind the row is queued and gets its id when written
+        message_type = response_data.get('type', 'text')
+        stored_response, template_id = response_templates().compact(response_data['response'], message_type)
+        writer = chat_writer()
+        if writer is not None:
+            writer.append(session_pk, message, stored_response, message_type, template_id, session_id=session_id)
+            message_id = None
+        else:
+            chat_message = session_resolver().add_message(
+                session_id,
+                message=message,
+                response=stored_response,
+                message_type=message_type,
+                template_id=template_id
+            )
+            message_id = chat_message.id
+        
+        products = [product_fragments.record(product, projection) for product in response_data.get('products', [])]
+        
+        return fragments_response({
             'response': response_data['response'],
             'type': response_data.get('type', 'text'),
-            'products': response_data.get('products', []),
             'session_id': session_id,
-            'message_id': chat_message.id
-        })
+            'message_id': message_id
+        }, products)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _message_id(name):
+    """Optional message id query argument; raises ValueError when it is not an integer"""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a message id')
+
+def _history_stamp(session_id):
+    """Session stamp taken after writing queued messages, so the ETag and page include them"""
+    flush_chat_writes()
+    return chat_session_stamp(session_id)
+
 @chat_bp.route('/history/<session_id>', methods=['GET'])
+@conditional_get(_history_stamp)
 def get_chat_history(session_id):
-    """Get chat history for a session"""
+    """
+    Get chat history for a session, oldest message first.
+
+    Without cursors this is the latest limit messages. before=<id> pages
+    back to the limit messages preceding that message; after=<id>, or its
+    delta-sync alias since=<id>, returns the messages added after it.
+    has_more tells whether another page lies in the same direction. The
+    ETag changes with every message, so pollers get 304 until one arrives.
+    """
     try:
         chat_session = ChatSession.query.filter_by(session_id=session_id).first()
         
         if not chat_session:
             return jsonify({'error': 'Session not found'}), 404
         
-        messages = ChatMessage.query.filter_by(session_id=chat_session.id)\
-                                  .order_by(ChatMessage.timestamp.asc()).all()
+        limit = request.args.get('limit', current_app.config['CHAT_HISTORY_LIMIT'], type=int)
+        limit = min(max(limit, 1), current_app.config['CHAT_HISTORY_MAX_LIMIT'])
+        before = _message_id('before')
+        after = _message_id('after')
+        since = _message_id('since')
+        if after is not None and since is not None:
+            return jsonify({'error': 'Pass only one of after and since'}), 400
+        after = after if after is not None else since
+        if before is not None and after is not None:
+            return jsonify({'error': 'Pass only one of before and after'}), 400
+        
+        query = ChatMessage.query.filter(ChatMessage.session_id == chat_session.id)
+        if after is not None:
+            messages = query.filter(ChatMessage.id > after).order_by(ChatMessage.id.asc()).limit(limit + 1).all()
+            has_more = len(messages) > limit
+            messages = messages[:limit]
+        else:
+            if before is not None:
+                query = query.filter(ChatMessage.id < before)
+            # Newest first to take the page next to the cursor, then back to reading order
+            messages = query.order_by(ChatMessage.id.desc()).limit(limit + 1).all()
+            has_more = len(messages) > limit
+            messages = messages[:limit][::-1]
         
         return jsonify({
             'session_id': session_id,
             'messages': [msg.to_dict() for msg in messages],
-            'session_info': chat_session.to_dict()
+            'session_info': chat_session.to_dict(),
+            'has_more': has_more,
+            'oldest_id': messages[0].id if messages else None,
+            'newest_id': messages[-1].id if messages else None
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _session_key(chat_session):
+    return (chat_session.updated_at.isoformat(), chat_session.id)
+
 @chat_bp.route('/sessions', methods=['GET'])
 def get_chat_sessions():
-    """Get all chat sessions"""
+    """
+    Get chat sessions, most recently active first.
+
+    Pages by keyset on (updated_at, id): pass the previous response's
+    next_cursor as cursor to continue, so deep pages cost the same as the
+    first. user_id restricts the list to one user's sessions. Message
+    counts come from the maintained session columns, not the messages.
+    """
     try:
-        sessions = ChatSession.query.order_by(ChatSession.updated_at.desc()).all()
+        flush_chat_writes()
+        per_page = max(request.args.get('per_page', 20, type=int), 1)
+        cursor = request.args.get('cursor')
+        user_id = request.args.get('user_id', type=int)
+        
+        query = ChatSession.query
+        if user_id is not None:
+            query = query.filter(ChatSession.user_id == user_id)
+        order = [(ChatSession.updated_at, True), (ChatSession.id, True)]
+        if cursor:
+            updated_at, session_pk = decode_cursor(cursor, 'sessions', len(order))
+            try:
+                after = (datetime.fromisoformat(updated_at), int(session_pk))
+            except (TypeError, ValueError):
+                raise InvalidCursor('Invalid cursor for this query')
+            query = query.filter(keyset_filter(order, after))
+        sessions = query.order_by(ChatSession.updated_at.desc(), ChatSession.id.desc()).limit(per_page + 1).all()
+        
+        next_cursor = encode_cursor('sessions', _session_key(sessions[per_page - 1])) \
+            if len(sessions) > per_page else None
         return jsonify({
-            'sessions': [session.to_dict() for session in sessions]
+            'sessions': [session.to_dict() for session in sessions[:per_page]],
+            'per_page': per_page,
+            'next_cursor': next_cursor
         })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -92,16 +197,15 @@ def get_chat_sessions():
 def reset_chat_session(session_id):
     """Reset/clear a chat session"""
     try:
+        # Queued messages would otherwise land after the reset
+        flush_chat_writes()
         chat_session = ChatSession.query.filter_by(session_id=session_id).first()
         
         if not chat_session:
             return jsonify({'error': 'Session not found'}), 404
         
-        # Delete all messages in the session
-        ChatMessage.query.filter_by(session_id=chat_session.id).delete()
-        
-        # Update session timestamp
-        chat_session.updated_at = datetime.utcnow()
+        # Delete all messages in the session and zero its counters
+        chat_session.reset()
         db.session.commit()
         
         return jsonify({
@@ -111,3 +215,15 @@ def reset_chat_session(session_id):
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@chat_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get chatbot response cache counters"""
+    try:
+        if chatbot.response_cache is None:
+            return jsonify({'enabled': False})
+        stats = chatbot.response_cache.stats()
+        stats['enabled'] = True
+        return jsonify(stats)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
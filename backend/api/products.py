@@ -1,108 +1,510 @@
-from flask import Blueprint, request, jsonify
-from models.database import db, Product
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
+from models.database import db, Product, ProductFeature
 from sqlalchemy import or_, and_
+from utils.catalog_index import catalog_index, DEFAULT_RATING_WEIGHT
+from utils.keyword_matcher import tokenize
+from utils.features import normalize_feature
+from utils import fts
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter, keyset_page
+from utils.catalog_sync import catalog_version
+from utils.response_cache import ResponseCache
+from utils.conditional import conditional_get, catalog_stamp, product_stamp
+from utils.projection import parse_projection, Projection, PRODUCT_FIELDS
+from utils.catalog_import import import_products as bulk_import, read_rows
+from utils.product_json import product_fragments, fragments_response, fragment_response, with_extras, dumps
+from config.config import Config
+import hmac
+import io
 import json
+import math
+from datetime import datetime, timedelta, timezone
 
 products_bp = Blueprint('products', __name__)
 
+facets_cache = ResponseCache(max_entries=Config.FACETS_CACHE_SIZE, ttl=Config.FACETS_CACHE_TTL)
+
+# Search ordering for sort=rating and the ILIKE path; id makes the key unique
+RATING_ORDER = [(Product.rating, True), (Product.price, False), (Product.id, False)]
+
+def _flag(name, default):
+    """Read a boolean query parameter such as include_total=false"""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+def _page_count(total, per_page):
+    """Number of pages, or None when the total was not counted"""
+    if total is None:
+        return None
+    return math.ceil(total / per_page) if per_page else 0
+
+def _projection():
+    """Fields requested with fields= or view=card, or None for the full product"""
+    return parse_projection(request.args.get('fields'), request.args.get('view'))
+
+def _select(query, projection, extra=()):
+    """Select only the projection's columns (plus extra ones) instead of whole entities"""
+    # id and updated_at key the pre-encoded fragment cache
+    return query.with_entities(*projection.columns(('id', 'updated_at') + tuple(extra))) if projection else query
+
+def _serialize(rows, projection):
+    """Pre-encoded JSON fragments for entities, or for rows selected with _select"""
+    if projection is None:
+        return [product_fragments.product(product) for product in rows]
+    return [product_fragments.row(row, projection) for row in rows]
+
+def _features():
+    """Feature phrases from repeated feature= arguments; a product must have every one"""
+    return [value.strip() for value in request.args.getlist('feature') if value.strip()]
+
+def _list_query():
+    """Products matched by the listing's filters"""
+    query = Product.query
+    category = request.args.get('category', '')
+    if category:
+        query = query.filter(Product.category.ilike(f'%{category}%'))
+    return query
+
 @products_bp.route('/', methods=['GET'])
+@conditional_get(lambda: catalog_stamp())
 def get_all_products():
-    """Get all products with pagination"""
+    """
+    Get all products with pagination.
+
+    Passing cursor (empty for the first page) switches from page/per_page
+    to keyset pagination by id; the response then carries next_cursor.
+    include_total=false skips the COUNT(*) in either mode. fields= and
+    view=card select a subset of columns.
+    """
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
-        category = request.args.get('category', '')
+        cursor = request.args.get('cursor')
+        include_total = _flag('include_total', True)
+        projection = _projection()
         
-        query = Product.query
+        query = _list_query()
         
-        if category:
-            query = query.filter(Product.category.ilike(f'%{category}%'))
+        if cursor is not None:
+            per_page = max(per_page, 1)
+            total = query.count() if include_total else None
+            rows, next_cursor = keyset_page(_select(query, projection), [(Product.id, False)], cursor, 'id',
+                                            per_page, key=lambda product: (product.id,))
+            return fragments_response({
+                'total': total,
+                'pages': _page_count(total, per_page),
+                'per_page': per_page,
+                'next_cursor': next_cursor
+            }, _serialize(rows, projection))
         
-        products = query.paginate(
+        products = _select(query, projection).paginate(
             page=page, 
             per_page=per_page, 
-            error_out=False
+            error_out=False,
+            count=include_total
         )
         
-        return jsonify({
-            'products': [product.to_dict() for product in products.items],
+        return fragments_response({
             'total': products.total,
-            'pages': products.pages,
+            'pages': products.pages if include_total else None,
             'current_page': page,
             'per_page': per_page
-        })
+        }, _serialize(products.items, projection))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _relevance_search(text, category, brand, min_price, max_price, offset, per_page, after, rating_weight, features):
+    """BM25 ranking over name, description, brand and features from the catalog index"""
+    catalog_index.ensure_loaded()
+    return catalog_index.search_text(
+        text,
+        category=category or None,
+        brand=brand or None,
+        price_min=min_price,
+        price_max=max_price,
+        offset=offset,
+        limit=per_page,
+        rating_weight=rating_weight,
+        after=after,
+        features=features
+    )
+
+def _ilike_search(text, category, brand, min_price, max_price, offset, per_page, after, include_total, projection,
+                  features):
+    """Substring search ordered by rating DESC, price ASC"""
+    # Build search query
+    search_query = Product.query
+    
+    # Text search in name, description, and features
+    search_terms = or_(
+        Product.name.ilike(f'%{text}%'),
+        Product.description.ilike(f'%{text}%'),
+        Product.features.ilike(f'%{text}%'),
+        Product.brand.ilike(f'%{text}%')
+    )
+    search_query = search_query.filter(search_terms)
+    
+    # Apply filters
+    if category:
+        search_query = search_query.filter(Product.category.ilike(f'%{category}%'))
+    
+    if brand:
+        search_query = search_query.filter(Product.brand.ilike(f'%{brand}%'))
+    
+    if min_price is not None:
+        search_query = search_query.filter(Product.price >= min_price)
+    
+    if max_price is not None:
+        search_query = search_query.filter(Product.price <= max_price)
+    
+    for phrase in features:
+        search_query = search_query.filter(Product.id.in_(ProductFeature.product_ids(phrase)))
+    
+    total = search_query.order_by(None).count() if include_total else None
+    
+    # Keyset on (rating, price, id) when continuing from a cursor, OFFSET otherwise
+    if after is not None:
+        search_query = search_query.filter(keyset_filter(RATING_ORDER, after))
+    search_query = search_query.order_by(Product.rating.desc(), Product.price.asc(), Product.id.asc())
+    rows = _select(search_query, projection, ('rating', 'price')).offset(offset).limit(per_page).all()
+    last_key = (rows[-1].rating, rows[-1].price, rows[-1].id) if rows else None
+    return total, _serialize(rows, projection), last_key
+
+def _fts_search(text, category, brand, min_price, max_price, offset, per_page, after, include_total, sort, highlight,
+                projection, features):
+    """SQLite FTS5 prefix search ranked by bm25(), with optional highlighted snippets"""
+    total, matches, last_key = fts.search(
+        text,
+        category=category or None,
+        brand=brand or None,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        offset=offset,
+        limit=per_page,
+        highlight=highlight,
+        after=after,
+        count=include_total,
+        features=features
+    )
+    query = _select(Product.query, projection).filter(Product.id.in_([pid for pid, _ in matches]))
+    rows = {row.id: row for row in query}
+    products = []
+    for product_id, extras in matches:
+        if product_id in rows:
+            products.append(with_extras(_serialize([rows[product_id]], projection)[0], extras))
+    return total, products, last_key
+
 @products_bp.route('/search', methods=['GET'])
+@conditional_get(lambda: catalog_stamp())
 def search_products():
-    """Search products by query"""
+    """
+    Search products by query.
+
+    The index backend with sort=relevance ranks by BM25F and matches a
+    product having ANY query term (OR of terms, prefixes included), so
+    'gaming laptop' also returns laptops not made for gaming, ranked below
+    those that are. The fts backend requires every term; the sql backend
+    and sort=rating keep the older match of the whole query as one
+    substring (ILIKE '%gaming laptop%'). A query matching nothing is run
+    with typo corrections from the catalog vocabulary instead, reported as
+    corrected_query, on every page and cursor continuation alike.
+
+    Pages by page/per_page, or by keyset when cursor is given (empty for
+    the first page); cursors are only valid for the backend and sort that
+    issued them. include_total=false skips counting the matches. fields=
+    and view=card select a subset of columns. Each feature= (repeatable,
+    e.g. feature=32gb ram) must match one of a product's parsed features.
+    """
     try:
         query = request.args.get('q', '').strip()
         category = request.args.get('category', '')
         min_price = request.args.get('min_price', type=float)
         max_price = request.args.get('max_price', type=float)
         brand = request.args.get('brand', '')
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(request.args.get('per_page', 20, type=int), 1)
+        sort = request.args.get('sort', 'relevance')
+        rating_weight = request.args.get('rating_weight', DEFAULT_RATING_WEIGHT, type=float)
+        backend = request.args.get('backend', current_app.config['PRODUCT_SEARCH_BACKEND'])
+        highlight = _flag('highlight', False)
+        cursor = request.args.get('cursor')
+        include_total = _flag('include_total', True)
+        projection = _projection()
+        features = _features()
         
         if not query:
             return jsonify({'error': 'Search query is required'}), 400
         
-        # Build search query
-        search_query = Product.query
+        if sort not in ('relevance', 'rating'):
+            return jsonify({'error': "sort must be 'relevance' or 'rating'"}), 400
         
-        # Text search in name, description, and features
-        search_terms = or_(
-            Product.name.ilike(f'%{query}%'),
-            Product.description.ilike(f'%{query}%'),
-            Product.features.ilike(f'%{query}%'),
-            Product.brand.ilike(f'%{query}%')
-        )
-        search_query = search_query.filter(search_terms)
+        if backend not in ('index', 'fts', 'sql'):
+            return jsonify({'error': "backend must be 'index', 'fts' or 'sql'"}), 400
         
-        # Apply filters
-        if category:
-            search_query = search_query.filter(Product.category.ilike(f'%{category}%'))
+        # Without FTS5 support the full-text backend falls back to the ILIKE path
+        if backend == 'fts' and not fts.fts_enabled():
+            backend = 'sql'
         
-        if brand:
-            search_query = search_query.filter(Product.brand.ilike(f'%{brand}%'))
+        # Cursors carry the sort key of the ordering they were issued for
+        if backend == 'index' and sort == 'relevance':
+            ordering, key_size = f'index:{rating_weight}', 4
+        elif backend == 'fts':
+            ordering, key_size = f'fts:{sort}', 3
+        else:
+            ordering, key_size = 'rating', 3
+        after = decode_cursor(cursor, ordering, key_size) if cursor else None
+        offset = 0 if cursor is not None else (page - 1) * per_page
         
-        if min_price is not None:
-            search_query = search_query.filter(Product.price >= min_price)
+        def run(text, offset, after):
+            if backend == 'fts':
+                return _fts_search(text, category, brand, min_price, max_price, offset, per_page, after,
+                                   include_total, sort, highlight, projection, features)
+            if backend == 'index' and sort == 'relevance':
+                total, products, last_key = _relevance_search(text, category, brand, min_price, max_price, offset,
+                                                              per_page, after, rating_weight, features)
+                return total, [product_fragments.record(product, projection) for product in products], last_key
+            return _ilike_search(text, category, brand, min_price, max_price, offset, per_page, after, include_total,
+                                 projection, features)
         
-        if max_price is not None:
-            search_query = search_query.filter(Product.price <= max_price)
+        total, products, last_key = run(query, offset, after)
         
-        # Execute paginated query
-        products = search_query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        # Only when exact matching finds nothing, retry with typo corrections from the trigram index.
+        # Later pages and cursors only get an empty page here, so check the first page before
+        # correcting; pages of a corrected search then continue on the corrected query too.
+        corrected_query = None
+        if not products and (after is None and offset == 0 or not run(query, 0, None)[1]):
+            catalog_index.ensure_loaded()
+            tokens = tokenize(query)
+            corrections = catalog_index.correct_terms(tokens)
+            if corrections:
+                corrected_query = ' '.join(corrections.get(token, token) for token in tokens)
+                total, products, last_key = run(corrected_query, offset, after)
         
-        return jsonify({
-            'products': [product.to_dict() for product in products.items],
-            'total': products.total,
-            'pages': products.pages,
-            'current_page': page,
+        if not include_total:
+            total = None
+        response = {
+            'total': total,
+            'pages': _page_count(total, per_page),
             'per_page': per_page,
-            'query': query
-        })
+            'query': query,
+            'corrected_query': corrected_query,
+            'sort': sort,
+            'backend': backend,
+            'features': features
+        }
+        if cursor is not None:
+            # A short page means the results are exhausted
+            response['next_cursor'] = encode_cursor(ordering, last_key) if len(products) == per_page else None
+        else:
+            response['current_page'] = page
+        return fragments_response(response, products)
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@products_bp.route('/facets', methods=['GET'])
+@conditional_get(lambda: catalog_stamp())
+def get_facets():
+    """
+    Get category, brand, price bucket and rating band counts.
+
+    Accepts the search filters (q, category, brand, min_price, max_price,
+    feature) so counts describe the current results. Cached per catalog version,
+    which follows commits from other processes through the persisted stamp.
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        category = request.args.get('category', '').strip().lower()
+        brand = request.args.get('brand', '').strip().lower()
+        min_price = request.args.get('min_price', type=float)
+        max_price = request.args.get('max_price', type=float)
+        features = tuple(sorted(set(normalize_feature(phrase) for phrase in _features())))
+        
+        catalog_index.ensure_loaded()
+        version = catalog_version()
+        terms = tuple(tokenize(query))
+        key = (version, terms, category, brand, min_price, max_price, features)
+        facets = facets_cache.get(key)
+        if facets is None:
+            facets = catalog_index.facets(terms or None, category or None, brand or None, min_price, max_price,
+                                          features or None)
+            facets_cache.set(key, facets)
+        return jsonify(dict(facets, catalog_version=version))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _batch_ids():
+    """
+    Requested ids, deduplicated in order, from ?ids=1,2,3 or a JSON body {"ids": [...]}.
+
+    Raises ValueError for malformed ids or more than PRODUCT_BATCH_MAX of them.
+    """
+    if request.method == 'POST':
+        raw = (request.get_json(silent=True) or {}).get('ids')
+        if not isinstance(raw, list):
+            raise ValueError('ids must be a JSON array of product ids')
+    else:
+        raw = [value for value in request.args.get('ids', '').split(',') if value.strip()]
+    try:
+        ids = list(dict.fromkeys(int(value) for value in raw))
+    except (TypeError, ValueError):
+        raise ValueError('ids must be integers')
+    if not ids:
+        raise ValueError('ids is required')
+    limit = current_app.config['PRODUCT_BATCH_MAX']
+    if len(ids) > limit:
+        raise ValueError(f'At most {limit} ids per batch')
+    return ids
+
+def _batch_stamp():
+    try:
+        _batch_ids()
+    except ValueError:
+        # Let the view answer 400
+        return None
+    return catalog_stamp()
+
+@products_bp.route('/batch', methods=['GET', 'POST'])
+@conditional_get(_batch_stamp)
+def get_products_batch():
+    """
+    Get several products by id with one IN query.
+
+    products follows the requested order with null for unknown ids, which
+    are also listed in missing. Use POST with {"ids": [...]} for long lists;
+    fields= and view=card work as on the other product endpoints.
+    """
+    try:
+        ids = _batch_ids()
+        projection = _projection()
+        rows = _select(Product.query, projection).filter(Product.id.in_(ids)).all()
+        found = dict(zip((row.id for row in rows), _serialize(rows, projection)))
+        return fragments_response({
+            'missing': [product_id for product_id in ids if product_id not in found],
+            'requested': len(ids)
+        }, [found.get(product_id, b'null') for product_id in ids])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _parse_timestamp(value):
+    """Parse an ISO 8601 timestamp into naive UTC like the updated_at column; raises ValueError"""
+    try:
+        timestamp = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError('updated_since must be an ISO 8601 timestamp')
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+@products_bp.route('/export', methods=['GET'])
+def export_products():
+    """
+    Stream the catalog as newline-delimited JSON, one product per line.
+
+    Rows are read in batches of EXPORT_BATCH_SIZE from a streaming cursor
+    and encoded as they arrive, so memory stays flat however large the
+    catalog is. Lines come in (updated_at, id) order. updated_since=<ISO
+    timestamp> limits the export to products changed at or after it; the
+    X-Export-Watermark header is the value to pass on the next sync.
+
+    The watermark is the export's start minus EXPORT_OVERLAP_SECONDS, so
+    a write stamped before the start but committed after this export read
+    past it is still caught next time. Consecutive syncs therefore overlap,
+    and consumers must dedupe by id, keeping the latest updated_at.
+    Deleted products are not reported. fields= and view=card work as on
+    the other product endpoints.
+    """
+    try:
+        projection = _projection() or Projection(PRODUCT_FIELDS)
+        updated_since = request.args.get('updated_since')
+        watermark = datetime.utcnow() - timedelta(seconds=current_app.config['EXPORT_OVERLAP_SECONDS'])
+        
+        query = _select(Product.query, projection)
+        if updated_since:
+            query = query.filter(Product.updated_at >= _parse_timestamp(updated_since))
+        query = query.order_by(Product.updated_at.asc(), Product.id.asc())
+        batch_size = current_app.config['EXPORT_BATCH_SIZE']
+        
+        def generate():
+            result = db.session.execute(query.statement, execution_options={'yield_per': batch_size})
+            try:
+                for rows in result.partitions():
+                    yield b''.join(dumps(projection.from_row(row)) + b'\n' for row in rows)
+            except Exception as e:
+                # Headers are already sent; a truncated body is all the client can be told
+                print(f"Warning: Catalog export failed: {e}")
+            finally:
+                result.close()
+        
+        response = current_app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+        response.headers['X-Export-Watermark'] = watermark.isoformat() + 'Z'
+        return response
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Content types accepted by /import when no format= is given
+IMPORT_CONTENT_TYPES = {'text/csv': 'csv', 'application/x-ndjson': 'jsonl', 'application/jsonl': 'jsonl'}
+
+@products_bp.route('/import', methods=['POST'])
+def import_products():
+    """
+    Bulk upsert products keyed on sku from a CSV or JSON Lines request body.
+
+    The body is read as a stream and written in IMPORT_BATCH_SIZE
+    transactions; the response reports created, updated and skipped rows
+    and the rows per second. The format comes from format=csv|jsonl or the
+    Content-Type. Requires Authorization: Bearer <IMPORT_API_TOKEN>.
+    """
+    try:
+        token = current_app.config['IMPORT_API_TOKEN']
+        if not token:
+            return jsonify({'error': 'Catalog import is disabled'}), 403
+        supplied = request.headers.get('Authorization', '')
+        if supplied.startswith('Bearer '):
+            supplied = supplied[len('Bearer '):]
+        supplied = supplied.strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return jsonify({'error': 'Invalid import token'}), 401
         
+        fmt = request.args.get('format') or IMPORT_CONTENT_TYPES.get(request.mimetype)
+        rows = read_rows(io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline=''), fmt)
+        report = bulk_import(rows, batch_size=current_app.config['IMPORT_BATCH_SIZE'])
+        return jsonify(report.to_dict())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/<int:product_id>', methods=['GET'])
+@conditional_get(lambda product_id: product_stamp(product_id))
 def get_product(product_id):
     """Get specific product by ID"""
     try:
+        projection = _projection()
+        if projection:
+            row = _select(Product.query, projection).filter(Product.id == product_id).first()
+            if row is None:
+                return jsonify({'error': 'Product not found'}), 404
+            return fragment_response(product_fragments.row(row, projection))
         product = Product.query.get_or_404(product_id)
-        return jsonify(product.to_dict())
+        return fragment_response(product_fragments.product(product))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/categories', methods=['GET'])
+@conditional_get(lambda: catalog_stamp())
 def get_categories():
     """Get all unique product categories"""
     try:
@@ -113,6 +515,7 @@ def get_categories():
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/brands', methods=['GET'])
+@conditional_get(lambda: catalog_stamp())
 def get_brands():
     """Get all unique product brands"""
     try:
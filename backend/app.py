@@ -13,6 +13,11 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     
+    # Encode JSON responses with orjson when it is installed
+    from utils import product_json
+    product_json.configure(app.config['JSON_ENCODER'])
+    app.json = product_json.FastJSONProvider(app)
+    
     # Initialize extensions
     db.init_app(app)
     
@@ -24,6 +29,20 @@ def create_app():
     
     jwt = JWTManager(app)
     
+    # gzip/brotli for JSON responses above COMPRESSION_MIN_SIZE
+    from utils.compression import init_compression
+    init_compression(app)
+    
+    # Chat storage caches: session_id -> ChatSession.id, and fixed reply -> template id
+    from utils.chat_sessions import init_session_resolver
+    init_session_resolver(app)
+    from utils.chat_templates import init_response_templates
+    init_response_templates(app)
+    
+    # Batched write-behind for chat messages when CHAT_WRITE_BEHIND is set
+    from utils.chat_writer import init_chat_writer
+    init_chat_writer(app)
+    
     # Register blueprints
     app.register_blueprint(products_bp, url_prefix='/api/products')
     app.register_blueprint(chat_bp, url_prefix='/api/chat')
@@ -32,6 +51,11 @@ def create_app():
     # Create tables and seed data
     with app.app_context():
         db.create_all()
+        from models.migrations import upgrade
+        upgrade(db.engine)
+        if app.config['SEARCH_FTS_ENABLED']:
+            from utils.fts import init_fts
+            init_fts(db.engine)
         # Load sample data if database is empty
         from utils.seed_data import seed_sample_products
         try:
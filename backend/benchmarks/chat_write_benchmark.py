@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare chat messages per second with synchronous commits and with the write-behind buffer.
+
+Usage (from the backend directory):
+    python benchmarks/chat_write_benchmark.py --messages 2000 --sessions 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# A file database, so every commit pays for its fsync as in production
+_db_dir = tempfile.mkdtemp()
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(_db_dir, 'chat_benchmark.db')}")
+
+from app import create_app
+from models.database import db, ChatMessage, ChatSession
+from utils.chat_writer import ChatWriter
+
+MESSAGES = ['hello', 'show me laptops', 'phones under 500', 'help']
+
+
+def run(messages, sessions, write_behind, batch_size, interval):
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        ChatMessage.query.delete()
+        ChatSession.query.delete()
+        db.session.commit()
+        writer = None
+        if write_behind:
+            writer = ChatWriter(app, batch_size=batch_size, interval=interval)
+            app.extensions['chat_writer'] = writer
+            writer.start()
+
+        # Create the sessions up front so only message writes are measured
+        for n in range(sessions):
+            client.post('/api/chat/message', json={'message': 'hi', 'session_id': f'bench-{n}'})
+        if writer is not None:
+            writer.flush()
+
+        start = time.perf_counter()
+        for n in range(messages):
+            client.post('/api/chat/message',
+                        json={'message': MESSAGES[n % len(MESSAGES)], 'session_id': f'bench-{n % sessions}'})
+        request_seconds = time.perf_counter() - start
+        if writer is not None:
+            writer.close()
+            app.extensions.pop('chat_writer')
+        total_seconds = time.perf_counter() - start
+
+        stored = ChatMessage.query.count() - sessions
+        assert stored == messages, f'{stored} of {messages} messages stored'
+        label = f'write-behind ({batch_size}/{interval}s)' if write_behind else 'synchronous'
+        print(f"{label:<28}{messages / request_seconds:>14.0f}{messages / total_seconds:>14.0f}"
+              f"{(writer.batches if writer is not None else messages):>10}")
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--interval', type=float, default=0.2)
+    args = parser.parse_args()
+    print(f"{'mode':<28}{'replies/s':>14}{'stored/s':>14}{'commits':>10}")
+    run(args.messages, args.sessions, False, args.batch_size, args.interval)
+    run(args.messages, args.sessions, True, args.batch_size, args.interval)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Compare bytes on the wire and CPU per response for gzip levels and brotli qualities.
+
+Usage (from the backend directory):
+    python benchmarks/compression_benchmark.py --products 1000 --repeat 50
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+os.environ.setdefault('CHAT_CACHE_SIZE', '0')
+
+from app import create_app
+from models.database import db
+from utils.compression import brotli, compress
+from utils.catalog_generator import write_products
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 8, 11)
+
+# (label, method, path, JSON body) of representative responses
+RESPONSES = [
+    ('chat help text', 'POST', '/api/chat/message', {'message': 'help'}),
+    ('chat, 10 cards', 'POST', '/api/chat/message', {'message': 'show me electronics'}),
+    ('chat, 10 full products', 'POST', '/api/chat/message', {'message': 'show me electronics', 'view': 'full'}),
+    ('catalog page, 20 products', 'GET', '/api/products/?per_page=20', None),
+    ('catalog page, 100 products', 'GET', '/api/products/?per_page=100', None),
+    ('catalog page, 20 cards', 'GET', '/api/products/?per_page=20&view=card', None),
+]
+
+
+def cpu_ms(func, repeat):
+    """CPU time per call in milliseconds, unaffected by other processes"""
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat * 1000
+
+
+def run(size, repeat):
+    app = create_app()
+    app.config['COMPRESSION_ENABLED'] = False
+    client = app.test_client()
+    with app.app_context():
+        if size:
+            write_products(size, replace=True)
+
+        settings = [('gzip', level) for level in GZIP_LEVELS]
+        if brotli is not None:
+            settings += [('br', quality) for quality in BROTLI_QUALITIES]
+        else:
+            print("brotli is not installed; reporting gzip only")
+
+        print(f"\n{size or 'seed'} products")
+        print(f"{'response':<28}{'encoding':<12}{'bytes':>10}{'ratio':>8}{'cpu ms':>10}")
+        for label, method, path, body in RESPONSES:
+            data = client.open(path, method=method, json=body).get_data()
+            print(f"{label:<28}{'identity':<12}{len(data):>10}{1:>8.2f}{0:>10.3f}")
+            for encoding, level in settings:
+                def encode():
+                    return compress(data, encoding, gzip_level=level, brotli_quality=level)
+                encoded = encode()
+                print(f"{'':<28}{f'{encoding}-{level}':<12}{len(encoded):>10}"
+                      f"{len(encoded) / len(data):>8.2f}{cpu_ms(encode, repeat):>10.3f}")
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, nargs='+', default=[0],
+                        help='synthetic catalog sizes; 0 keeps the seed products')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    for size in args.products:
+        run(size, args.repeat)
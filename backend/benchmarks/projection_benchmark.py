@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare payload size and serialization time of full products with sparse projections.
+
+Usage (from the backend directory):
+    python benchmarks/projection_benchmark.py --products 10000 --page 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from app import create_app
+from models.database import db, Product
+from utils.projection import CARD, parse_projection
+from utils.catalog_generator import write_products
+
+PROJECTIONS = [
+    ('full', None),
+    ('card', CARD),
+    ('fields=id,name,price', parse_projection('id,name,price')),
+]
+
+
+def serialize_page(projection, size):
+    """Query one page the way the list endpoint does and encode it to JSON"""
+    query = Product.query.order_by(Product.id)
+    if projection is None:
+        products = [product.to_dict() for product in query.limit(size)]
+    else:
+        products = [projection.from_row(row) for row in query.with_entities(*projection.columns()).limit(size)]
+    return json.dumps({'products': products})
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(size, page, repeat):
+    app = create_app()
+    with app.app_context():
+        write_products(size, replace=True)
+
+        print(f"\n{size} products - page of {page}")
+        print(f"{'projection':<24}{'bytes/row':>12}{'us/row':>12}{'page ms':>12}")
+        for label, projection in PROJECTIONS:
+            payload = serialize_page(projection, page)
+            # Expire between runs so every page pays for hydration like a fresh request
+            page_ms = timed(lambda: (db.session.expire_all(), serialize_page(projection, page)), repeat)
+            print(f"{label:<24}{len(payload) / page:>12.0f}{page_ms * 1000 / page:>12.1f}{page_ms:>12.2f}")
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, nargs='+', default=[10000])
+    parser.add_argument('--page', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    for size in args.products:
+        run(size, args.page, args.repeat)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare BM25 relevance search from the catalog index with the ILIKE search path.
+
+Usage (from the backend directory):
+    python benchmarks/search_benchmark.py --products 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from sqlalchemy import or_
+from app import create_app
+from models.database import db, Product
+from utils.catalog_generator import write_products
+from utils.catalog_index import catalog_index
+
+QUERIES = ['noise cancelling', 'gaming laptop', 'wireless', 'iphone', 'running shoes', 'labtop']
+
+
+def ilike_search(query, limit=20):
+    terms = or_(
+        Product.name.ilike(f'%{query}%'),
+        Product.description.ilike(f'%{query}%'),
+        Product.features.ilike(f'%{query}%'),
+        Product.brand.ilike(f'%{query}%')
+    )
+    q = Product.query.filter(terms).order_by(Product.rating.desc(), Product.price.asc())
+    return q.count(), q.limit(limit).all()
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(size, repeat):
+    app = create_app()
+    with app.app_context():
+        write_products(size, replace=True)
+
+        start = time.perf_counter()
+        catalog_index.rebuild()
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"\n{size} products - index build {build_ms:.0f} ms")
+        print(f"{'query':<20}{'ilike ms':>12}{'bm25 ms':>12}{'ilike hits':>12}{'bm25 hits':>12}")
+        for query in QUERIES:
+            ilike_ms = timed(lambda: ilike_search(query), repeat)
+            bm25_ms = timed(lambda: catalog_index.search_text(query, limit=20), repeat)
+            ilike_hits = ilike_search(query)[0]
+            bm25_hits = catalog_index.search_text(query, limit=20)[0]
+            print(f"{query:<20}{ilike_ms:>12.2f}{bm25_ms:>12.2f}{ilike_hits:>12}{bm25_hits:>12}")
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, nargs='+', default=[10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    for size in args.products:
+        run(size, args.repeat)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Compare product list serialization: to_dict() + jsonify against cached pre-encoded fragments.
+
+Usage (from the backend directory):
+    python benchmarks/serialization_benchmark.py --products 10000 --page 100
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from flask import jsonify
+from app import create_app
+from models.database import db, Product
+from utils import product_json
+from utils.product_json import product_fragments, fragments_response
+from utils.catalog_generator import write_products
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(size, page, repeat):
+    app = create_app()
+    with app.test_request_context():
+        write_products(size, replace=True)
+        products = Product.query.order_by(Product.id).limit(page).all()
+        envelope = {'total': size, 'pages': size // page, 'current_page': 1, 'per_page': page}
+
+        def baseline():
+            return jsonify(dict(envelope, products=[product.to_dict() for product in products])).get_data()
+
+        def fragments():
+            return fragments_response(envelope, [product_fragments.product(p) for p in products]).get_data()
+
+        print(f"\n{size} products - page of {page} (serialization only, rows already loaded)")
+        print(f"{'path':<36}{'page ms':>12}{'us/row':>12}")
+        encoders = ['stdlib'] + (['orjson'] if product_json.orjson is not None else [])
+        for encoder in encoders:
+            product_json.configure(encoder)
+            results = [
+                (f'to_dict + jsonify ({encoder})', timed(baseline, repeat)),
+                (f'fragments, cold ({encoder})', timed(lambda: (product_fragments.clear(), fragments()), repeat)),
+                (f'fragments, warm ({encoder})', timed(fragments, repeat)),
+            ]
+            for label, page_ms in results:
+                print(f"{label:<36}{page_ms:>12.3f}{page_ms * 1000 / page:>12.2f}")
+        product_json.configure(app.config['JSON_ENCODER'])
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, nargs='+', default=[10000])
+    parser.add_argument('--page', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    for size in args.products:
+        run(size, args.page, args.repeat)
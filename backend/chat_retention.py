@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Archive or purge chat sessions idle for longer than the retention period.
+
+Meant for a periodic job such as a nightly cron entry. Usage (from the backend directory):
+    python chat_retention.py
+    python chat_retention.py --days 30 --mode purge
+    python chat_retention.py --max-batches 50
+"""
+import argparse
+
+from app import create_app
+from utils.chat_retention import MODES, run_retention
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--days', type=int, default=None, help='idle days before a session is retired (CHAT_RETENTION_DAYS)')
+    parser.add_argument('--mode', choices=MODES, default=None, help='CHAT_RETENTION_MODE')
+    parser.add_argument('--batch-size', type=int, default=None, help='sessions per transaction (CHAT_RETENTION_BATCH_SIZE)')
+    parser.add_argument('--max-batches', type=int, default=None, help='stop after this many batches')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        config = app.config
+        report = run_retention(
+            args.days if args.days is not None else config['CHAT_RETENTION_DAYS'],
+            mode=args.mode or config['CHAT_RETENTION_MODE'],
+            batch_size=args.batch_size or config['CHAT_RETENTION_BATCH_SIZE'],
+            max_messages=config['CHAT_RETENTION_MAX_MESSAGES'],
+            pause=config['CHAT_RETENTION_PAUSE'],
+            max_batches=args.max_batches
+        )
+        print(f"Retired {report.sessions} sessions and {report.messages} messages in {report.batches} batches "
+              f"({report.archived_bytes} archived bytes, {report.seconds:.2f}s)")
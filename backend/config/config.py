@@ -14,6 +14,87 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     
+    # Chatbot product search: 'index' (in-memory catalog index) or 'sql'
+    CHAT_SEARCH_BACKEND = os.environ.get('CHAT_SEARCH_BACKEND') or 'index'
+    # 'ranked' scores all relaxation tiers in one pass, 'cascade' re-queries with looser filters
+    CHAT_SEARCH_MODE = os.environ.get('CHAT_SEARCH_MODE') or 'ranked'
+    # Chatbot response cache: maximum entries (0 disables it) and TTL in seconds
+    CHAT_CACHE_SIZE = int(os.environ.get('CHAT_CACHE_SIZE', 1024))
+    CHAT_CACHE_TTL = int(os.environ.get('CHAT_CACHE_TTL', 300))
+    
+    # Maintain a SQLite FTS5 table for product search when the library supports it
+    SEARCH_FTS_ENABLED = os.environ.get('SEARCH_FTS_ENABLED', '1') == '1'
+    # Default /api/products/search backend: 'index' (in-memory BM25), 'fts' (SQLite FTS5) or 'sql' (ILIKE)
+    PRODUCT_SEARCH_BACKEND = os.environ.get('PRODUCT_SEARCH_BACKEND') or 'index'
+    
+    # Product shape in chat responses: 'card' (compact) or 'full' (every column)
+    CHAT_PRODUCT_VIEW = os.environ.get('CHAT_PRODUCT_VIEW') or 'card'
+    
+    # JSON encoding: 'auto' uses orjson when installed, 'stdlib' forces the json module
+    JSON_ENCODER = os.environ.get('JSON_ENCODER') or 'auto'
+    # Pre-encoded product JSON fragments, keyed by (id, updated_at, shape)
+    PRODUCT_JSON_CACHE_SIZE = int(os.environ.get('PRODUCT_JSON_CACHE_SIZE', 10000))
+    PRODUCT_JSON_CACHE_TTL = int(os.environ.get('PRODUCT_JSON_CACHE_TTL', 3600))
+    
+    # Largest number of ids accepted by /api/products/batch
+    PRODUCT_BATCH_MAX = int(os.environ.get('PRODUCT_BATCH_MAX', 100))
+    
+    # Bulk import: rows per upsert transaction, and the bearer token POST /api/products/import
+    # requires (the endpoint is disabled while it is unset)
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    IMPORT_API_TOKEN = os.environ.get('IMPORT_API_TOKEN')
+    
+    # Rows fetched per round trip while streaming /api/products/export
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    # Seconds the export watermark is set back from the export's start. A write
+    # stamped before the start but committed after the export read past it is
+    # picked up by the next sync as long as its transaction ran shorter than this.
+    EXPORT_OVERLAP_SECONDS = float(os.environ.get('EXPORT_OVERLAP_SECONDS', 60))
+    
+    # Facet counts cache, keyed by catalog version and filters
+    FACETS_CACHE_SIZE = int(os.environ.get('FACETS_CACHE_SIZE', 256))
+    FACETS_CACHE_TTL = int(os.environ.get('FACETS_CACHE_TTL', 300))
+    
+    # Response compression: gzip, or brotli when the package is installed and the client accepts it
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1') == '1'
+    # Bodies smaller than this many bytes are sent uncompressed
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    # Default effort: gzip 1-9, brotli 0-11; routes can override both with @compression
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+    # Chat replies are compressed once and never reused, so they get a cheaper level
+    CHAT_COMPRESSION_GZIP_LEVEL = int(os.environ.get('CHAT_COMPRESSION_GZIP_LEVEL', 4))
+    CHAT_COMPRESSION_BROTLI_QUALITY = int(os.environ.get('CHAT_COMPRESSION_BROTLI_QUALITY', 4))
+    
+    # Chat history messages per page when no limit is given, and the largest limit accepted
+    CHAT_HISTORY_LIMIT = int(os.environ.get('CHAT_HISTORY_LIMIT', 50))
+    CHAT_HISTORY_MAX_LIMIT = int(os.environ.get('CHAT_HISTORY_MAX_LIMIT', 500))
+    
+    # session_id -> ChatSession.id cache, so steady-state chat messages resolve their session without a query
+    CHAT_SESSION_CACHE_SIZE = int(os.environ.get('CHAT_SESSION_CACHE_SIZE', 10000))
+    CHAT_SESSION_CACHE_TTL = int(os.environ.get('CHAT_SESSION_CACHE_TTL', 3600))
+    
+    # Chat retention (python chat_retention.py): sessions idle for more than CHAT_RETENTION_DAYS
+    # are archived to chat_archives or purged, in batches of at most CHAT_RETENTION_BATCH_SIZE
+    # sessions and about CHAT_RETENTION_MAX_MESSAGES messages, CHAT_RETENTION_PAUSE seconds apart
+    CHAT_RETENTION_DAYS = int(os.environ.get('CHAT_RETENTION_DAYS', 90))
+    CHAT_RETENTION_MODE = os.environ.get('CHAT_RETENTION_MODE') or 'archive'
+    CHAT_RETENTION_BATCH_SIZE = int(os.environ.get('CHAT_RETENTION_BATCH_SIZE', 100))
+    CHAT_RETENTION_MAX_MESSAGES = int(os.environ.get('CHAT_RETENTION_MAX_MESSAGES', 5000))
+    CHAT_RETENTION_PAUSE = float(os.environ.get('CHAT_RETENTION_PAUSE', 0.05))
+    
+    # Write-behind chat persistence: messages are queued and written in batches by a
+    # background thread once CHAT_WRITE_BEHIND_BATCH_SIZE are waiting or the oldest
+    # has waited CHAT_WRITE_BEHIND_INTERVAL seconds. Off by default; reads in this
+    # process flush first, but other processes only see messages once written.
+    CHAT_WRITE_BEHIND = os.environ.get('CHAT_WRITE_BEHIND', '0') == '1'
+    CHAT_WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('CHAT_WRITE_BEHIND_BATCH_SIZE', 100))
+    CHAT_WRITE_BEHIND_INTERVAL = float(os.environ.get('CHAT_WRITE_BEHIND_INTERVAL', 0.2))
+    CHAT_WRITE_BEHIND_MAX_PENDING = int(os.environ.get('CHAT_WRITE_BEHIND_MAX_PENDING', 10000))
+    # Attempts after the first for a batch failing with a transient database error;
+    # rows of a batch that still fails are then written singly and dropped on error
+    CHAT_WRITE_BEHIND_RETRIES = int(os.environ.get('CHAT_WRITE_BEHIND_RETRIES', 3))
+    
     # CORS settings - Allow all origins for production, specific for development
     if os.environ.get('VERCEL'):
         CORS_ORIGINS = ["*"]
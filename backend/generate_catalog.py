@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Fill the database with a deterministic synthetic catalog for scale testing.
+
+Usage (from the backend directory):
+    python generate_catalog.py --products 100000 --replace
+    DATABASE_URL=sqlite:///scale.db python generate_catalog.py --products 1000000 --replace
+"""
+import argparse
+
+from app import create_app
+from utils.catalog_generator import write_products
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--replace', action='store_true', help='delete the existing catalog first')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        seconds = write_products(args.products, seed=args.seed, batch_size=args.batch_size, replace=args.replace,
+                                 on_batch=lambda written: print(f"{written} products written"))
+        print(f"Generated {args.products} products in {seconds:.1f}s ({args.products / seconds:.0f} rows/s)")
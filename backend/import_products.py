@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Bulk import products from a CSV or JSON Lines supplier feed, upserting on sku.
+
+Usage (from the backend directory):
+    python import_products.py feed.csv
+    python import_products.py feed.jsonl --batch-size 5000
+    gunzip -c feed.jsonl.gz | python import_products.py - --format jsonl
+
+A running server needs no reload: it picks up the imported rows from the
+persisted catalog stamp on its next catalog read.
+"""
+import argparse
+import io
+import os
+import sys
+
+from app import create_app
+from utils.catalog_import import FORMATS, import_products, read_rows
+
+
+def progress(report):
+    print(f"{report.rows} rows ({report.created} created, {report.updated} updated, {report.skipped} skipped) "
+          f"- {report.rows_per_second:.0f} rows/s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', help="input file, or - for stdin")
+    parser.add_argument('--format', choices=FORMATS, help='defaults to the file extension')
+    parser.add_argument('--batch-size', type=int, default=None, help='rows per transaction (IMPORT_BATCH_SIZE)')
+    args = parser.parse_args()
+
+    fmt = args.format or os.path.splitext(args.path)[1].lstrip('.').lower().replace('ndjson', 'jsonl')
+    if fmt not in FORMATS:
+        parser.error('cannot tell the format from the file name; pass --format')
+
+    app = create_app()
+    with app.app_context():
+        batch_size = args.batch_size or app.config['IMPORT_BATCH_SIZE']
+        if args.path == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+        else:
+            stream = open(args.path, encoding='utf-8-sig', newline='')
+        with stream:
+            report = import_products(read_rows(stream, fmt), batch_size=batch_size, on_batch=progress)
+        for error in report.errors:
+            print(f"Warning: {error}")
+        print(f"Imported {report.created + report.updated} products in {report.seconds:.2f}s "
+              f"({report.rows_per_second:.0f} rows/s, {report.skipped} skipped)")
@@ -1,17 +1,33 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, or_, select, false, update
+from sqlalchemy.orm import validates
 from datetime import datetime
+from utils.features import decode_features, feature_lookups, normalize_feature, parse_features
 
 db = SQLAlchemy()
 
+def normalize_key(value):
+    """Lowercase lookup key stored alongside category and brand for equality filters"""
+    return value.strip().lower() if value else value
+
+def _key_default(source):
+    """Column default deriving a key from the inserted source column, for Core inserts"""
+    return lambda context: normalize_key(context.get_current_parameters().get(source))
+
 class Product(db.Model):
     __tablename__ = 'products'
     
     id = db.Column(db.Integer, primary_key=True)
+    # Supplier stock keeping unit; bulk imports upsert on it
+    sku = db.Column(db.String(100))
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     price = db.Column(db.Float, nullable=False)
     category = db.Column(db.String(100), nullable=False)
     brand = db.Column(db.String(100))
+    # Normalized copies of category/brand, kept current by the validator below
+    category_key = db.Column(db.String(100), default=_key_default('category'))
+    brand_key = db.Column(db.String(100), default=_key_default('brand'))
     stock_quantity = db.Column(db.Integer, default=0)
     image_url = db.Column(db.String(300))
     rating = db.Column(db.Float, default=0.0)
@@ -19,9 +35,24 @@ class Product(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Parsed copy of features, rebuilt by the validator below
+    feature_rows = db.relationship('ProductFeature', backref='product', lazy=True, cascade='all, delete-orphan')
+    
+    @validates('category', 'brand')
+    def _set_key(self, field, value):
+        setattr(self, f'{field}_key', normalize_key(value))
+        return value
+    
+    @validates('features')
+    def _set_feature_rows(self, field, value):
+        self.feature_rows = [ProductFeature(feature_key=key, normalized_value=feature_value)
+                             for key, feature_value in parse_features(value)]
+        return value
+    
     def to_dict(self):
         return {
             'id': self.id,
+            'sku': self.sku,
             'name': self.name,
             'description': self.description,
             'price': self.price,
@@ -30,11 +61,91 @@ class Product(db.Model):
             'stock_quantity': self.stock_quantity,
             'image_url': self.image_url,
             'rating': self.rating,
-            'features': self.features,
+            'features': decode_features(self.features),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+# Indexes matching the chatbot's query shapes: equality on category or brand,
+# price ranges, and the rating DESC, price ASC ordering every search uses
+db.Index('ix_products_category_key_rating_price', Product.category_key, Product.rating.desc(), Product.price)
+db.Index('ix_products_brand_key_price', Product.brand_key, Product.price)
+db.Index('ix_products_rating_price', Product.rating.desc(), Product.price)
+db.Index('ix_products_price', Product.price)
+# Serves the MAX(updated_at) behind conditional GET validators
+db.Index('ix_products_updated_at', Product.updated_at)
+# Conflict target of bulk import upserts; NULL skus never conflict
+db.Index('ux_products_sku', Product.sku, unique=True)
+
+class ProductFeature(db.Model):
+    """One parsed product feature: '32GB RAM' is stored as key 'ram', value '32gb'"""
+    __tablename__ = 'product_features'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
+    feature_key = db.Column(db.String(200), nullable=False)
+    normalized_value = db.Column(db.String(100), nullable=False, default='')
+    
+    __table_args__ = (
+        # Key and key+value lookups, covering product_id so filters never touch the table
+        db.Index('ix_product_features_key_value', 'feature_key', 'normalized_value', 'product_id'),
+        # Value-only lookups such as '32gb'
+        db.Index('ix_product_features_value', 'normalized_value', 'product_id'),
+        db.Index('ix_product_features_product_id', 'product_id'),
+    )
+    
+    @classmethod
+    def product_ids(cls, phrase):
+        """SELECT of the ids of products having a feature matching phrase, for Product.id.in_()"""
+        conditions = []
+        for lookup in feature_lookups(phrase):
+            if lookup[0] == 'key':
+                conditions.append(cls.feature_key == lookup[1])
+            elif lookup[0] == 'pair':
+                conditions.append(and_(cls.feature_key == lookup[1], cls.normalized_value == lookup[2]))
+            else:
+                conditions.append(cls.normalized_value == lookup[1])
+        return select(cls.product_id).where(or_(*conditions) if conditions else false())
+    
+    @classmethod
+    def keyword_product_ids(cls, keyword):
+        """
+        SELECT of the ids of products with a feature a search keyword names, for Product.id.in_().
+
+        Matches keys starting with the keyword ('battery' finds 'battery
+        life') and values equal to it ('5g'). Both are ranges on the
+        indexed normalized columns, so no features JSON is scanned.
+        """
+        text = normalize_feature(keyword)
+        if not text:
+            return select(cls.product_id).where(false())
+        # Normalized keys are lowercase alphanumeric runs and spaces, all below '~'
+        return select(cls.product_id).where(or_(and_(cls.feature_key >= text, cls.feature_key < text + '~'),
+                                                cls.normalized_value == text))
+
+class CatalogState(db.Model):
+    """
+    Single row (id 1) counting product deletions.
+
+    Deletes leave no updated_at behind, so catalog validators read this
+    counter alongside MAX(updated_at) instead of counting every product.
+    """
+    __tablename__ = 'catalog_state'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    deletions = db.Column(db.Integer, nullable=False, default=0)
+    deleted_at = db.Column(db.DateTime)
+    
+    @classmethod
+    def record_deletion(cls, executor):
+        """Bump the counter in the deleting transaction; executor is a Session or Connection"""
+        table = cls.__table__
+        now = datetime.utcnow()
+        result = executor.execute(table.update().where(table.c.id == 1).values(
+            deletions=table.c.deletions + 1, deleted_at=now))
+        if result.rowcount == 0:
+            executor.execute(table.insert().values(id=1, deletions=1, deleted_at=now))
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -60,10 +171,42 @@ class ChatSession(db.Model):
     session_id = db.Column(db.String(100), unique=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by add_message and reset, so listing sessions never loads their messages
+    message_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_message_at = db.Column(db.DateTime, nullable=True)
     
     # Relationship
     messages = db.relationship('ChatMessage', backref='session', lazy=True, cascade='all, delete-orphan')
     
+    @classmethod
+    def add_message(cls, session_pk, message, response, message_type='text', template_id=None):
+        """
+        Add a message to the session with primary key session_pk and bump its counters; the caller commits.
+
+        Takes the key rather than a loaded session so callers holding a
+        cached id write without reading the session row. The counter is
+        incremented in SQL so concurrent requests on one session do not
+        lose counts. Returns None, writing nothing, when no session has
+        that key any more, e.g. another process deleted it after the key
+        was cached.
+        """
+        now = datetime.utcnow()
+        touched = db.session.execute(update(cls).where(cls.id == session_pk).values(
+            message_count=cls.message_count + 1, last_message_at=now, updated_at=now))
+        if touched.rowcount == 0:
+            return None
+        chat_message = ChatMessage(session_id=session_pk, message=message, response=response,
+                                   message_type=message_type, timestamp=now, template_id=template_id)
+        db.session.add(chat_message)
+        return chat_message
+    
+    def reset(self):
+        """Delete every message of the session and zero its counters; the caller commits"""
+        ChatMessage.query.filter_by(session_id=self.id).delete()
+        self.message_count = 0
+        self.last_message_at = None
+        self.updated_at = datetime.utcnow()
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -71,9 +214,14 @@ class ChatSession(db.Model):
             'session_id': self.session_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'message_count': len(self.messages)
+            'message_count': self.message_count or 0,
+            'last_message_at': self.last_message_at.isoformat() if self.last_message_at else None
         }
 
+# Keyset order of the session list, overall and per user
+db.Index('ix_chat_sessions_updated_at_id', ChatSession.updated_at, ChatSession.id)
+db.Index('ix_chat_sessions_user_id_updated_at_id', ChatSession.user_id, ChatSession.updated_at, ChatSession.id)
+
 class ChatMessage(db.Model):
     __tablename__ = 'chat_messages'
     
@@ -83,13 +231,47 @@ class ChatMessage(db.Model):
     response = db.Column(db.Text, nullable=False)
     message_type = db.Column(db.String(50), default='text')  # text, product_search, etc.
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    # Fixed replies such as greetings and help are stored once and referenced; response is then ''
+    template_id = db.Column(db.Integer, db.ForeignKey('chat_response_templates.id'), nullable=True)
+    
+    template = db.relationship('ChatResponseTemplate', lazy='joined')
+    
+    @property
+    def response_text(self):
+        return self.template.text if self.template is not None else self.response
     
     def to_dict(self):
         return {
             'id': self.id,
             'session_id': self.session_id,
             'message': self.message,
-            'response': self.response,
+            'response': self.response_text,
             'message_type': self.message_type,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None
         }
+
+# A session's messages in order, and the per-session counts the migration backfills
+db.Index('ix_chat_messages_session_id_timestamp', ChatMessage.session_id, ChatMessage.timestamp)
+# History pages walk a session's messages by id from before/after cursors
+db.Index('ix_chat_messages_session_id_id', ChatMessage.session_id, ChatMessage.id)
+
+class ChatResponseTemplate(db.Model):
+    __tablename__ = 'chat_response_templates'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # sha1 of text, the key repeated replies are looked up by
+    digest = db.Column(db.String(40), unique=True, nullable=False)
+    text = db.Column(db.Text, nullable=False)
+
+# A retired chat session with its messages, as gzip-compressed JSON
+class ChatArchive(db.Model):
+    __tablename__ = 'chat_archives'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String(100), nullable=False, index=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime)
+    last_message_at = db.Column(db.DateTime)
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    payload = db.Column(db.LargeBinary, nullable=False)
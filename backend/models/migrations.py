@@ -0,0 +1,196 @@
+from sqlalchemy import bindparam, inspect, text
+from models.database import (db, CatalogState, ChatArchive, ChatMessage, ChatResponseTemplate, ChatSession,
+                             Product, ProductFeature, normalize_key)
+from utils.chat_templates import TEMPLATE_TYPES, ensure_template
+from utils.features import feature_rows
+
+# Rows updated per statement while backfilling a new column
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _create_indexes(connection, names, model=Product):
+    """Create the named indexes as declared on the model, skipping existing ones"""
+    for index in model.__table__.indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+
+def _product_keys_and_indexes(connection):
+    """Add normalized category/brand keys and the hot column indexes to products"""
+    columns = {column['name'] for column in inspect(connection).get_columns('products')}
+    for name in ('category_key', 'brand_key'):
+        if name not in columns:
+            connection.execute(text(f'ALTER TABLE products ADD COLUMN {name} VARCHAR(100)'))
+
+    # Normalize in Python so keys match what the model writes, including non-ASCII text
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            'SELECT id, category, brand FROM products WHERE id > :last_id ORDER BY id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            break
+        connection.execute(text(
+            'UPDATE products SET category_key = :category_key, brand_key = :brand_key WHERE id = :id'
+        ), [{'id': row.id, 'category_key': normalize_key(row.category), 'brand_key': normalize_key(row.brand)}
+            for row in rows])
+        last_id = rows[-1].id
+
+    _create_indexes(connection, ('ix_products_category_key_rating_price', 'ix_products_brand_key_price',
+                                 'ix_products_rating_price', 'ix_products_price'))
+
+
+def _updated_at_index(connection):
+    """Index products.updated_at for conditional GET stamps"""
+    _create_indexes(connection, ('ix_products_updated_at',))
+
+
+def _product_features_table(connection):
+    """Create product_features and fill it from every product's features JSON"""
+    ProductFeature.__table__.create(connection, checkfirst=True)
+    connection.execute(ProductFeature.__table__.delete())
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            'SELECT id, features FROM products WHERE id > :last_id ORDER BY id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            break
+        parsed = [feature for row in rows for feature in feature_rows(row.id, row.features)]
+        if parsed:
+            connection.execute(ProductFeature.__table__.insert(), parsed)
+        last_id = rows[-1].id
+
+
+def _product_sku(connection):
+    """Add products.sku with the unique index bulk imports upsert on"""
+    columns = {column['name'] for column in inspect(connection).get_columns('products')}
+    if 'sku' not in columns:
+        connection.execute(text('ALTER TABLE products ADD COLUMN sku VARCHAR(100)'))
+    _create_indexes(connection, ('ux_products_sku',))
+
+
+def _chat_session_counters(connection):
+    """Add chat_sessions.message_count/last_message_at, fill them from chat_messages and index the listing"""
+    inspector = inspect(connection)
+    if not inspector.has_table('chat_sessions'):
+        # create_all() builds the table with the counters and indexes
+        return
+    columns = {column['name'] for column in inspector.get_columns('chat_sessions')}
+    if 'message_count' not in columns:
+        connection.execute(text('ALTER TABLE chat_sessions ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0'))
+    if 'last_message_at' not in columns:
+        connection.execute(text('ALTER TABLE chat_sessions ADD COLUMN last_message_at DATETIME'))
+    # The message index first, so every per-session aggregate below is an index range scan
+    _create_indexes(connection, ('ix_chat_messages_session_id_timestamp',), ChatMessage)
+
+    last_id = 0
+    while True:
+        ids = connection.execute(text(
+            'SELECT id FROM chat_sessions WHERE id > :last_id ORDER BY id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}).scalars().all()
+        if not ids:
+            break
+        connection.execute(text(
+            'UPDATE chat_sessions SET '
+            'message_count = (SELECT COUNT(*) FROM chat_messages m WHERE m.session_id = chat_sessions.id), '
+            'last_message_at = (SELECT MAX(m.timestamp) FROM chat_messages m WHERE m.session_id = chat_sessions.id) '
+            'WHERE id >= :first_id AND id <= :last_id'
+        ), {'first_id': ids[0], 'last_id': ids[-1]})
+        last_id = ids[-1]
+
+    _create_indexes(connection, ('ix_chat_sessions_updated_at_id', 'ix_chat_sessions_user_id_updated_at_id'),
+                    ChatSession)
+
+
+def _chat_history_index(connection):
+    """Index chat_messages by (session_id, id) for history cursors"""
+    if inspect(connection).has_table('chat_messages'):
+        _create_indexes(connection, ('ix_chat_messages_session_id_id',), ChatMessage)
+
+
+def _chat_templates_and_archive(connection):
+    """Create the reply template and archive tables and move stored fixed replies to templates"""
+    ChatResponseTemplate.__table__.create(connection, checkfirst=True)
+    ChatArchive.__table__.create(connection, checkfirst=True)
+    inspector = inspect(connection)
+    if not inspector.has_table('chat_messages'):
+        return
+    columns = {column['name'] for column in inspector.get_columns('chat_messages')}
+    if 'template_id' not in columns:
+        connection.execute(text(
+            'ALTER TABLE chat_messages ADD COLUMN template_id INTEGER REFERENCES chat_response_templates(id)'))
+
+    templates = {}
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            'SELECT id, response FROM chat_messages WHERE id > :last_id AND template_id IS NULL '
+            'AND message_type IN :types ORDER BY id LIMIT :limit'
+        ).bindparams(bindparam('types', expanding=True)),
+            {'last_id': last_id, 'types': list(TEMPLATE_TYPES), 'limit': BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            if row.response:
+                if row.response not in templates:
+                    templates[row.response] = ensure_template(connection, row.response)
+                updates.append({'id': row.id, 'template_id': templates[row.response]})
+        if updates:
+            connection.execute(text("UPDATE chat_messages SET template_id = :template_id, response = '' WHERE id = :id"),
+                               updates)
+        last_id = rows[-1].id
+
+
+def _catalog_state(connection):
+    """Create catalog_state with its single row, the product deletion counter behind catalog validators"""
+    CatalogState.__table__.create(connection, checkfirst=True)
+    table = CatalogState.__table__
+    if connection.execute(table.select().where(table.c.id == 1)).first() is None:
+        connection.execute(table.insert().values(id=1, deletions=0))
+
+
+# (version, description, function) in the order they must run; never reorder or renumber
+MIGRATIONS = [
+    (1, 'normalized category/brand keys and product indexes', _product_keys_and_indexes),
+    (2, 'products.updated_at index', _updated_at_index),
+    (3, 'normalized product_features table', _product_features_table),
+    (4, 'products.sku and its unique index', _product_sku),
+    (5, 'chat session message counters and listing indexes', _chat_session_counters),
+    (6, 'chat_messages (session_id, id) index', _chat_history_index),
+    (7, 'chat reply templates and session archive', _chat_templates_and_archive),
+    (8, 'catalog_state product deletion counter', _catalog_state),
+]
+
+
+def applied_versions(connection):
+    """Return the set of migration versions recorded in schema_migrations"""
+    connection.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, description VARCHAR(200))'))
+    return {row[0] for row in connection.execute(text('SELECT version FROM schema_migrations'))}
+
+
+def upgrade(engine=None):
+    """
+    Apply every pending migration, each in its own transaction.
+
+    db.create_all() builds new databases at the latest schema but never
+    alters existing tables; the migrations bring those up to date. They are
+    written to be no-ops on a schema create_all() already produced.
+    Returns the list of versions applied.
+    """
+    engine = engine or db.engine
+    with engine.begin() as connection:
+        applied = applied_versions(connection)
+    newly_applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as connection:
+            migrate(connection)
+            connection.execute(text('INSERT INTO schema_migrations (version, description) VALUES (:version, :description)'),
+                               {'version': version, 'description': description})
+        print(f"Applied migration {version}: {description}")
+        newly_applied.append(version)
+    return newly_applied
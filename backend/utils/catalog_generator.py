@@ -0,0 +1,189 @@
+import json
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from models.database import db, CatalogState, Product, ProductFeature, normalize_key
+from utils import fts
+from utils.catalog_sync import publish
+from utils.enhanced_seed_data import COMPREHENSIVE_PRODUCTS
+from utils.features import decode_features, feature_rows
+from utils.seed_data import SAMPLE_PRODUCTS
+
+# Extra brands per category beyond the seed ones; they form the long tail of the brand distribution
+LONG_TAIL_BRANDS = 24
+# Brand popularity follows a Zipf law with this exponent, seed brands ranked first
+BRAND_ZIPF_EXPONENT = 1.1
+# Spread of prices around the template's price (sigma of the log-normal factor)
+PRICE_SIGMA = 0.35
+# Share of products that are out of stock
+OUT_OF_STOCK_RATE = 0.08
+# Products were created within this window; updated_at is when they were written
+HISTORY = timedelta(days=730)
+
+MODEL_SUFFIXES = ('', '', 'Pro', 'Plus', 'Lite', 'Max', 'Mini', 'SE', 'Ultra', 'Gen 2', 'Gen 3', 'X', 'Neo')
+BOOK_EDITIONS = ('', '', '2nd Edition', '3rd Edition', 'Revised Edition', 'Anniversary Edition', 'Workbook')
+AUDIENCES = ('students', 'professionals', 'families', 'travelers', 'creators', 'gamers', 'everyday use',
+             'small spaces', 'beginners', 'enthusiasts', 'remote work', 'gift giving')
+_SYLLABLES = ('ka', 'lo', 'vi', 'ra', 'zen', 'tor', 'mi', 'qu', 'el', 'no', 'sy', 'bri', 'dax', 'ly', 'or', 'fen')
+
+
+def _long_tail_brand(rng):
+    name = ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3)))
+    return name.capitalize()
+
+
+class CatalogGenerator:
+    """
+    Deterministic synthetic catalog expanded from the seed products.
+
+    Each generated product starts from a seed template: categories keep the
+    seed mix, brands are the category's seed brands followed by a Zipf long
+    tail of invented ones, prices are log-normal around the template price,
+    ratings skew high like real reviews, and descriptions and feature lists
+    are recombined from every template of the category. The same seed
+    always yields the same products, and a shorter run is a prefix of a
+    longer one; only the timestamps move, as they count back from now.
+    """
+
+    def __init__(self, seed=42):
+        self.seed = seed
+        rng = random.Random(seed)
+        templates = list({product['name']: product for product in SAMPLE_PRODUCTS + COMPREHENSIVE_PRODUCTS}.values())
+        self.categories = sorted({template['category'] for template in templates})
+        self.category_weights = [sum(1 for t in templates if t['category'] == category) for category in self.categories]
+        self.templates = {}
+        self.brands = {}
+        self.brand_weights = {}
+        self.sentences = {}
+        self.features = {}
+        for category in self.categories:
+            members = [t for t in templates if t['category'] == category]
+            self.templates[category] = members
+            seed_brands = sorted({t['brand'] for t in members}, key=lambda b: -sum(t['brand'] == b for t in members))
+            brands = seed_brands + [_long_tail_brand(rng) for _ in range(LONG_TAIL_BRANDS)]
+            self.brands[category] = brands
+            self.brand_weights[category] = [1 / (rank + 1) ** BRAND_ZIPF_EXPONENT for rank in range(len(brands))]
+            self.sentences[category] = [sentence.strip().rstrip('.') for t in members
+                                        for sentence in re.split(r'(?<=\.)\s+', t['description']) if sentence.strip()]
+            self.features[category] = sorted({feature for t in members for feature in decode_features(t['features'])})
+
+    def _core_name(self, template):
+        """Template name without its brand, so it can be reissued under another one"""
+        name, brand = template['name'], template['brand']
+        return name[len(brand):].strip() if brand and name.startswith(brand) else name
+
+    def products(self, count, start=0):
+        """
+        Yield count products table rows, without ids, continuing the sequence after its first start rows.
+
+        The skipped rows are still drawn, so two runs of n rows with starts
+        0 and n yield the same products as one run of 2n. created_at is
+        spread over HISTORY; updated_at is now.
+        """
+        rng = random.Random(self.seed)
+        now = datetime.utcnow()
+        for index in range(start + count):
+            category = rng.choices(self.categories, self.category_weights)[0]
+            template = rng.choice(self.templates[category])
+            brand = rng.choices(self.brands[category], self.brand_weights[category])[0]
+            suffix = rng.choice(BOOK_EDITIONS if category == 'Books' else MODEL_SUFFIXES)
+            price = max(template['price'] * rng.lognormvariate(0, PRICE_SIGMA), 1.0)
+            price = int(price) + 0.99 if price >= 10 else round(price, 2)
+            rating = round(1 + 4 * rng.betavariate(9, 2.2), 1)
+            stock = 0 if rng.random() < OUT_OF_STOCK_RATE else int(rng.expovariate(1 / 60)) + 1
+            sentences = rng.sample(self.sentences[category], min(2, len(self.sentences[category])))
+            pool = self.features[category]
+            features = rng.sample(pool, min(rng.randint(3, 6), len(pool)))
+            created_at = now.replace(microsecond=0) - timedelta(seconds=rng.randrange(int(HISTORY.total_seconds())))
+            audience = rng.choice(AUDIENCES)
+            if brand in template['name']:
+                name = template['name']
+            else:
+                name = f"{brand} {self._core_name(template)}"
+            if index < start:
+                continue
+            yield {
+                'sku': f'GEN-{self.seed}-{index:07d}',
+                'name': f'{name} {suffix}'.rstrip(),
+                'description': '. '.join(sentences) + f'. Ideal for {audience}.',
+                'price': price,
+                'category': category,
+                'category_key': normalize_key(category),
+                'brand': brand,
+                'brand_key': normalize_key(brand),
+                'stock_quantity': stock,
+                'image_url': template.get('image_url'),
+                'rating': rating,
+                'features': json.dumps(features),
+                'created_at': created_at,
+                'updated_at': now
+            }
+
+
+def write_products(count, seed=42, batch_size=10000, replace=False, on_batch=None):
+    """
+    Bulk insert count generated products with their product_features rows.
+
+    Ids are assigned up front so feature rows need no read back, and every
+    batch is one executemany per table in its own transaction, rolled back
+    if it fails. Rows are stamped with the time their batch is written, so
+    catalog validators and export?updated_since see them. Without replace
+    the generated sequence and its skus continue after the products this
+    seed already wrote; replace first deletes the existing catalog. The
+    FTS table is rebuilt once at the end rather than kept in sync per row.
+    Subscribers get a single reload notice at the end, even after a
+    failed batch, instead of per-row updates. on_batch(written) runs after
+    each batch. Returns the seconds taken.
+    """
+    start = time.perf_counter()
+    products = Product.__table__
+    features = ProductFeature.__table__
+    if replace:
+        try:
+            db.session.execute(features.delete())
+            db.session.execute(products.delete())
+            CatalogState.record_deletion(db.session)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    next_id = (db.session.query(func.max(Product.id)).scalar() or 0) + 1
+    prefix = f'GEN-{seed}-'
+    last_sku = db.session.query(func.max(Product.sku)).filter(Product.sku.like(f'{prefix}%')).scalar()
+    first = int(last_sku[len(prefix):]) + 1 if last_sku else 0
+
+    written = 0
+    batch = []
+    rows = CatalogGenerator(seed).products(count, start=first)
+    try:
+        with fts.bulk_load():
+            while True:
+                batch.clear()
+                for row in rows:
+                    row['id'] = next_id + written + len(batch)
+                    batch.append(row)
+                    if len(batch) == batch_size:
+                        break
+                if not batch:
+                    break
+                now = datetime.utcnow()
+                for row in batch:
+                    row['updated_at'] = now
+                try:
+                    db.session.execute(products.insert(), batch)
+                    parsed = [feature for row in batch for feature in feature_rows(row['id'], row['features'])]
+                    if parsed:
+                        db.session.execute(features.insert(), parsed)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+                written += len(batch)
+                if on_batch:
+                    on_batch(written)
+    finally:
+        if written or replace:
+            publish({}, reload=True)
+    return time.perf_counter() - start
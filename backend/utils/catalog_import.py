@@ -0,0 +1,246 @@
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects import postgresql, sqlite
+from models.database import db, Product, ProductFeature, normalize_key
+from utils.catalog_sync import publish
+from utils.features import feature_rows
+from utils.projection import Projection, PRODUCT_FIELDS
+
+# Fields an import row may set; sku identifies the product to create or update
+IMPORT_FIELDS = ('sku', 'name', 'description', 'price', 'category', 'brand', 'stock_quantity', 'image_url',
+                 'rating', 'features')
+REQUIRED_FIELDS = ('sku', 'name', 'price', 'category')
+
+# Columns an upsert overwrites on an existing product; created_at is kept
+UPDATE_COLUMNS = ('name', 'description', 'price', 'category', 'category_key', 'brand', 'brand_key',
+                  'stock_quantity', 'image_url', 'rating', 'features', 'updated_at')
+
+# Row errors listed in a report; the skipped count covers the rest
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = ('csv', 'jsonl')
+
+_SNAPSHOT = Projection(PRODUCT_FIELDS)
+
+
+class InvalidRow(ValueError):
+    """An import row that cannot be stored"""
+
+
+@dataclass
+class ImportReport:
+    """Running totals of an import; rows counts every input row, skipped ones included"""
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def skip(self, line, error):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f'line {line}: {error}')
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'batches': self.batches,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'errors': self.errors
+        }
+
+
+def read_csv(stream):
+    """Yield (line, row) from CSV text with a header row"""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(stream):
+    """Yield (line, object) from JSON Lines text; undecodable lines yield None"""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def read_rows(stream, fmt):
+    """Rows of a text stream in one of FORMATS; raises ValueError for other formats"""
+    if fmt == 'csv':
+        return read_csv(stream)
+    if fmt == 'jsonl':
+        return read_jsonl(stream)
+    raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+
+
+def _number(row, name, cast, default=None):
+    value = row.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise InvalidRow(f'{name} must be a number')
+
+
+def _features(value):
+    """Features as stored: JSON arrays and objects pass through, CSV cells may be 'a|b|c'"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    value = str(value).strip()
+    if value[:1] in ('[', '{'):
+        try:
+            json.loads(value)
+        except ValueError:
+            raise InvalidRow('features is not valid JSON')
+        return value
+    return json.dumps([part.strip() for part in value.split('|') if part.strip()])
+
+
+def clean_row(raw, now):
+    """Validate one input row and return the products column values; raises InvalidRow"""
+    if not isinstance(raw, dict):
+        raise InvalidRow('expected a JSON object')
+    row = {name: (raw.get(name).strip() if isinstance(raw.get(name), str) else raw.get(name))
+           for name in IMPORT_FIELDS}
+    missing = [name for name in REQUIRED_FIELDS if row[name] in (None, '')]
+    if missing:
+        raise InvalidRow(f"missing {', '.join(missing)}")
+    price = _number(row, 'price', float)
+    rating = _number(row, 'rating', float, 0.0)
+    if price < 0:
+        raise InvalidRow('price must not be negative')
+    if not 0 <= rating <= 5:
+        raise InvalidRow('rating must be between 0 and 5')
+    brand = row['brand'] or None
+    return {
+        'sku': str(row['sku']),
+        'name': row['name'],
+        'description': row['description'] or '',
+        'price': price,
+        'category': row['category'],
+        'category_key': normalize_key(row['category']),
+        'brand': brand,
+        'brand_key': normalize_key(brand),
+        'stock_quantity': _number(row, 'stock_quantity', int, 0),
+        'image_url': row['image_url'] or None,
+        'rating': rating,
+        'features': _features(row['features']),
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+def _upsert(records, existing):
+    """Write a batch with INSERT ... ON CONFLICT (sku) where supported, else separate inserts and updates"""
+    table = Product.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = (sqlite if dialect == 'sqlite' else postgresql).insert(table)
+        statement = insert.on_conflict_do_update(index_elements=[table.c.sku],
+                                                 set_={name: insert.excluded[name] for name in UPDATE_COLUMNS})
+        db.session.execute(statement, records)
+        return
+    new = [record for record in records if record['sku'] not in existing]
+    if new:
+        db.session.execute(table.insert(), new)
+    # Bind names must differ from column names in an UPDATE ... SET
+    changed = [{f'new_{name}': record[name] for name in ('sku',) + UPDATE_COLUMNS}
+               for record in records if record['sku'] in existing]
+    if changed:
+        update = table.update().where(table.c.sku == bindparam('new_sku')).values(
+            {name: bindparam(f'new_{name}') for name in UPDATE_COLUMNS})
+        db.session.execute(update, changed)
+
+
+def _write_batch(batch, report):
+    """Upsert one batch and its feature rows in a single transaction, then announce it"""
+    skus = list(batch)
+    try:
+        existing = set(db.session.scalars(select(Product.sku).where(Product.sku.in_(skus))))
+        _upsert(list(batch.values()), existing)
+
+        features = ProductFeature.__table__
+        written = db.session.execute(select(Product.id, Product.features).where(Product.sku.in_(skus))).all()
+        ids = [product_id for product_id, _ in written]
+        db.session.execute(features.delete().where(features.c.product_id.in_(ids)))
+        rows = [feature for product_id, product_features in written
+                for feature in feature_rows(product_id, product_features)]
+        if rows:
+            db.session.execute(features.insert(), rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # The catalog index and caches update from snapshots, as for ORM commits
+    snapshots = {row.id: _SNAPSHOT.from_row(row) for row in
+                 db.session.execute(select(*_SNAPSHOT.columns()).where(Product.id.in_(ids)))}
+    publish(snapshots)
+
+    report.created += len(skus) - len(existing)
+    report.updated += len(existing)
+    report.batches += 1
+
+
+def import_products(rows, batch_size=1000, on_batch=None):
+    """
+    Upsert products from (line, row) pairs, keyed on sku.
+
+    Rows are validated and written batch_size at a time, each batch in its
+    own transaction, so memory and lock time stay bounded however long the
+    input is. Within a batch the last row for a sku wins. Invalid rows are
+    skipped and listed in the report. Each committed batch is published to
+    catalog subscribers in this process, so the search index and caches update
+    incrementally without a rebuild; SQL triggers keep the FTS table current.
+    Other processes, such as a server running beside the CLI, see the batches
+    through the persisted catalog stamp, as rows are written with updated_at=now.
+    on_batch(report) is called after every batch. Returns an ImportReport.
+    """
+    report = ImportReport()
+    start = time.perf_counter()
+    batch = {}
+    now = datetime.utcnow()
+    for line, raw in rows:
+        report.rows += 1
+        try:
+            record = clean_row(raw, now)
+        except InvalidRow as e:
+            report.skip(line, e)
+            continue
+        batch[record['sku']] = record
+        if len(batch) >= batch_size:
+            _write_batch(batch, report)
+            batch = {}
+            now = datetime.utcnow()
+            report.seconds = time.perf_counter() - start
+            if on_batch:
+                on_batch(report)
+    if batch:
+        _write_batch(batch, report)
+    report.seconds = time.perf_counter() - start
+    if batch and on_batch:
+        on_batch(report)
+    return report
@@ -0,0 +1,703 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+import heapq
+from itertools import combinations, islice
+import threading
+from models.database import db, Product, normalize_key
+from utils.catalog_sync import subscribe, sync_catalog
+from utils.keyword_matcher import tokenize
+from utils.relevance import BM25Scorer, blend_with_rating, feature_text
+from utils.features import parse_features, feature_entries, feature_lookups
+from utils.fuzzy_index import TrigramIndex
+
+# Relaxation tiers of the chatbot search, from the strictest to the loosest.
+# Ranked search reports which one each product satisfied.
+MATCH_TIERS = ('exact', 'category_price', 'category', 'keywords_all', 'keywords_any', 'price', 'popular')
+POPULAR_TIER = len(MATCH_TIERS) - 1
+
+# How much a 5-star rating boosts a relevance score (0.2 = +20%)
+DEFAULT_RATING_WEIGHT = 0.2
+
+# Queries with more distinct terms than this score every match instead of
+# grouping matches by the terms they contain (2 ** n - 1 groups)
+MAX_PRUNED_TERMS = 6
+# Impact-ordered postings read per term of a group before the first pruning
+# check; the depth doubles until the page provably holds the group's best
+SEARCH_PRUNE_DEPTH = 64
+
+# (query term, rating weight) impact orders kept between catalog changes
+IMPACT_CACHE_SIZE = 1024
+
+# Lower bounds of the facet price buckets; the last bucket is open ended
+PRICE_BUCKET_EDGES = (0, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Lower bounds of the facet rating bands, best first; each band runs up to the previous bound
+RATING_BAND_FLOORS = (4.5, 4.0, 3.0, 0.0)
+
+
+def iter_bits(mask):
+    """Yield the positions of the set bits of mask in ascending order"""
+    bits = bin(mask)[2:][::-1]
+    position = bits.find('1')
+    while position != -1:
+        yield position
+        position = bits.find('1', position + 1)
+
+
+def mask_from_slots(slots):
+    """Build a bitset from slot numbers in one allocation instead of one per bit"""
+    slots = list(slots)
+    if not slots:
+        return 0
+    buffer = bytearray(max(slots) // 8 + 1)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class ImpactOrder:
+    """
+    A query term's (contribution blended with rating, slot) pairs, best first.
+
+    Pairs are heapified up front and sorted only as far as they are read,
+    since a search usually stops after the first few hundred.
+    """
+
+    def __init__(self, pairs):
+        self._heap = [(-score, slot) for score, slot in pairs]
+        heapq.heapify(self._heap)
+        self._read = []
+
+    def __len__(self):
+        return len(self._read) + len(self._heap)
+
+    def __getitem__(self, index):
+        while len(self._read) <= index and self._heap:
+            score, slot = heapq.heappop(self._heap)
+            self._read.append((-score, slot))
+        return self._read[index]
+
+    def __iter__(self):
+        read, heap = self._read, self._heap
+        index = 0
+        while True:
+            if index == len(read):
+                if not heap:
+                    return
+                score, slot = heapq.heappop(heap)
+                read.append((-score, slot))
+            yield read[index]
+            index += 1
+
+
+class CatalogIndex:
+    """
+    In-process search index over the product catalog.
+
+    Every product occupies a slot, and candidate sets are Python integers
+    used as bitsets over those slots: token postings, category and brand
+    buckets and parsed feature entries all AND/OR together in C. Prices live in a sorted array so price
+    ranges resolve with a bisect. The index loads lazily on first use and is
+    then kept current by catalog_sync commit notifications; ensure_loaded()
+    also picks up other processes' commits from the persisted catalog stamp.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._bind = None
+        self._stale = True
+        self._reset()
+
+    def _reset(self):
+        self._records = []
+        self._rank = []
+        self._slot_by_id = {}
+        self._free_slots = []
+        self._all = 0
+        self._postings = {}
+        self._vocabulary = None
+        self._categories = {}
+        self._brands = {}
+        self._features = {}
+        self._prices = []
+        self._price_slots = []
+        self._popular_order = None
+        self._impacts = {}
+        self._relevance = BM25Scorer()
+        self._fuzzy = TrigramIndex()
+
+    def __len__(self):
+        return len(self._slot_by_id)
+
+    # Loading and maintenance
+
+    def ensure_loaded(self):
+        """Build the index for the current database if it is missing or stale"""
+        engine = db.engine
+        # Commits from other processes arrive as published changes first
+        sync_catalog()
+        if self._stale or self._bind is not engine:
+            self.rebuild(engine)
+
+    def rebuild(self, engine=None):
+        """Rebuild the whole index from the products table"""
+        snapshots = [product.to_dict() for product in Product.query.all()]
+        with self._lock:
+            self._reset()
+            self._load(snapshots)
+            self._bind = engine or db.engine
+            self._stale = False
+
+    def _load(self, records):
+        """Bulk-load an empty index; bitsets are built once per key rather than bit by bit"""
+        postings = {}
+        categories = {}
+        brands = {}
+        features = {}
+        for slot, record in enumerate(records):
+            self._records.append(record)
+            self._rank.append((-(record.get('rating') or 0.0), record['price'], record['id']))
+            self._slot_by_id[record['id']] = slot
+            for token in self._document_tokens(record):
+                postings.setdefault(token, []).append(slot)
+            categories.setdefault(normalize_key(record.get('category')) or '', []).append(slot)
+            brands.setdefault(normalize_key(record.get('brand')) or '', []).append(slot)
+            for entry in self._feature_entries(record):
+                features.setdefault(entry, []).append(slot)
+            self._relevance.add(slot, record)
+            self._fuzzy.add(self._fuzzy_terms(record))
+        self._all = (1 << len(records)) - 1
+        self._postings = {token: mask_from_slots(slots) for token, slots in postings.items()}
+        self._categories = {key: mask_from_slots(slots) for key, slots in categories.items()}
+        self._brands = {key: mask_from_slots(slots) for key, slots in brands.items()}
+        self._features = {entry: mask_from_slots(slots) for entry, slots in features.items()}
+        by_price = sorted(range(len(records)), key=lambda slot: records[slot]['price'])
+        self._prices = [records[slot]['price'] for slot in by_price]
+        self._price_slots = by_price
+
+    def apply_changes(self, upserts, deletes, reload=False):
+        """Apply committed product changes without a full rebuild"""
+        with self._lock:
+            if self._bind is None:
+                return
+            if reload:
+                self._stale = True
+                return
+            for product_id in deletes:
+                self._remove(product_id)
+            for product_id, snapshot in upserts.items():
+                self._remove(product_id)
+                self._add(snapshot)
+
+    def _document_tokens(self, record):
+        # The chatbot's keyword columns, features included like fts.KEYWORD_COLUMNS
+        text = ' '.join(record.get(field) or '' for field in ('name', 'description', 'category', 'brand'))
+        return set(tokenize(f"{text} {feature_text(record.get('features'))}"))
+
+    def _feature_entries(self, record):
+        return {entry for pair in parse_features(record.get('features')) for entry in feature_entries(pair)}
+
+    def _fuzzy_terms(self, record):
+        text = ' '.join((record.get('name') or '', record.get('brand') or '', feature_text(record.get('features'))))
+        return set(tokenize(text))
+
+    def _add(self, record):
+        slot = self._free_slots.pop() if self._free_slots else len(self._records)
+        bit = 1 << slot
+        if slot == len(self._records):
+            self._records.append(record)
+            self._rank.append(None)
+        else:
+            self._records[slot] = record
+        self._rank[slot] = (-(record.get('rating') or 0.0), record['price'], record['id'])
+        self._slot_by_id[record['id']] = slot
+        self._all |= bit
+
+        for token in self._document_tokens(record):
+            if token not in self._postings:
+                self._postings[token] = 0
+                self._vocabulary = None
+            self._postings[token] |= bit
+        category = normalize_key(record.get('category')) or ''
+        self._categories[category] = self._categories.get(category, 0) | bit
+        brand = normalize_key(record.get('brand')) or ''
+        self._brands[brand] = self._brands.get(brand, 0) | bit
+        for entry in self._feature_entries(record):
+            self._features[entry] = self._features.get(entry, 0) | bit
+
+        position = bisect_right(self._prices, record['price'])
+        self._prices.insert(position, record['price'])
+        self._price_slots.insert(position, slot)
+        self._relevance.add(slot, record)
+        self._fuzzy.add(self._fuzzy_terms(record))
+        self._popular_order = None
+        self._impacts.clear()
+
+    def _remove(self, product_id):
+        slot = self._slot_by_id.pop(product_id, None)
+        if slot is None:
+            return
+        record = self._records[slot]
+        bit = 1 << slot
+        self._all &= ~bit
+
+        for token in self._document_tokens(record):
+            remaining = self._postings[token] & ~bit
+            if remaining:
+                self._postings[token] = remaining
+            else:
+                del self._postings[token]
+                self._vocabulary = None
+        for table, key in ((self._categories, record.get('category')), (self._brands, record.get('brand'))):
+            key = normalize_key(key) or ''
+            remaining = table[key] & ~bit
+            if remaining:
+                table[key] = remaining
+            else:
+                del table[key]
+        for entry in self._feature_entries(record):
+            remaining = self._features[entry] & ~bit
+            if remaining:
+                self._features[entry] = remaining
+            else:
+                del self._features[entry]
+
+        position = bisect_left(self._prices, record['price'])
+        while self._price_slots[position] != slot:
+            position += 1
+        del self._prices[position]
+        del self._price_slots[position]
+
+        self._relevance.remove(slot)
+        self._fuzzy.remove(self._fuzzy_terms(record))
+        self._records[slot] = None
+        self._rank[slot] = None
+        self._free_slots.append(slot)
+        self._popular_order = None
+        self._impacts.clear()
+
+    # Lookups
+
+    def _field_mask(self, table, value):
+        """Products whose field contains value, like ILIKE '%value%'"""
+        value = value.lower()
+        mask = 0
+        for key, bits in table.items():
+            if value in key:
+                mask |= bits
+        return mask
+
+    def _keyword_mask(self, keyword):
+        """Products with a token equal to or starting with the keyword"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        keyword = keyword.lower()
+        mask = 0
+        position = bisect_left(self._vocabulary, keyword)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(keyword):
+            mask |= self._postings[self._vocabulary[position]]
+            position += 1
+        return mask
+
+    def _category_mask(self, categories):
+        """Products in every category, by normalized key equality like the chatbot's SQL"""
+        mask = self._all
+        for category in categories:
+            mask &= self._categories.get(normalize_key(category), 0)
+        return mask
+
+    def _brand_mask(self, brands):
+        """Products of any of the brands, by normalized key equality"""
+        mask = 0
+        for brand in brands:
+            mask |= self._brands.get(normalize_key(brand), 0)
+        return mask
+
+    def _feature_mask(self, features):
+        """Products having every feature phrase, each matched like ProductFeature.product_ids"""
+        mask = self._all
+        for phrase in features:
+            phrase_mask = 0
+            for lookup in feature_lookups(phrase):
+                phrase_mask |= self._features.get(lookup, 0)
+            mask &= phrase_mask
+        return mask
+
+    def has_feature(self, phrase):
+        """True when some product has a feature matching phrase"""
+        with self._lock:
+            return bool(self._feature_mask([phrase]))
+
+    def _popular_slots(self):
+        """Every live slot ordered by rating DESC, price ASC, computed once per change"""
+        if self._popular_order is None:
+            self._popular_order = sorted(iter_bits(self._all), key=self._rank.__getitem__)
+        return self._popular_order
+
+    def _price_slots_between(self, price_min, price_max):
+        low = bisect_left(self._prices, price_min) if price_min else 0
+        high = bisect_right(self._prices, price_max) if price_max else len(self._prices)
+        return self._price_slots[low:high]
+
+    def _top(self, slots, limit):
+        return [dict(self._records[slot]) for slot in heapq.nsmallest(limit, slots, key=self._rank.__getitem__)]
+
+    def search(self, categories=None, brands=None, keywords=None, price_min=None, price_max=None,
+               limit=10, keyword_and=False, features=None):
+        """
+        Return up to limit product dicts ordered by rating DESC, price ASC.
+
+        Filters combine exactly like the chatbot's SQL queries: every category
+        must match, any brand may match, keywords match all or any depending
+        on keyword_and, every feature phrase must match, and falsy price
+        bounds are ignored.
+        """
+        with self._lock:
+            if not (categories or brands or keywords or price_min or price_max or features):
+                return [dict(self._records[slot]) for slot in self._popular_slots()[:limit]]
+
+            mask = self._feature_mask(features) if features else None
+            if categories:
+                category_mask = self._category_mask(categories)
+                mask = category_mask if mask is None else mask & category_mask
+            if brands:
+                brand_mask = self._brand_mask(brands)
+                mask = brand_mask if mask is None else mask & brand_mask
+            if keywords:
+                keyword_masks = [self._keyword_mask(keyword) for keyword in keywords]
+                keyword_mask = keyword_masks[0]
+                for other in keyword_masks[1:]:
+                    keyword_mask = keyword_mask & other if keyword_and else keyword_mask | other
+                mask = keyword_mask if mask is None else mask & keyword_mask
+
+            if mask is None:
+                # Price is the only filter: walk the price-sorted array directly
+                return self._top(self._price_slots_between(price_min, price_max), limit)
+
+            slots = iter_bits(mask)
+            if price_min or price_max:
+                records = self._records
+                slots = (slot for slot in slots
+                         if (not price_min or records[slot]['price'] >= price_min)
+                         and (not price_max or records[slot]['price'] <= price_max))
+            return self._top(slots, limit)
+
+
+    def correct_terms(self, terms, threshold=0.7):
+        """
+        Map each term that matches nothing in the catalog to its closest
+        product name, brand or feature term. Terms with an exact or prefix
+        match are left alone, so fuzzy matching only kicks in on a miss.
+        """
+        with self._lock:
+            corrections = {}
+            for term in terms:
+                term = term.lower()
+                if self._keyword_mask(term) or self._relevance.expand(term):
+                    continue
+                best = self._fuzzy.best(term, threshold)
+                if best:
+                    corrections[term] = best
+            return corrections
+
+    def _allowed(self, category, brand, price_min, price_max, features=None):
+        """Slots passing the search API's filters, or None when nothing is filtered"""
+        mask = self._feature_mask(features) if features else None
+        if category:
+            category_mask = self._field_mask(self._categories, category)
+            mask = category_mask if mask is None else mask & category_mask
+        if brand:
+            brand_mask = self._field_mask(self._brands, brand)
+            mask = brand_mask if mask is None else mask & brand_mask
+        allowed = set(iter_bits(mask)) if mask is not None else None
+        if price_min is not None or price_max is not None:
+            low = bisect_left(self._prices, price_min) if price_min is not None else 0
+            high = bisect_right(self._prices, price_max) if price_max is not None else len(self._prices)
+            in_range = set(self._price_slots[low:high])
+            allowed = in_range if allowed is None else allowed & in_range
+        return allowed
+
+    def _matching(self, query, category, brand, price_min, price_max, features=None):
+        """(slot, BM25F score) pairs for products passing the search API's filters"""
+        scores = self._relevance.score(query) if query else dict.fromkeys(iter_bits(self._all), 0.0)
+        allowed = self._allowed(category, brand, price_min, price_max, features)
+        if allowed is None:
+            return scores.items()
+        return [(slot, score) for slot, score in scores.items() if slot in allowed]
+
+    def facets(self, query=None, category=None, brand=None, price_min=None, price_max=None, features=None):
+        """
+        Count the products a search would match by category, brand, price
+        bucket and rating band, in a single pass over the matches.
+
+        Takes the same filters as search_text; without a query it counts the
+        whole catalog. Empty price buckets and rating bands are kept so the
+        histograms always have the same shape.
+        """
+        with self._lock:
+            categories = Counter()
+            brands = Counter()
+            price_counts = [0] * len(PRICE_BUCKET_EDGES)
+            rating_counts = [0] * len(RATING_BAND_FLOORS)
+            total = 0
+            for slot, _ in self._matching(query, category, brand, price_min, price_max, features):
+                record = self._records[slot]
+                total += 1
+                categories[record['category']] += 1
+                if record.get('brand'):
+                    brands[record['brand']] += 1
+                price_counts[max(bisect_right(PRICE_BUCKET_EDGES, record['price']) - 1, 0)] += 1
+                rating = record.get('rating') or 0.0
+                band = next((i for i, floor in enumerate(RATING_BAND_FLOORS) if rating >= floor),
+                            len(RATING_BAND_FLOORS) - 1)
+                rating_counts[band] += 1
+
+        def values(counter):
+            return [{'value': value, 'count': count}
+                    for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))]
+
+        edges = PRICE_BUCKET_EDGES + (None,)
+        floors = (None,) + RATING_BAND_FLOORS
+        return {
+            'total': total,
+            'categories': values(categories),
+            'brands': values(brands),
+            'price_buckets': [{'min': edges[i], 'max': edges[i + 1], 'count': count}
+                              for i, count in enumerate(price_counts)],
+            'rating_bands': [{'min': RATING_BAND_FLOORS[i], 'max': floors[i], 'count': count}
+                             for i, count in enumerate(rating_counts)]
+        }
+
+    def search_text(self, query, category=None, brand=None, price_min=None, price_max=None,
+                    offset=0, limit=20, rating_weight=DEFAULT_RATING_WEIGHT, after=None, features=None):
+        """
+        Full-text search ordered by BM25F relevance blended with rating.
+
+        Returns (total, products, last_key); each product dict carries a
+        'relevance' key, and last_key is the sort key of the last product,
+        which a later call passes as after to continue past it without an
+        offset. Category and brand filters match by substring like the
+        API's ILIKE filters, price bounds are inclusive, and every feature
+        phrase must match. A product matches when it has any query term.
+        """
+        with self._lock:
+            records = self._records
+            after = tuple(after) if after is not None else None
+
+            def sort_key(item):
+                return (-item[0],) + self._rank[item[1]]
+
+            def keep(item):
+                return after is None or sort_key(item) > after
+
+            terms = self._relevance.query_terms(query) if query else None
+            if terms is None:
+                candidates = [(blend_with_rating(0.0, records[slot].get('rating'), rating_weight), slot)
+                              for slot, _ in self._matching(None, category, brand, price_min, price_max, features)]
+                total = len(candidates)
+                page = heapq.nsmallest(offset + limit, filter(keep, candidates), key=sort_key)[offset:]
+            else:
+                total, page = self._top_relevant(terms, self._allowed(category, brand, price_min, price_max, features),
+                                                 offset + limit, rating_weight, sort_key, keep)
+                page = page[offset:]
+            products = []
+            for score, slot in page:
+                product = dict(records[slot])
+                product['relevance'] = round(score, 6)
+                products.append(product)
+            return total, products, (list(sort_key(page[-1])) if page else None)
+
+    def _impact_order(self, term, table, rating_weight):
+        """A query term's (contribution blended with rating, slot) pairs, best first"""
+        key = (term, rating_weight)
+        ordered = self._impacts.get(key)
+        if ordered is None:
+            if len(self._impacts) >= IMPACT_CACHE_SIZE:
+                self._impacts.clear()
+            records = self._records
+            ordered = self._impacts[key] = ImpactOrder(
+                (blend_with_rating(contribution, records[slot].get('rating'), rating_weight), slot)
+                for slot, contribution in table.items())
+        return ordered
+
+    def _top_relevant(self, terms, allowed, wanted, rating_weight, sort_key, keep):
+        """
+        Return (total, best wanted (score, slot) pairs) for query terms without scoring every match.
+
+        The rating boost is a per-product factor, so a blended score is the
+        sum of the terms' blended contributions and is at most the sum of
+        their best contributions. A single term's postings are read best
+        first until the page is full and the next one scores lower. With
+        several terms, matches are grouped by which terms they contain
+        using set operations and groups are scored best bound first; once
+        the page's last product beats a group's bound, that group and every
+        later one are skipped. The total comes from set operations too.
+        """
+        records = self._records
+        tables = [self._relevance.query_term(term) for term in terms]
+        matched = set().union(*tables)
+        if allowed is not None:
+            matched &= allowed
+        if not wanted:
+            return len(matched), []
+
+        if len(tables) == 1:
+            page = []
+            for item in self._impact_order(terms[0], tables[0], rating_weight):
+                if len(page) >= wanted and item[0] < page[-1][0]:
+                    break
+                if item[1] in matched and keep(item):
+                    page.append(item)
+            return len(matched), heapq.nsmallest(wanted, page, key=sort_key)
+
+        def score(slot):
+            total = sum(table.get(slot, 0.0) for table in tables)
+            return blend_with_rating(total, records[slot].get('rating'), rating_weight), slot
+
+        if len(tables) > MAX_PRUNED_TERMS:
+            groups = [(float('inf'), None)]
+        else:
+            maxima = [self._impact_order(term, table, rating_weight)[0][0] for term, table in zip(terms, tables)]
+            groups = sorted(((sum(maxima[i] for i in combo), combo)
+                             for size in range(len(tables), 0, -1)
+                             for combo in combinations(range(len(tables)), size)), reverse=True)
+
+        def beats(bound):
+            # Strictly greater, with slack for float rounding, so ties are never cut off
+            return len(page) == wanted and page[-1][0] > bound + 1e-9 * abs(bound)
+
+        candidates = []
+        page = []
+        for bound, combo in groups:
+            if beats(bound):
+                break
+            if combo is None:
+                candidates.extend(item for item in map(score, matched) if keep(item))
+                page = heapq.nsmallest(wanted, candidates, key=sort_key)
+                continue
+            members = matched.intersection(*(tables[i] for i in combo))
+            members.difference_update(*(table for i, table in enumerate(tables) if i not in combo))
+            # Every member has every term of the group, so an unseen member
+            # scores at most the sum of the group's postings at the read depth
+            streams = [(item for item in self._impact_order(terms[i], tables[i], rating_weight) if item[1] in members)
+                       for i in combo]
+            postings = [[] for _ in combo]
+            seen = set()
+            start, depth = 0, SEARCH_PRUNE_DEPTH
+            while members:
+                for stream, read in zip(streams, postings):
+                    read.extend(islice(stream, depth + 1 - len(read)))
+                slots = {slot for read in postings for _, slot in read[start:depth]} - seen
+                seen |= slots
+                candidates.extend(item for item in map(score, slots) if keep(item))
+                page = heapq.nsmallest(wanted, candidates, key=sort_key)
+                if depth >= len(members) or beats(sum(read[depth][0] for read in postings)):
+                    break
+                start, depth = depth, depth * 2
+        return len(matched), page
+
+    def rank(self, categories=None, brands=None, keywords=None, price_min=None, price_max=None, limit=10,
+             rating_weight=DEFAULT_RATING_WEIGHT, features=None):
+        """
+        Evaluate every relaxation tier of the chatbot search in one pass.
+
+        Each candidate is scored by how many constraints it satisfies (all
+        categories, any brand, each keyword, every feature phrase, the price
+        bounds) and assigned
+        the strictest tier from MATCH_TIERS it qualifies for. Only products
+        of the best tier any candidate reached are returned, so the price
+        and popular tiers show up only when nothing matches better. They are
+        ordered by score, then keyword relevance blended with rating, then
+        rating and price, and come back with 'match_tier' and 'match_score'
+        keys. Feature phrases are a match signal like keywords: an exact
+        match needs them, and a product having them counts as a keyword hit,
+        but they never filter out a category match.
+        """
+        keywords = list(keywords or [])
+        has_price = bool(price_min or price_max)
+        with self._lock:
+            records = self._records
+            category_mask = self._category_mask(categories) if categories else 0
+            brand_mask = self._brand_mask(brands) if brands else 0
+            keyword_masks = [self._keyword_mask(keyword) for keyword in keywords]
+            feature_mask = self._feature_mask(features) if features else 0
+
+            # Per-candidate membership tests are cheaper on slot sets than on
+            # catalog-wide integers, so each bitset is expanded exactly once
+            category_slots = set(iter_bits(category_mask))
+            brand_slots = set(iter_bits(brand_mask))
+            keyword_slots = [set(iter_bits(mask)) for mask in keyword_masks]
+            feature_slots = set(iter_bits(feature_mask))
+            relevance = self._relevance.score(keywords) if keywords else {}
+
+            def price_ok(slot):
+                price = records[slot]['price']
+                return (not price_min or price >= price_min) and (not price_max or price <= price_max)
+
+            def classify(slot):
+                category_ok = slot in category_slots
+                brand_ok = slot in brand_slots
+                keyword_hits = sum(1 for slots in keyword_slots if slot in slots)
+                feature_ok = slot in feature_slots
+                in_price = has_price and price_ok(slot)
+                score = category_ok + brand_ok + keyword_hits + feature_ok + in_price
+                keywords_all = bool(keywords) and keyword_hits == len(keywords)
+                price_or_none = in_price or not has_price
+                if ((categories or brands or keywords or has_price or features)
+                        and (category_ok or not categories) and (brand_ok or not brands)
+                        and (keywords_all or not keywords) and (feature_ok or not features)
+                        and price_or_none):
+                    tier = 0
+                elif category_ok and price_or_none:
+                    tier = 1
+                elif category_ok:
+                    tier = 2
+                elif keywords_all and price_or_none:
+                    tier = 3
+                elif (keyword_hits or feature_ok) and price_or_none:
+                    tier = 4
+                elif in_price:
+                    tier = 5
+                else:
+                    tier = POPULAR_TIER
+                blended = blend_with_rating(relevance.get(slot, 0.0), records[slot].get('rating'), rating_weight)
+                return (tier, -score, -blended) + self._rank[slot], slot, tier, score
+
+            # Single scan over every product that matched any term constraint
+            union = category_slots | brand_slots | feature_slots
+            for slots in keyword_slots:
+                union |= slots
+            scored = [classify(slot) for slot in union]
+
+            # Products outside the union can only be price-only or popular
+            # matches; the best `limit` of each are enough to fill the page
+            if has_price:
+                in_range = (slot for slot in self._price_slots_between(price_min, price_max)
+                            if slot not in union)
+                scored.extend(classify(slot) for slot in heapq.nsmallest(limit, in_range, key=self._rank.__getitem__))
+            popular = 0
+            for slot in self._popular_slots():
+                if popular == limit:
+                    break
+                if slot in union or (has_price and price_ok(slot)):
+                    continue
+                scored.append(classify(slot))
+                popular += 1
+
+            ranked = heapq.nsmallest(limit, scored, key=lambda item: item[0])
+            # Like the cascade, only the strictest tier reached is returned, so
+            # price and popular fillers never pad out a page of real matches
+            best = ranked[0][2] if ranked else None
+            results = []
+            for _, slot, tier, score in ranked:
+                if tier != best:
+                    break
+                record = dict(records[slot])
+                record['match_tier'] = MATCH_TIERS[tier]
+                record['match_score'] = score
+                results.append(record)
+            return results
+
+
+catalog_index = CatalogIndex()
+subscribe(catalog_index.apply_changes)
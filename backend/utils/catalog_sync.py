@@ -0,0 +1,159 @@
+import threading
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from models.database import db, CatalogState, Product
+
+# Callbacks invoked after every commit that touched products
+_subscribers = []
+
+# Incremented after every commit that touched products. Caches store the
+# version they were computed at and treat any other version as a miss.
+# Commits made by other processes are picked up by sync_catalog().
+_catalog_version = 0
+
+# (engine, MAX(updated_at), deletions) of the persisted stamp last reconciled
+_synced = None
+# Deletions this process committed, and whether it published a reload, since then
+_local_deletions = 0
+_reload_published = False
+_sync_lock = threading.Lock()
+
+_CHANGES_KEY = 'catalog_changes'
+
+
+def subscribe(callback):
+    """
+    Register callback(upserts, deletes, reload) to run after product commits.
+
+    upserts maps product id to a to_dict() snapshot taken at flush time,
+    deletes is a set of removed product ids, and reload is True when a bulk
+    statement changed rows the ORM could not track individually.
+    """
+    _subscribers.append(callback)
+    return callback
+
+
+def persisted_stamp():
+    """
+    Return (last_modified, deletions, deleted_at) as stored in the database.
+
+    MAX(updated_at) is read off its index; deletes leave nothing there and
+    bump the CatalogState counter instead. Every process sees the same values.
+    """
+    last_modified = db.session.query(func.max(Product.updated_at)).scalar()
+    state = db.session.query(CatalogState.deletions, CatalogState.deleted_at).filter(CatalogState.id == 1).first()
+    deletions, deleted_at = state if state is not None else (0, None)
+    return last_modified, deletions, deleted_at
+
+
+def sync_catalog():
+    """
+    Publish product commits made by other processes since the last call; returns the catalog version.
+
+    The persisted stamp is compared with the one seen last. Rows whose
+    updated_at reached past it are read back and published as upserts,
+    this process's own commits included, which subscribers apply again
+    harmlessly. Deletions this process did not record publish a reload,
+    as the deleted ids are not known. Costs two indexed lookups per call.
+    """
+    global _synced, _local_deletions, _reload_published
+    engine = db.engine
+    last_modified, deletions, _ = persisted_stamp()
+    with _sync_lock:
+        synced, _synced = _synced, (engine, last_modified, deletions)
+        local, _local_deletions = _local_deletions, 0
+        reloaded, _reload_published = _reload_published, False
+    # The first call, or a new database, only takes the baseline; a pending
+    # reload reads everything committed so far anyway
+    if synced is None or synced[0] is not engine or reloaded:
+        return _catalog_version
+    _, seen_modified, seen_deletions = synced
+    if deletions != seen_deletions + local:
+        publish({}, reload=True)
+    elif last_modified != seen_modified:
+        changed = Product.query
+        if seen_modified is not None:
+            changed = changed.filter(Product.updated_at >= seen_modified)
+        publish({product.id: product.to_dict() for product in changed})
+    return _catalog_version
+
+
+def catalog_version():
+    """Return the current catalog version stamp, after picking up other processes' commits"""
+    return sync_catalog()
+
+
+def _pending(session):
+    changes = session.info.get(_CHANGES_KEY)
+    if changes is None:
+        changes = session.info[_CHANGES_KEY] = {'upserts': {}, 'deletes': set(), 'reload': False, 'deletions': 0}
+    return changes
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_products(session, flush_context):
+    """Snapshot products written by this flush while the session can still load them"""
+    changes = None
+    deleted = False
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Product):
+            changes = changes or _pending(session)
+            changes['deletes'].discard(obj.id)
+            changes['upserts'][obj.id] = obj.to_dict()
+    for obj in session.deleted:
+        if isinstance(obj, Product):
+            changes = changes or _pending(session)
+            changes['upserts'].pop(obj.id, None)
+            changes['deletes'].add(obj.id)
+            deleted = True
+    if deleted:
+        # Persisted in the same transaction, so every process's validators see the delete
+        CatalogState.record_deletion(session.connection())
+        _pending(session)['deletions'] += 1
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _record_bulk_statements(orm_execute_state):
+    """Bulk UPDATE/DELETE bypasses the unit of work, so force a full reload"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Product:
+        _pending(orm_execute_state.session)['reload'] = True
+        if orm_execute_state.is_delete:
+            CatalogState.record_deletion(orm_execute_state.session.connection())
+            _pending(orm_execute_state.session)['deletions'] += 1
+
+
+def publish(upserts, deletes=(), reload=False):
+    """
+    Announce committed product changes the ORM did not see, such as bulk inserts.
+
+    Takes the same arguments subscribers receive; call it after the commit.
+    """
+    global _catalog_version, _reload_published
+    _catalog_version += 1
+    if reload:
+        with _sync_lock:
+            _reload_published = True
+    for callback in _subscribers:
+        try:
+            callback(upserts, set(deletes), reload)
+        except Exception as e:
+            print(f"Warning: Catalog subscriber failed: {e}")
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_changes(session):
+    global _local_deletions
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+    with _sync_lock:
+        _local_deletions += changes['deletions']
+    publish(changes['upserts'], changes['deletes'], changes['reload'])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop(_CHANGES_KEY, None)
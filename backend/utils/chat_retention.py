@@ -0,0 +1,140 @@
+import gzip
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select
+from models.database import db, ChatArchive, ChatMessage, ChatSession
+from utils.chat_writer import flush_chat_writes
+
+MODES = ('archive', 'purge')
+
+
+@dataclass
+class RetentionReport:
+    """Totals of one retention run"""
+    sessions: int = 0
+    messages: int = 0
+    archived_bytes: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self):
+        return {
+            'sessions': self.sessions,
+            'messages': self.messages,
+            'archived_bytes': self.archived_bytes,
+            'batches': self.batches,
+            'seconds': round(self.seconds, 3)
+        }
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def archive_payload(chat_session, messages):
+    """gzip-compressed JSON of a session and its messages, fixed replies written out in full"""
+    document = {
+        'session_id': chat_session.session_id,
+        'user_id': chat_session.user_id,
+        'created_at': _isoformat(chat_session.created_at),
+        'updated_at': _isoformat(chat_session.updated_at),
+        'messages': [{
+            'message': message.message,
+            'response': message.response_text,
+            'message_type': message.message_type,
+            'timestamp': _isoformat(message.timestamp)
+        } for message in messages]
+    }
+    return gzip.compress(json.dumps(document, separators=(',', ':')).encode('utf-8'), mtime=0)
+
+
+def read_archive(session_id):
+    """Archived session document for session_id, or None when it was never archived"""
+    payload = db.session.execute(select(ChatArchive.payload).where(ChatArchive.session_id == session_id)
+                                 .order_by(ChatArchive.id.desc())).scalar()
+    return json.loads(gzip.decompress(payload)) if payload is not None else None
+
+
+def _next_batch(cutoff, max_sessions, max_messages):
+    """
+    Oldest sessions idle since before cutoff, at most max_sessions of them holding
+    about max_messages messages in total; a single larger session still forms a batch.
+    """
+    candidates = ChatSession.query.filter(ChatSession.updated_at < cutoff)\
+        .order_by(ChatSession.updated_at.asc(), ChatSession.id.asc()).limit(max_sessions).all()
+    batch = []
+    messages = 0
+    for chat_session in candidates:
+        if batch and messages + (chat_session.message_count or 0) > max_messages:
+            break
+        batch.append(chat_session)
+        messages += chat_session.message_count or 0
+    return batch
+
+
+def run_retention(days, mode='archive', batch_size=100, max_messages=5000, pause=0.0, max_batches=None, now=None):
+    """
+    Archive or purge chat sessions that have been idle for more than days.
+
+    Works oldest first through the updated_at index in small batches, each
+    its own short transaction, so the chat tables are never locked for
+    long: a batch holds at most batch_size sessions and, going by their
+    maintained message counts, about max_messages messages. In 'archive'
+    mode every session is first written to chat_archives as one compressed
+    document; 'purge' only deletes. pause seconds between batches let
+    request traffic in. Returns a RetentionReport.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+    report = RetentionReport()
+    start = time.perf_counter()
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    # Queued messages count as activity; writing them first keeps their sessions
+    flush_chat_writes()
+    resolver = current_app.extensions.get('chat_sessions')
+
+    while max_batches is None or report.batches < max_batches:
+        batch = _next_batch(cutoff, batch_size, max_messages)
+        if not batch:
+            break
+        ids = [chat_session.id for chat_session in batch]
+        session_ids = [chat_session.session_id for chat_session in batch]
+        try:
+            messages = ChatMessage.query.filter(ChatMessage.session_id.in_(ids))\
+                .order_by(ChatMessage.session_id, ChatMessage.id).all()
+            if mode == 'archive':
+                by_session = {}
+                for message in messages:
+                    by_session.setdefault(message.session_id, []).append(message)
+                archives = [{
+                    'session_id': chat_session.session_id,
+                    'user_id': chat_session.user_id,
+                    'created_at': chat_session.created_at,
+                    'last_message_at': chat_session.last_message_at,
+                    'message_count': len(by_session.get(chat_session.id, [])),
+                    'archived_at': datetime.utcnow(),
+                    'payload': archive_payload(chat_session, by_session.get(chat_session.id, []))
+                } for chat_session in batch]
+                db.session.execute(ChatArchive.__table__.insert(), archives)
+                report.archived_bytes += sum(len(archive['payload']) for archive in archives)
+            db.session.execute(ChatMessage.__table__.delete().where(ChatMessage.session_id.in_(ids)))
+            db.session.execute(ChatSession.__table__.delete().where(ChatSession.id.in_(ids)))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        # Loaded rows are gone; nothing should be served from the identity map
+        db.session.expunge_all()
+        if resolver is not None:
+            resolver.forget(session_ids)
+
+        report.sessions += len(batch)
+        report.messages += len(messages)
+        report.batches += 1
+        if pause:
+            time.sleep(pause)
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,94 @@
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from models.database import db, ChatSession
+from utils.response_cache import ResponseCache
+
+
+def upsert_session(session_id, executor=None):
+    """
+    Return the primary key of the chat session session_id, creating it if needed.
+
+    executor is a Session or Connection, db.session by default.
+    On SQLite and PostgreSQL this is a single INSERT ... ON CONFLICT
+    (session_id) DO UPDATE ... RETURNING id; the no-op update makes the
+    existing row's id come back too. Elsewhere it is a SELECT, then an
+    INSERT in a savepoint that falls back to the SELECT when a concurrent
+    request created the session first. The caller commits.
+    """
+    executor = executor if executor is not None else db.session
+    table = ChatSession.__table__
+    dialect = db.session.get_bind().dialect
+    if dialect.name in ('sqlite', 'postgresql') and dialect.insert_returning:
+        insert = (sqlite if dialect.name == 'sqlite' else postgresql).insert(table)
+        statement = insert.values(session_id=session_id).on_conflict_do_update(
+            index_elements=[table.c.session_id], set_={'session_id': insert.excluded.session_id}
+        ).returning(table.c.id)
+        return executor.execute(statement).scalar_one()
+
+    lookup = select(table.c.id).where(table.c.session_id == session_id)
+    session_pk = executor.execute(lookup).scalar()
+    if session_pk is not None:
+        return session_pk
+    try:
+        with executor.begin_nested():
+            return executor.execute(table.insert().values(session_id=session_id)).inserted_primary_key[0]
+    except IntegrityError:
+        return executor.execute(lookup).scalar_one()
+
+
+class SessionResolver:
+    """
+    Maps chat session ids to ChatSession primary keys through a bounded LRU.
+
+    A session's key never changes once created, so after its first message
+    a session resolves without touching the database. Misses upsert the
+    session and commit it before caching the key, so a key is only ever
+    cached once its row is durable. Deletions in this process call
+    forget(). A session another process deleted while its key was cached
+    is noticed when the next message is written: the write finds no row,
+    and add_message() and the ChatWriter recreate the session rather than
+    store the message against a missing key. Entries also expire after ttl
+    seconds.
+    """
+
+    def __init__(self, max_entries=10000, ttl=3600):
+        self.cache = ResponseCache(max_entries=max_entries, ttl=ttl)
+
+    def resolve(self, session_id):
+        """Primary key of session_id, creating the session on first use"""
+        session_pk = self.cache.get(session_id)
+        if session_pk is None:
+            session_pk = upsert_session(session_id)
+            db.session.commit()
+            self.cache.set(session_id, session_pk)
+        return session_pk
+
+    def add_message(self, session_id, message, response, message_type='text', template_id=None):
+        """Add a message to session_id and commit, recreating the session if it was deleted elsewhere"""
+        chat_message = ChatSession.add_message(self.resolve(session_id), message, response, message_type, template_id)
+        if chat_message is None:
+            self.forget([session_id])
+            chat_message = ChatSession.add_message(self.resolve(session_id), message, response, message_type,
+                                                   template_id)
+        db.session.commit()
+        return chat_message
+
+    def forget(self, session_ids):
+        """Drop cached keys of deleted sessions"""
+        for session_id in session_ids:
+            self.cache.discard(session_id)
+
+
+def init_session_resolver(app):
+    """Install the app's SessionResolver; the cache lives with the app, like its database"""
+    resolver = SessionResolver(max_entries=app.config['CHAT_SESSION_CACHE_SIZE'],
+                               ttl=app.config['CHAT_SESSION_CACHE_TTL'])
+    app.extensions['chat_sessions'] = resolver
+    return resolver
+
+
+def session_resolver():
+    """The current app's SessionResolver"""
+    return current_app.extensions['chat_sessions']
@@ -0,0 +1,74 @@
+import hashlib
+import threading
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from models.database import db, ChatResponseTemplate
+
+# Message types whose response is fixed text from ChatbotEngine rather than built per message
+TEMPLATE_TYPES = ('greeting', 'help', 'availability', 'features', 'error')
+
+
+def response_digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def ensure_template(executor, text):
+    """
+    Primary key of the chat_response_templates row holding text, inserting it if needed.
+
+    executor is a Session or Connection. Templates are content-addressed,
+    so a reworded reply simply becomes a new template and rows written
+    before keep pointing at the text they were sent with.
+    """
+    table = ChatResponseTemplate.__table__
+    digest = response_digest(text)
+    lookup = select(table.c.id).where(table.c.digest == digest)
+    template_id = executor.execute(lookup).scalar()
+    if template_id is not None:
+        return template_id
+    try:
+        with executor.begin_nested():
+            return executor.execute(table.insert().values(digest=digest, text=text)).inserted_primary_key[0]
+    except IntegrityError:
+        return executor.execute(lookup).scalar_one()
+
+
+class ResponseTemplates:
+    """
+    In-process digest -> template id map for storing fixed replies by reference.
+
+    There are only a handful of fixed replies, so after the first of each
+    the map answers without a query and the map never needs evicting.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def compact(self, response, message_type):
+        """Return (stored_response, template_id): fixed replies become ('', id), others pass through"""
+        if message_type not in TEMPLATE_TYPES or not response:
+            return response, None
+        digest = response_digest(response)
+        with self._lock:
+            template_id = self._ids.get(digest)
+        if template_id is None:
+            template_id = ensure_template(db.session, response)
+            # Committed before caching, so the id never refers to a rolled back row
+            db.session.commit()
+            with self._lock:
+                self._ids[digest] = template_id
+        return '', template_id
+
+
+def init_response_templates(app):
+    """Install the app's ResponseTemplates; ids belong to the app's database"""
+    templates = ResponseTemplates()
+    app.extensions['chat_templates'] = templates
+    return templates
+
+
+def response_templates():
+    """The current app's ResponseTemplates"""
+    return current_app.extensions['chat_templates']
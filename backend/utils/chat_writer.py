@@ -0,0 +1,212 @@
+import atexit
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.exc import DisconnectionError, OperationalError, TimeoutError as PoolTimeoutError
+from models.database import db, ChatMessage, ChatSession
+from utils.chat_sessions import upsert_session
+
+# Failures worth retrying as they are: lost connections, lock timeouts, an exhausted pool
+TRANSIENT_ERRORS = (OperationalError, DisconnectionError, PoolTimeoutError)
+
+
+class ChatWriter:
+    """
+    Write-behind buffer for chat messages.
+
+    Requests append messages and return without touching the database; a
+    background thread writes them in one transaction per batch once
+    batch_size messages are waiting or the oldest has waited interval
+    seconds. Each batch is one executemany into chat_messages and one
+    counter update per session. Readers call flush() first to see their
+    own writes. When max_pending messages are waiting, the appending
+    request flushes itself, so a stalled database pushes back instead of
+    growing the buffer without bound.
+
+    A batch failing with a transient error is retried up to retries times,
+    retry_delay seconds apart and doubling. If it still fails, or fails for
+    any other reason such as one bad row, its rows are written one at a
+    time and those that fail again are logged and dropped, so one message
+    can never block the queue. flush() therefore never raises.
+
+    Messages appended with their session_id recover from a session that
+    another process deleted after its key was cached: the batch recreates
+    the session and writes them against the new key.
+    """
+
+    def __init__(self, app, batch_size=100, interval=0.2, max_pending=10000, retries=3, retry_delay=0.05):
+        self.app = app
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max_pending
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._pending = []
+        self._oldest = None
+        self._lock = threading.Condition()
+        # Held while a batch is written, so batches commit in order
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.batches = 0
+        self.written = 0
+        self.dropped = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def append(self, session_pk, message, response, message_type='text', template_id=None, session_id=None):
+        """Queue one message of the session with primary key session_pk, whose id is session_id"""
+        row = {'session_id': session_pk, 'message': message, 'response': response,
+               'message_type': message_type, 'timestamp': datetime.utcnow(), 'template_id': template_id,
+               'session_key': session_id}
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(row)
+            backlog = len(self._pending)
+            # Wake the writer to start the interval clock, or to write a full batch
+            if backlog == 1 or backlog >= self.batch_size:
+                self._lock.notify()
+            closed = self._closed
+        if backlog >= self.max_pending or closed:
+            self.flush()
+
+    def flush(self):
+        """Write every queued message now; returns the number written"""
+        with self._write_lock:
+            with self._lock:
+                rows, self._pending, self._oldest = self._pending, [], None
+            if not rows:
+                return 0
+            try:
+                self._write_with_retries(rows)
+                written = len(rows)
+            except Exception as e:
+                print(f"Warning: Chat write-behind batch of {len(rows)} failed, writing rows one by one: {e}")
+                written = self._write_rows(rows)
+            self.batches += 1
+            self.written += written
+            return written
+
+    def _write_with_retries(self, rows):
+        for attempt in range(self.retries + 1):
+            try:
+                with self.app.app_context():
+                    self._write(rows)
+                return
+            except TRANSIENT_ERRORS:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.retry_delay * 2 ** attempt)
+
+    def _write_rows(self, rows):
+        """Write rows one per transaction, dropping those that fail; returns the number written"""
+        written = 0
+        for row in rows:
+            try:
+                with self.app.app_context():
+                    self._write([row])
+                written += 1
+            except Exception as e:
+                self.dropped += 1
+                print(f"Warning: Dropped chat message for session {row['session_id']}: {e}")
+        return written
+
+    def _write(self, rows):
+        table = ChatSession.__table__
+        touch = table.update().where(table.c.id == bindparam('pk')).values(
+            message_count=func.coalesce(table.c.message_count, 0) + bindparam('added'),
+            last_message_at=bindparam('last'),
+            updated_at=bindparam('last'))
+        with db.engine.begin() as connection:
+            recreated = self._recreate_sessions(connection, rows)
+            messages = []
+            sessions = {}
+            for row in rows:
+                message = {name: value for name, value in row.items() if name != 'session_key'}
+                if row['session_id'] in recreated:
+                    message['session_id'] = recreated[row['session_id']][1]
+                messages.append(message)
+                count = sessions.get(message['session_id'], (0, None))[0]
+                sessions[message['session_id']] = (count + 1, row['timestamp'])
+            connection.execute(ChatMessage.__table__.insert(), messages)
+            connection.execute(touch, [{'pk': pk, 'added': count, 'last': last}
+                                       for pk, (count, last) in sessions.items()])
+        resolver = self.app.extensions.get('chat_sessions')
+        if resolver is not None:
+            # Only cached once the recreated rows are committed
+            for session_id, session_pk in recreated.values():
+                resolver.cache.set(session_id, session_pk)
+
+    def _recreate_sessions(self, connection, rows):
+        """{old key: (session_id, new key)} for sessions deleted since their key was cached"""
+        table = ChatSession.__table__
+        keys = {row['session_id']: row['session_key'] for row in rows}
+        existing = set(connection.execute(select(table.c.id).where(table.c.id.in_(keys))).scalars())
+        return {session_pk: (session_id, upsert_session(session_id, connection))
+                for session_pk, session_id in keys.items() if session_pk not in existing and session_id is not None}
+
+    def _due(self):
+        if not self._pending:
+            return None
+        if len(self._pending) >= self.batch_size:
+            return 0
+        return max(self._oldest + self.interval - time.monotonic(), 0)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                wait = self._due()
+                while not self._closed and wait != 0:
+                    self._lock.wait(wait)
+                    wait = self._due()
+                if self._closed:
+                    return
+            self.flush()
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='chat-writer', daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stop the writer thread and write whatever is still queued"""
+        with self._lock:
+            self._closed = True
+            self._lock.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+def init_chat_writer(app):
+    """Install the write-behind chat writer on app when CHAT_WRITE_BEHIND is set"""
+    if not app.config['CHAT_WRITE_BEHIND']:
+        return None
+    writer = ChatWriter(app, batch_size=app.config['CHAT_WRITE_BEHIND_BATCH_SIZE'],
+                        interval=app.config['CHAT_WRITE_BEHIND_INTERVAL'],
+                        max_pending=app.config['CHAT_WRITE_BEHIND_MAX_PENDING'],
+                        retries=app.config['CHAT_WRITE_BEHIND_RETRIES'])
+    app.extensions['chat_writer'] = writer
+    writer.start()
+    atexit.register(writer.close)
+    return writer
+
+
+def chat_writer():
+    """The current app's ChatWriter, or None when messages are written synchronously"""
+    return current_app.extensions.get('chat_writer')
+
+
+def flush_chat_writes():
+    """Make buffered messages visible before reading chat tables"""
+    writer = chat_writer()
+    if writer is not None and writer.flush():
+        # Drop session state loaded before the batch landed, e.g. a session's counters
+        db.session.expire_all()
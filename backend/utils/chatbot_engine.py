@@ -1,15 +1,29 @@
-from models.database import Product
-from sqlalchemy import or_, and_
+from models.database import db, Product, ProductFeature, normalize_key
+from sqlalchemy import or_, and_, case, literal
+from utils.keyword_matcher import KeywordMatcher, tokenize
+from utils.features import normalize_feature
+from utils.message_analysis import MessageAnalysis
+from utils.catalog_index import catalog_index, MATCH_TIERS, POPULAR_TIER
+from utils.catalog_sync import catalog_version
+from utils.response_cache import ResponseCache
+from utils import fts
+import logging
 import re
 import json
-from difflib import SequenceMatcher
+
+logger = logging.getLogger(__name__)
 
 class ChatbotEngine:
     """
     Enhanced AI chatbot engine for processing e-commerce queries with advanced NLP
     """
     
-    def __init__(self):
+    def __init__(self, search_backend='index', search_mode='ranked', cache_size=1024, cache_ttl=300):
+        # 'index' answers searches from the in-memory catalog index, 'sql' queries the database
+        self.search_backend = search_backend
+        # 'ranked' scores every relaxation tier in one pass, 'cascade' retries looser filters
+        self.search_mode = search_mode
+        
         # Enhanced greeting patterns
         self.greeting_patterns = [
             r'\b(hi|hello|hey|greetings|good\s*(morning|afternoon|evening)|howdy|sup)\b',
@@ -60,6 +74,22 @@ class ChatbotEngine:
             'nikon': ['nikon']
         }
         
+        # Compound categories are prioritized as a single filter
+        self.compound_categories = {
+            'gaming laptops': {'category': 'laptops', 'keyword': 'gaming'},
+            'smart watches': {'category': 'smartwatches', 'keyword': 'smart'},
+            'wireless headphones': {'category': 'headphones', 'keyword': 'wireless'},
+            'smartphone accessories': {'category': 'accessories', 'keyword': 'smartphone'},
+            # Add more compound categories as needed
+        }
+        
+        # All synonyms compiled once into a word-boundary aware matcher
+        self.keyword_matcher = KeywordMatcher()
+        self.keyword_matcher.add_mapping('category', self.category_mapping)
+        self.keyword_matcher.add_mapping('brand', self.brand_mapping)
+        for compound, mapping in self.compound_categories.items():
+            self.keyword_matcher.add(compound, ('compound', (mapping['category'], mapping['keyword'])))
+        
         # Price keywords
         self.price_patterns = {
             'cheap': r'\b(cheap|affordable|budget|inexpensive|low\s*cost|economical)\b',
@@ -76,10 +106,24 @@ class ChatbotEngine:
             'availability': r'\b(available|in\s*stock|stock|inventory)\b',
             'features': r'\b(features|specs|specifications|details|about)\b'        }
         
+        # Feature requests: the words after 'with' up to a price, a clause break or another request
+        self.feature_pattern = re.compile(
+            r'\b(?:with|featuring|that\s+has|which\s+has|having)\s+(.+?)'
+            r'(?=\s+(?:under|below|above|over|between|less|more|cheaper|for|from|in|that|which|but|around)\b|[,.;!?$]|$)')
+        self.feature_fillers = {'a', 'an', 'the', 'some', 'good', 'great', 'nice', 'decent', 'big', 'large',
+                                'long', 'fast', 'really', 'very', 'at', 'least', 'plus'}
+        
         self.help_patterns = [
             r'\b(help|assist|support|guide)\b',
             r'\b(how\s*to|what\s*can\s*you\s*do|capabilities)\b'
         ]
+        
+        # Greeting and help responses never change, so build them once
+        self._greeting_response = self._handle_greeting()
+        self._help_response = self._handle_help()
+        
+        # Responses keyed on the parsed message and the catalog version; 0 disables caching
+        self.response_cache = ResponseCache(cache_size, cache_ttl) if cache_size else None
     
     def process_message(self, message):
         """
@@ -87,94 +131,110 @@ class ChatbotEngine:
         """
         message_lower = message.lower().strip()
         
+        # Greetings and help are static and skip parsing, caching and the database
+        static = self.static_response(message_lower)
+        if static is not None:
+            return static
+        
+        # Parse the message once; every handler below reuses this analysis
+        analysis = self.analyze(message)
+        
+        # Any product commit bumps the catalog version and so misses the cache
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = (catalog_version(),) + analysis.cache_key()
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+        
+        response = self._respond(analysis)
+        if cache_key is not None and response.get('type') != 'error':
+            self.response_cache.set(cache_key, response)
+        return dict(response)
+    
+    def static_response(self, message_lower):
+        """Return the precomputed greeting or help response if the message asks for one"""
         # Check for greetings
         if self._matches_pattern(message_lower, self.greeting_patterns):
-            return self._handle_greeting()
+            return dict(self._greeting_response)
         
         # Check for help requests
         if self._matches_pattern(message_lower, self.help_patterns):
-            return self._handle_help()
-        
-        # Extract entities first to better identify the message type
-        entities = self._extract_entities(message_lower)
-        
-        # Detect intent using extracted entities
-        intent = self._detect_intent(message_lower)
+            return dict(self._help_response)
         
+        return None
+    
+    def _respond(self, analysis):
+        """Route an analyzed message to the handler for its intent"""
         # Check for direct product queries - when categories or price info exists
-        if (entities['categories'] or 
-            entities['price_min'] is not None or 
-            entities['price_max'] is not None):
-            return self._handle_product_search(message, intent)
+        if analysis.has_product_filters:
+            return self._handle_product_search(analysis)
         
         # Check for product search with explicit search terms
-        if self._matches_pattern(message_lower, self.search_patterns) or intent in ['search', 'recommendation', 'comparison']:
-            return self._handle_product_search(message, intent)
+        if analysis.explicit_search or analysis.intent in ['search', 'recommendation', 'comparison']:
+            return self._handle_product_search(analysis)
         
         # Handle specific intents
-        if intent == 'availability':
-            return self._handle_availability_check(message)
+        if analysis.intent == 'availability':
+            return self._handle_availability_check(analysis)
         
-        if intent == 'features':
-            return self._handle_feature_inquiry(message)
+        if analysis.intent == 'features':
+            return self._handle_feature_inquiry(analysis)
         
         # Default response with intelligent suggestions
-        return self._handle_default(message)
+        return self._handle_default(analysis)
+    
+    def analyze(self, message):
+        """Parse a message into a MessageAnalysis, running each stage exactly once"""
+        normalized = message.lower().strip()
+        tokens = tuple(tokenize(normalized))
+        hits = self.keyword_matcher.scan(tokens)
+        entities = self._extract_entities(normalized, hits)
+        return MessageAnalysis(
+            text=message.strip(),
+            normalized=normalized,
+            tokens=tokens,
+            intent=self._detect_intent(normalized, hits),
+            explicit_search=self._matches_pattern(normalized, self.search_patterns),
+            **entities
+        )
     
-    def _detect_intent(self, message):
-        """Detect user intent from message"""
+    def _detect_intent(self, message, hits):
+        """Detect user intent from the message and its keyword matcher hits"""
         for intent, pattern in self.intent_patterns.items():
             if re.search(pattern, message, re.IGNORECASE):
                 return intent
         
         # Check for category mentions
-        for category, keywords in self.category_mapping.items():
-            for keyword in keywords:
-                if keyword in message:
-                    return 'search'
+        for kind, _ in hits:
+            if kind == 'category':
+                return 'search'
         
         return 'general'
     
-    def _extract_entities(self, message):
-        """Extract entities like categories, brands, price ranges from message"""
+    def _extract_entities(self, message_lower, hits):
+        """Extract entities like categories, brands, price ranges from a normalized message"""
         entities = {
             'categories': [],
             'brands': [],
             'price_min': None,
             'price_max': None,
             'keywords': [],
-            'intent': self._detect_intent(message)
+            'features': []
         }
         
-        message_lower = message.lower()
-        
-        # Improved compound categories: prioritize as a single filter
-        compound_categories = {
-            'gaming laptops': {'category': 'laptops', 'keyword': 'gaming'},
-            'smart watches': {'category': 'smartwatches', 'keyword': 'smart'},
-            'wireless headphones': {'category': 'headphones', 'keyword': 'wireless'},
-            'smartphone accessories': {'category': 'accessories', 'keyword': 'smartphone'},
-            # Add more compound categories as needed
-        }
-        found_compound = False
-        for compound, mapping in compound_categories.items():
-            if compound in message_lower:
-                entities['categories'].append(mapping['category'])
-                entities['keywords'].append(mapping['keyword'])
-                found_compound = True
+        # Categories, brands and compounds come from a single matcher scan
+        compound_hits = [value for kind, value in hits if kind == 'compound']
+        for category, keyword in compound_hits:
+            entities['categories'].append(category)
+            entities['keywords'].append(keyword)
         
         # Only extract individual categories if no compound found
-        if not found_compound:
-            for category, keywords in self.category_mapping.items():
-                for keyword in keywords:
-                    if keyword in message_lower:
-                        entities['categories'].append(category)
+        if not compound_hits:
+            entities['categories'].extend(value for kind, value in hits if kind == 'category')
         
         # Extract brands
-        for brand, keywords in self.brand_mapping.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    entities['brands'].append(brand)
+        entities['brands'].extend(value for kind, value in hits if kind == 'brand')
         
         # Extract price ranges
         under_match = re.search(self.price_patterns['under'], message_lower)
@@ -215,10 +275,19 @@ class ChatbotEngine:
             if word not in stop_words and len(word) > 2 and word not in entities['keywords']:
                 entities['keywords'].append(word)
         
-        # Remove duplicates
-        entities['categories'] = list(set(entities['categories']))
-        entities['brands'] = list(set(entities['brands']))
-        entities['keywords'] = list(set(entities['keywords']))
+        # Feature phrases; the search handler keeps only those some product has
+        for match in self.feature_pattern.finditer(message_lower):
+            for phrase in re.split(r'\s+(?:and|or|&)\s+|/', match.group(1)):
+                words = [word for word in phrase.split() if word not in self.feature_fillers]
+                phrase = normalize_feature(' '.join(words))
+                if phrase:
+                    entities['features'].append(phrase)
+        
+        # Remove duplicates, keeping the order they appeared in the message
+        entities['categories'] = tuple(dict.fromkeys(entities['categories']))
+        entities['brands'] = tuple(dict.fromkeys(entities['brands']))
+        entities['keywords'] = tuple(dict.fromkeys(entities['keywords']))
+        entities['features'] = tuple(dict.fromkeys(entities['features']))
         
         return entities
 
@@ -258,122 +327,245 @@ class ChatbotEngine:
 Just describe what you need and I'll help you find it!""",
             'type': 'help'        }
     
-    def _handle_product_search(self, message, intent='search'):
+    def _handle_product_search(self, analysis):
         """Handle product search queries with enhanced AI and fallback logic"""
         try:
-            entities = self._extract_entities(message)
+            intent = analysis.intent
+            entities = analysis.to_entities()
             # Remove category names and synonyms from keywords to avoid redundant filtering
             category_synonyms = set()
             for cat in entities['categories']:
                 category_synonyms.update(self.category_mapping.get(cat, []))
             entities['keywords'] = [kw for kw in entities['keywords'] if kw not in entities['categories'] and kw not in category_synonyms]
-            from sqlalchemy import or_, and_
-            query = Product.query
-            print(f"[DEBUG] Entities: {entities}")
-
-            def run_query(category_filters=None, brand_filters=None, keyword_filters=None, price_min=None, price_max=None, limit=10, keyword_and=False):
-                q = Product.query
-                if category_filters:
-                    q = q.filter(and_(*category_filters))
-                if brand_filters:
-                    q = q.filter(or_(*brand_filters))
-                if keyword_filters:
-                    if keyword_and:
-                        # All keywords must match somewhere (AND)
-                        for kf in keyword_filters:
-                            q = q.filter(or_(*kf))
-                    else:
-                        # Any keyword match (OR)
-                        q = q.filter(or_(*[item for sublist in keyword_filters for item in sublist]))
-                if price_min:
-                    q = q.filter(Product.price >= price_min)
-                if price_max:
-                    q = q.filter(Product.price <= price_max)
-                q = q.order_by(Product.rating.desc(), Product.price.asc())
-                print(f"[DEBUG] SQL: {str(q)}")
-                return q.limit(limit).all()
+            # Features some product has become a match signal; their words stay keywords
+            if entities['features']:
+                catalog_index.ensure_loaded()
+                entities['features'] = [phrase for phrase in entities['features'] if catalog_index.has_feature(phrase)]
+            # Keywords matching nothing in the catalog fall back to their closest fuzzy match
+            if entities['keywords']:
+                catalog_index.ensure_loaded()
+                corrections = catalog_index.correct_terms(entities['keywords'])
+                if corrections:
+                    entities['keywords'] = [corrections.get(kw, kw) for kw in entities['keywords']]
+                    entities['corrections'] = corrections
+            logger.debug('Entities: %s', entities)
 
-            # Build filters
-            category_filters = [Product.category.ilike(f'%{cat}%') for cat in entities['categories']] if entities['categories'] else None
-            brand_filters = [Product.brand.ilike(f'%{brand}%') for brand in entities['brands']] if entities['brands'] else None
-            # For better NLU: build keyword_filters as a list of lists (for AND logic)
-            keyword_filters = []
-            for keyword in entities['keywords']:
-                keyword_filters.append([
-                    Product.name.ilike(f'%{keyword}%'),
-                    Product.description.ilike(f'%{keyword}%'),
-                    Product.category.ilike(f'%{keyword}%'),
-                    Product.brand.ilike(f'%{keyword}%')
-                ])
-            keyword_filters = keyword_filters if keyword_filters else None
+            categories = entities['categories'] or None
+            brands = entities['brands'] or None
+            keywords = entities['keywords'] or None
+            features = entities['features'] or None
             price_min = entities['price_min']
             price_max = entities['price_max']
             limit = 5 if intent == 'recommendation' else 10
 
-            # 1. Try strict: category + brand + ALL keywords (AND) + price
-            products = run_query(category_filters, brand_filters, keyword_filters, price_min, price_max, limit, keyword_and=True)
-            print(f"[DEBUG] Products found (strict AND): {len(products)}")
-            if not products:
-                # 2. Try: category + price only
-                products = run_query(category_filters, None, None, price_min, price_max, limit)
-                print(f"[DEBUG] Products found (category+price): {len(products)}")
-            if not products and category_filters:
-                # 3. Try: category only
-                products = run_query(category_filters, None, None, None, None, limit)
-                print(f"[DEBUG] Products found (category only): {len(products)}")
-            # Always try keywords only if there are keywords, even if no category
-            if not products and keyword_filters:
-                # Try ALL keywords (AND)
-                products = run_query(None, None, keyword_filters, price_min, price_max, limit, keyword_and=True)
-                print(f"[DEBUG] Products found (keywords only AND): {len(products)}")
-            if not products and keyword_filters:
-                # Try ANY keyword (OR)
-                products = run_query(None, None, keyword_filters, price_min, price_max, limit, keyword_and=False)
-                print(f"[DEBUG] Products found (keywords only OR): {len(products)}")
+            if self.search_mode == 'ranked':
+                rank = self._rank_index if self.search_backend == 'index' else self._rank_database
+                products = rank(categories, brands, keywords, price_min, price_max, limit, features)
+                logger.debug('Products found (ranked): %d', len(products))
+                matched = bool(products) and products[0]['match_tier'] != MATCH_TIERS[POPULAR_TIER]
+                exact = bool(products) and products[0]['match_tier'] == MATCH_TIERS[0]
+            else:
+                products, matched, exact = self._cascade_search(categories, brands, keywords, price_min, price_max,
+                                                                limit, features)
+
             if not products:
-                # Fallback: show popular products (no filters)
-                products = Product.query.order_by(Product.rating.desc(), Product.price.asc()).limit(limit).all()
-                print(f"[DEBUG] Products found (popular fallback): {len(products)}")
-                if not products:
-                    return self._handle_no_results(entities, message)
-                else:
-                    response = "I couldn't find an exact match, but here are some of our most popular products:"
-                    product_list = [product.to_dict() for product in products]
-                    return {
-                        'response': response,
-                        'type': 'product_search',
-                        'products': product_list,
-                        'intent': intent,
-                        'entities': entities
-                    }
-            # If we found products in any step
-            product_list = [product.to_dict() for product in products]
-            response = self._generate_response_text(entities, products, intent)
+                return self._handle_no_results(entities, analysis.text)
+            if not matched:
+                response = "I couldn't find an exact match, but here are some of our most popular products:"
+            else:
+                # Only claim the requested features when the products returned have them
+                described = entities if exact else dict(entities, features=[])
+                response = self._generate_response_text(described, products, intent)
             return {
                 'response': response,
                 'type': 'product_search',
-                'products': product_list,
+                'products': products,
                 'intent': intent,
                 'entities': entities
             }
         except Exception as e:
-            print(f"[DEBUG] Exception: {e}")
+            logger.exception('Product search failed')
             return {
                 'response': "I'm having trouble processing your search request. Please try rephrasing your query or ask for help to see what I can do.",
                 'type': 'error'
             }
     
         
+    def _cascade_search(self, categories, brands, keywords, price_min, price_max, limit, features=None):
+        """
+        Retry with looser filters until a step returns products.
+
+        Returns (products, matched, exact), exact meaning the strict step,
+        the only one requiring the requested features, found them.
+        """
+        run_query = self._query_index if self.search_backend == 'index' else self._query_database
+
+        # 1. Try strict: category + brand + ALL keywords (AND) + price + features
+        products = run_query(categories, brands, keywords, price_min, price_max, limit, keyword_and=True,
+                             features=features)
+        logger.debug('Products found (strict AND): %d', len(products))
+        if products:
+            return products, True, True
+        # 2. Try: category + price only
+        products = run_query(categories, None, None, price_min, price_max, limit)
+        logger.debug('Products found (category+price): %d', len(products))
+        if not products and categories:
+            # 3. Try: category only
+            products = run_query(categories, None, None, None, None, limit)
+            logger.debug('Products found (category only): %d', len(products))
+        # Always try keywords only if there are keywords, even if no category
+        if not products and keywords:
+            # Try ALL keywords (AND)
+            products = run_query(None, None, keywords, price_min, price_max, limit, keyword_and=True)
+            logger.debug('Products found (keywords only AND): %d', len(products))
+        if not products and keywords:
+            # Try ANY keyword (OR)
+            products = run_query(None, None, keywords, price_min, price_max, limit, keyword_and=False)
+            logger.debug('Products found (keywords only OR): %d', len(products))
+        if products:
+            return products, True, False
+        # Fallback: show popular products (no filters)
+        products = run_query(limit=limit)
+        logger.debug('Products found (popular fallback): %d', len(products))
+        return products, False, False
+    
+    def _rank_index(self, categories=None, brands=None, keywords=None, price_min=None, price_max=None, limit=10,
+                    features=None):
+        """Score every relaxation tier in one scan of the in-memory catalog index"""
+        catalog_index.ensure_loaded()
+        return catalog_index.rank(categories, brands, keywords, price_min, price_max, limit, features=features)
+    
+    def _keyword_condition(self, keyword):
+        """
+        SQL filter for one keyword: an FTS5 prefix match when available, ILIKE otherwise.
+
+        Without FTS, features are matched through the indexed product_features
+        table rather than by scanning the JSON column.
+        """
+        if fts.fts_enabled():
+            return Product.id.in_(fts.matching_ids(keyword))
+        return or_(
+            Product.name.ilike(f'%{keyword}%'),
+            Product.description.ilike(f'%{keyword}%'),
+            Product.category.ilike(f'%{keyword}%'),
+            Product.brand.ilike(f'%{keyword}%'),
+            Product.id.in_(ProductFeature.keyword_product_ids(keyword))
+        )
+    
+    def _feature_condition(self, features):
+        """SQL filter requiring every feature phrase, through the indexed product_features table"""
+        return and_(*[Product.id.in_(ProductFeature.product_ids(phrase)) for phrase in features])
+    
+    def _rank_database(self, categories=None, brands=None, keywords=None, price_min=None, price_max=None, limit=10,
+                       features=None):
+        """Score every relaxation tier in a single SQL query, mirroring CatalogIndex.rank"""
+        def flag(condition):
+            return case((condition, 1), else_=0) if condition is not None else literal(0)
+
+        category_ok = and_(*[Product.category_key == normalize_key(cat) for cat in categories]) if categories else None
+        brand_ok = Product.brand_key.in_([normalize_key(brand) for brand in brands]) if brands else None
+        keyword_oks = [self._keyword_condition(keyword) for keyword in keywords or []]
+        feature_ok = self._feature_condition(features) if features else None
+        price_conditions = []
+        if price_min:
+            price_conditions.append(Product.price >= price_min)
+        if price_max:
+            price_conditions.append(Product.price <= price_max)
+        price_ok = and_(*price_conditions) if price_conditions else None
+
+        keywords_all = and_(*keyword_oks) if keyword_oks else None
+        keywords_any = or_(*keyword_oks) if keyword_oks else None
+
+        def when_price(condition):
+            return and_(condition, price_ok) if price_ok is not None else condition
+
+        # (tier index, condition) pairs in strictest-first order; CASE picks the first match
+        tiers = []
+        constraints = [c for c in (category_ok, brand_ok, keywords_all, feature_ok, price_ok) if c is not None]
+        if constraints:
+            tiers.append((0, and_(*constraints)))
+        if category_ok is not None:
+            tiers.append((1, when_price(category_ok)))
+            tiers.append((2, category_ok))
+        if keyword_oks:
+            tiers.append((3, when_price(keywords_all)))
+        # Having the requested features counts like a keyword hit
+        signals = [c for c in (keywords_any, feature_ok) if c is not None]
+        if signals:
+            tiers.append((4, when_price(or_(*signals))))
+        if price_ok is not None:
+            tiers.append((5, price_ok))
+        tier = case(*[(condition, index) for index, condition in tiers], else_=POPULAR_TIER) if tiers \
+            else literal(POPULAR_TIER)
+
+        score = flag(category_ok) + flag(brand_ok) + flag(feature_ok) + flag(price_ok)
+        for condition in keyword_oks:
+            score = score + flag(condition)
+
+        # Every tier implies one of the constraints; rows matching none are popular
+        # with a zero score, so the best-rated few stand in for the rest of the catalog
+        top_rated = db.session.query(Product.id)\
+                              .order_by(Product.rating.desc(), Product.price.asc(), Product.id.asc()).limit(limit)
+        candidates = [c for c in (category_ok, brand_ok, keywords_any, feature_ok, price_ok) if c is not None]
+        q = db.session.query(Product, tier.label('tier'), score.label('score'))\
+                      .filter(or_(*candidates, Product.id.in_(top_rated.scalar_subquery())))\
+                      .order_by(tier, score.desc(), Product.rating.desc(), Product.price.asc(), Product.id.asc())
+        results = []
+        rows = q.limit(limit).all()
+        for product, tier_index, product_score in rows:
+            # Rows come strictest tier first; stop where the best tier ends
+            if tier_index != rows[0][1]:
+                break
+            record = product.to_dict()
+            record['match_tier'] = MATCH_TIERS[tier_index]
+            record['match_score'] = product_score
+            results.append(record)
+        return results
+    
+    def _query_index(self, categories=None, brands=None, keywords=None, price_min=None, price_max=None, limit=10, keyword_and=False,
+                     features=None):
+        """Run one search step against the in-memory catalog index"""
+        catalog_index.ensure_loaded()
+        return catalog_index.search(categories, brands, keywords, price_min, price_max, limit, keyword_and, features)
+    
+    def _query_database(self, categories=None, brands=None, keywords=None, price_min=None, price_max=None, limit=10, keyword_and=False,
+                        features=None):
+        """Run one search step as a SQL query"""
+        q = Product.query
+        if features:
+            q = q.filter(self._feature_condition(features))
+        # Equality on the normalized keys lets SQL use the category and brand indexes
+        if categories:
+            q = q.filter(and_(*[Product.category_key == normalize_key(cat) for cat in categories]))
+        if brands:
+            q = q.filter(Product.brand_key.in_([normalize_key(brand) for brand in brands]))
+        if keywords:
+            # For better NLU: one filter per keyword (for AND logic)
+            keyword_filters = [self._keyword_condition(keyword) for keyword in keywords]
+            if keyword_and:
+                # All keywords must match somewhere (AND)
+                q = q.filter(and_(*keyword_filters))
+            else:
+                # Any keyword match (OR)
+                q = q.filter(or_(*keyword_filters))
+        if price_min:
+            q = q.filter(Product.price >= price_min)
+        if price_max:
+            q = q.filter(Product.price <= price_max)
+        q = q.order_by(Product.rating.desc(), Product.price.asc())
+        return [product.to_dict() for product in q.limit(limit).all()]
+    
     def _generate_response_text(self, entities, products, intent):
         """Generate contextual response text based on search results"""
         count = len(products)
+        noun = 'product' if count == 1 else 'products'
         
         if intent == 'recommendation':
-            response = f"Based on your preferences, I recommend these {count} products:"
+            response = f"Based on your preferences, I recommend these {count} {noun}:"
         elif intent == 'comparison':
-            response = f"Here are {count} products you can compare:"
+            response = f"Here are {count} {noun} you can compare:"
         else:
-            response = f"I found {count} products"
+            response = f"I found {count} {noun}"
         
         # Add context about search criteria
         criteria = []
@@ -387,6 +579,8 @@ Just describe what you need and I'll help you find it!""",
             criteria.append(f"above ${entities['price_min']:.0f}")
         elif entities['price_max']:
             criteria.append(f"under ${entities['price_max']:.0f}")
+        if entities.get('features'):
+            criteria.append(f"with {', '.join(entities['features'])}")
         
         if criteria:
             response += f" {' '.join(criteria)}"
@@ -395,7 +589,7 @@ Just describe what you need and I'll help you find it!""",
         
         # Add smart suggestions
         if intent == 'recommendation':
-            response += f"\n\n💡 Top pick: **{products[0].name}** (⭐ {products[0].rating}/5) - ${products[0].price:.2f}"
+            response += f"\n\n💡 Top pick: **{products[0]['name']}** (⭐ {products[0]['rating']}/5) - ${products[0]['price']:.2f}"
         
         return response
     
@@ -426,18 +620,16 @@ Just describe what you need and I'll help you find it!""",
             'entities': entities
         }
     
-    def _handle_availability_check(self, message):
+    def _handle_availability_check(self, analysis):
         """Handle stock availability inquiries"""
-        entities = self._extract_entities(message)
         # This would typically check specific product availability
         return {
             'response': "I can help you check product availability! Please specify which product you're interested in, and I'll let you know if it's in stock.",
             'type': 'availability'
         }
     
-    def _handle_feature_inquiry(self, message):
+    def _handle_feature_inquiry(self, analysis):
         """Handle feature and specification inquiries"""
-        entities = self._extract_entities(message)
         return {
             'response': "I'd be happy to help you learn about product features! Please tell me which specific product you're interested in, and I'll provide detailed specifications.",
             'type': 'features'        }
@@ -482,14 +674,12 @@ Just describe what you're looking for in natural language, and I'll find the per
             'type': 'help'
         }
     
-    def _handle_default(self, message):
+    def _handle_default(self, analysis):
         """Handle unrecognized messages with intelligent suggestions"""
-        entities = self._extract_entities(message)
-        
         # Generate smart suggestions based on detected entities
         suggestions = []
-        if entities['keywords']:
-            suggestions.append(f"search for {', '.join(entities['keywords'][:3])}")
+        if analysis.keywords:
+            suggestions.append(f"search for {', '.join(analysis.keywords[:3])}")
         
         # Add popular categories
         popular_categories = ['smartphones', 'laptops', 'headphones', 'books', 'gaming']
@@ -0,0 +1,102 @@
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional; responses fall back to gzip without it
+    brotli = None
+
+# Content types worth compressing; images and already-encoded bodies are left alone
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/html', 'text/plain', 'text/csv')
+
+
+def compression(gzip_level=None, brotli_quality=None, min_size=None):
+    """
+    Decorator overriding the app-wide compression settings for one route.
+
+    Any argument left as None uses the COMPRESSION_* config value. A
+    gzip_level of 0 turns compression off for the route. Works in any
+    position under the route decorator.
+    """
+    def decorator(view):
+        view.compression = {'gzip_level': gzip_level, 'brotli_quality': brotli_quality, 'min_size': min_size}
+        return view
+    return decorator
+
+
+def _settings():
+    """Config compression settings with the current route's overrides applied"""
+    config = current_app.config
+    settings = {
+        'gzip_level': config['COMPRESSION_GZIP_LEVEL'],
+        'brotli_quality': config['COMPRESSION_BROTLI_QUALITY'],
+        'min_size': config['COMPRESSION_MIN_SIZE']
+    }
+    view = current_app.view_functions.get(request.endpoint)
+    overrides = getattr(view, 'compression', None) or {}
+    settings.update((key, value) for key, value in overrides.items() if value is not None)
+    return settings
+
+
+def choose_encoding(accept_encodings):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, or None when neither is acceptable"""
+    gzip_quality = accept_encodings['gzip']
+    brotli_quality = accept_encodings['br'] if brotli is not None else 0
+    if brotli_quality and brotli_quality >= gzip_quality:
+        return 'br'
+    return 'gzip' if gzip_quality else None
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    """Compress bytes with 'gzip' or 'br'"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def compress_response(response):
+    """
+    after_request hook compressing large textual responses for clients that accept it.
+
+    Bodies under min_size stay as they are: the framing overhead and CPU
+    outweigh the saving. Streamed and already encoded responses pass
+    through untouched. Compressed responses get Vary: Accept-Encoding and
+    a weak ETag, since the bytes differ from the identity encoding.
+    """
+    if not current_app.config['COMPRESSION_ENABLED'] or request.method == 'HEAD':
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers:
+        return response
+    settings = _settings()
+    if not settings['gzip_level']:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    if response.status_code == 304:
+        # Match the weak ETag the compressed 200 carried
+        _weaken_etag(response)
+        return response
+    if response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+        return response
+
+    data = response.get_data()
+    if len(data) < settings['min_size']:
+        return response
+    response.set_data(compress(data, encoding, settings['gzip_level'], settings['brotli_quality']))
+    response.headers['Content-Encoding'] = encoding
+    _weaken_etag(response)
+    return response
+
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def init_compression(app):
+    """Install response compression on app"""
+    app.after_request(compress_response)
@@ -0,0 +1,95 @@
+from functools import wraps
+import hashlib
+from flask import request, make_response
+from models.database import db, ChatSession, Product
+from utils.catalog_sync import persisted_stamp
+
+
+def catalog_stamp():
+    """
+    Return (last_modified, token) for the whole catalog.
+
+    MAX(updated_at) is read off its index, so the stamp costs the same for
+    every listing, filtered or not: inserts and updates move it. Deletes
+    leave nothing there and bump the persisted CatalogState counter
+    instead. Both live in the database, so every worker agrees on the
+    validators.
+    """
+    last_modified, deletions, deleted_at = persisted_stamp()
+    if deleted_at is not None and (last_modified is None or deleted_at > last_modified):
+        last_modified = deleted_at
+    return last_modified, (last_modified.isoformat() if last_modified else None, deletions)
+
+
+def product_stamp(product_id):
+    """Return (last_modified, token) for one product, or None if it does not exist"""
+    updated_at = db.session.query(Product.updated_at).filter(Product.id == product_id).scalar()
+    if updated_at is None:
+        return None
+    return updated_at, (product_id, updated_at.isoformat())
+
+
+def chat_session_stamp(session_id):
+    """
+    Return (last_modified, token) for a chat session's history, or None if it does not exist.
+
+    Read from the session row alone: adding a message moves message_count
+    and last_message_at, and a reset moves the count and updated_at.
+    """
+    row = db.session.query(ChatSession.id, ChatSession.message_count, ChatSession.last_message_at,
+                           ChatSession.updated_at).filter(ChatSession.session_id == session_id).first()
+    if row is None:
+        return None
+    return row.updated_at, (row.id, row.message_count, row.last_message_at, row.updated_at)
+
+
+def make_etag(token):
+    """Strong ETag for a stamp token and the request's path and arguments"""
+    arguments = sorted(request.args.items(multi=True))
+    digest = hashlib.sha1(repr((request.path, arguments, token)).encode()).hexdigest()
+    return digest[:32]
+
+
+def is_fresh(etag, last_modified):
+    """True when the client's cached copy is current; If-None-Match takes precedence over If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        # HTTP dates have whole-second precision
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional_get(stamp):
+    """
+    Decorator answering GET requests with 304 Not Modified when unchanged.
+
+    stamp(**view_args) returns (last_modified, token) describing the data
+    behind the response, or None to skip validation. It runs before the
+    view, so a fresh cache costs one small query and no serialization.
+    Successful responses get ETag, Last-Modified and Cache-Control: no-cache
+    so browsers and CDNs revalidate instead of refetching.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            validators = stamp(**kwargs)
+            if validators is None:
+                return view(*args, **kwargs)
+            last_modified, token = validators
+            etag = make_etag(token)
+            if is_fresh(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,97 @@
+import json
+import re
+
+# Numbers keep their decimal point and an attached unit ('6.1', '32gb', '5g'); words are alphanumeric runs
+_TOKEN = re.compile(r'\d+(?:\.\d+)?[a-z]*|[a-z0-9]+')
+_QUANTITY = re.compile(r'\d+(?:\.\d+)?[a-z]*')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def feature_tokens(text):
+    """Lowercase tokens of a feature or a filter phrase"""
+    return _TOKEN.findall(str(text).lower())
+
+
+def normalize_feature(text):
+    """Canonical spelling of a feature: '16-inch Display' -> '16 inch display'"""
+    return ' '.join(feature_tokens(text))
+
+
+def decode_features(features):
+    """Decode the JSON features column into the list (or dict) it holds; plain text becomes a one-item list"""
+    if not features:
+        return []
+    if isinstance(features, (list, dict)):
+        return features
+    try:
+        values = json.loads(features)
+    except (TypeError, ValueError):
+        return [features]
+    return values if isinstance(values, (list, dict)) else [values]
+
+
+def split_feature(text):
+    """
+    Split one feature into (feature_key, normalized_value).
+
+    A leading or trailing quantity becomes the value: '32GB RAM' ->
+    ('ram', '32gb'), '16-inch Display' -> ('display', '16 inch'),
+    'Bluetooth 5.3' -> ('bluetooth', '5.3'). Anything else is a tag whose
+    value is empty: '5G' -> ('5g', '').
+    """
+    tokens = feature_tokens(text)
+    if len(tokens) >= 2 and _QUANTITY.fullmatch(tokens[0]):
+        if not _NUMBER.fullmatch(tokens[0]):
+            return ' '.join(tokens[1:]), tokens[0]
+        if len(tokens) >= 3:
+            # A bare number takes the unit after it: '30-hour battery'
+            return ' '.join(tokens[2:]), f'{tokens[0]} {tokens[1]}'
+    if len(tokens) >= 2 and _QUANTITY.fullmatch(tokens[-1]):
+        return ' '.join(tokens[:-1]), tokens[-1]
+    return ' '.join(tokens), ''
+
+
+def parse_features(features):
+    """Distinct (feature_key, normalized_value) pairs of a features column value, list or dict"""
+    values = decode_features(features)
+    if isinstance(values, dict):
+        pairs = [(normalize_feature(key), normalize_feature(value)) for key, value in values.items()]
+    else:
+        pairs = [split_feature(value) for value in values]
+    return list(dict.fromkeys(pair for pair in pairs if pair[0]))
+
+
+def feature_rows(product_id, features):
+    """product_features rows for a product written without the ORM, such as by a bulk insert"""
+    return [{'product_id': product_id, 'feature_key': key, 'normalized_value': value}
+            for key, value in parse_features(features)]
+
+
+def feature_entries(pair):
+    """Lookup entries a stored (key, value) pair answers to, in the shape feature_lookups() returns"""
+    key, value = pair
+    entries = [('key', key)]
+    if value:
+        entries.append(('pair', key, value))
+        entries.append(('value', value))
+    return entries
+
+
+def feature_lookups(phrase):
+    """
+    Entries a filter phrase matches, any of which is enough.
+
+    The whole phrase may name a feature key of any value ('camera', '5g'),
+    its split may name a key and value ('32gb ram', 'ram 32gb'), and a
+    lone quantity may name a value of any key ('32gb').
+    """
+    text = normalize_feature(phrase)
+    if not text:
+        return []
+    lookups = [('key', text)]
+    key, value = split_feature(text)
+    if value:
+        lookups.append(('pair', key, value))
+    if _QUANTITY.fullmatch(text):
+        lookups.append(('value', text))
+    return lookups
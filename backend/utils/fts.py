@@ -0,0 +1,211 @@
+from contextlib import contextmanager
+from sqlalchemy import and_, bindparam, literal_column, text
+from models.database import db, ProductFeature
+from utils.keyword_matcher import tokenize
+from utils.pagination import keyset_filter
+
+FTS_TABLE = 'products_fts'
+
+# Indexed columns, in FTS column order, with the bm25() weight of each
+FTS_COLUMNS = (
+    ('name', 10.0),
+    ('description', 1.0),
+    ('features', 4.0),
+    ('brand', 3.0),
+    ('category', 2.0)
+)
+
+# Columns matched by the search endpoint and by the chatbot keyword filters
+SEARCH_COLUMNS = ('name', 'description', 'features', 'brand')
+KEYWORD_COLUMNS = ('name', 'description', 'category', 'brand', 'features')
+
+# Engines with a ready FTS5 table, keyed by id(engine)
+_enabled_engines = set()
+
+_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON products BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description, features, brand, category)
+            VALUES (new.id, new.name, new.description, new.features, new.brand, new.category);
+        END""",
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON products BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, features, brand, category)
+            VALUES ('delete', old.id, old.name, old.description, old.features, old.brand, old.category);
+        END""",
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON products BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, features, brand, category)
+            VALUES ('delete', old.id, old.name, old.description, old.features, old.brand, old.category);
+            INSERT INTO {FTS_TABLE}(rowid, name, description, features, brand, category)
+            VALUES (new.id, new.name, new.description, new.features, new.brand, new.category);
+        END"""
+}
+
+
+def fts5_supported(connection):
+    """Check whether the connected SQLite library was built with FTS5"""
+    if connection.dialect.name != 'sqlite':
+        return False
+    options = {row[0] for row in connection.execute(text('PRAGMA compile_options'))}
+    return 'ENABLE_FTS5' in options
+
+
+def init_fts(engine=None):
+    """
+    Create the FTS5 table and its sync triggers if they are missing.
+
+    The table uses products as external content, so triggers keep it in
+    sync for ORM writes, bulk statements and raw SQL alike. Returns False,
+    leaving search on the ILIKE path, when FTS5 is unavailable.
+    """
+    engine = engine or db.engine
+    try:
+        with engine.begin() as connection:
+            if not fts5_supported(connection):
+                return False
+            existing = {row[0] for row in connection.execute(
+                text("SELECT name FROM sqlite_master WHERE name LIKE :prefix"), {'prefix': f'{FTS_TABLE}%'})}
+            needs_rebuild = FTS_TABLE not in existing
+            if needs_rebuild:
+                columns = ', '.join(name for name, _ in FTS_COLUMNS)
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, "
+                    f"content='products', content_rowid='id', tokenize='unicode61')"))
+            for name, ddl in _TRIGGERS.items():
+                if name not in existing:
+                    connection.execute(text(ddl))
+                    needs_rebuild = True
+            if needs_rebuild:
+                # Rows written while the triggers were missing are picked up here
+                connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except Exception as e:
+        print(f"Warning: Full-text search unavailable: {e}")
+        return False
+    _enabled_engines.add(id(engine))
+    return True
+
+
+@contextmanager
+def bulk_load(engine=None):
+    """
+    Suspend the FTS insert trigger while bulk inserting products.
+
+    Indexing row by row through the trigger costs more than the insert
+    itself; on exit init_fts recreates the trigger and rebuilds the table
+    in one pass. A no-op where FTS is not enabled.
+    """
+    engine = engine or db.engine
+    if not fts_enabled(engine):
+        yield
+        return
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai"))
+    try:
+        yield
+    finally:
+        init_fts(engine)
+
+
+def fts_enabled(engine=None):
+    """True when init_fts succeeded for the engine"""
+    return id(engine or db.engine) in _enabled_engines
+
+
+def match_expression(query, columns=None):
+    """
+    Build an FTS5 MATCH expression requiring every query term as a prefix.
+
+    Terms come from the same tokenizer as the rest of the search stack, so
+    user input can never inject FTS5 query syntax.
+    """
+    terms = tokenize(query) if isinstance(query, str) else [term for q in query for term in tokenize(q)]
+    if not terms:
+        return None
+    expression = ' AND '.join(f'"{term}"*' for term in terms)
+    if columns:
+        expression = f"{{{' '.join(columns)}}}: ({expression})"
+    return expression
+
+
+def matching_ids(query, columns=KEYWORD_COLUMNS):
+    """SELECT of product ids matching query, for use in Product.id.in_()"""
+    # A unique parameter name lets several keyword filters share one statement
+    return text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match")\
+        .bindparams(bindparam('match', match_expression(query, columns), unique=True))
+
+
+def search(query, category=None, brand=None, min_price=None, max_price=None,
+           sort='relevance', offset=0, limit=20, highlight=False, after=None, count=True, features=None):
+    """
+    Run a ranked full-text search; returns (total, [(product_id, extras)], last_key).
+
+    Results are ordered by bm25() with the FTS_COLUMNS weights, or by
+    rating DESC, price ASC when sort='rating', with id as the tie-break.
+    With highlight, extras holds the name with <mark> tags and a snippet of
+    the best matching column. after is a sort key from a previous last_key
+    to continue from instead of offset; total is None when count is False.
+    Every phrase in features must match a row of product_features.
+    """
+    expression = match_expression(query, SEARCH_COLUMNS)
+    if expression is None:
+        return (0 if count else None), [], None
+    conditions = [f'{FTS_TABLE} MATCH :match']
+    params = {'match': expression, 'limit': limit, 'offset': offset}
+    if category:
+        conditions.append('p.category LIKE :category')
+        params['category'] = f'%{category}%'
+    if brand:
+        conditions.append('p.brand LIKE :brand')
+        params['brand'] = f'%{brand}%'
+    if min_price is not None:
+        conditions.append('p.price >= :min_price')
+        params['min_price'] = min_price
+    if max_price is not None:
+        conditions.append('p.price <= :max_price')
+        params['max_price'] = max_price
+    if features:
+        feature_filter = and_(*[literal_column('p.id').in_(ProductFeature.product_ids(phrase))
+                                for phrase in features]).compile()
+        conditions.append(f'({feature_filter})')
+        params.update(feature_filter.params)
+    source = f'{FTS_TABLE} JOIN products p ON p.id = {FTS_TABLE}.rowid'
+
+    weights = ', '.join(str(weight) for _, weight in FTS_COLUMNS)
+    rank = f'bm25({FTS_TABLE}, {weights})'
+    if sort == 'rating':
+        order = [('p.rating', True), ('p.price', False), ('p.id', False)]
+    else:
+        order = [(rank, False), ('p.rating', True), ('p.id', False)]
+
+    total = None
+    if count:
+        total = db.session.execute(text(f"SELECT COUNT(*) FROM {source} WHERE {' AND '.join(conditions)}"),
+                                   params).scalar()
+    if after is not None:
+        keyset = keyset_filter([(literal_column(column), descending) for column, descending in order], after)
+        compiled = keyset.compile()
+        conditions.append(f'({compiled})')
+        params.update(compiled.params)
+
+    columns = ['p.id', f'{rank} AS score', 'p.rating', 'p.price']
+    if highlight:
+        columns.append(f"highlight({FTS_TABLE}, 0, '<mark>', '</mark>') AS name_highlight")
+        columns.append(f"snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 12) AS snippet")
+    order_by = ', '.join(f"{column} {'DESC' if descending else 'ASC'}" for column, descending in order)
+    rows = db.session.execute(text(
+        f"SELECT {', '.join(columns)} FROM {source} WHERE {' AND '.join(conditions)} "
+        f"ORDER BY {order_by} LIMIT :limit OFFSET :offset"
+    ), params).mappings().all()
+    results = []
+    for row in rows:
+        extras = {'relevance': round(-row['score'], 6)}
+        if highlight:
+            extras['highlight'] = {'name': row['name_highlight'], 'snippet': row['snippet']}
+        results.append((row['id'], extras))
+    last_key = None
+    if rows:
+        last = rows[-1]
+        last_key = ((last['rating'], last['price'], last['id']) if sort == 'rating'
+                    else (last['score'], last['rating'], last['id']))
+    return total, results, last_key
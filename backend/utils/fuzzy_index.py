@@ -0,0 +1,90 @@
+from collections import Counter
+from difflib import SequenceMatcher
+
+# Shortest term worth correcting; shorter typos have too many plausible fixes
+MIN_FUZZY_LENGTH = 4
+
+
+def trigrams(term):
+    """Padded character trigrams, so prefixes and suffixes weigh more"""
+    padded = f'$${term}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Typo-tolerant lookup over a vocabulary of catalog terms.
+
+    Terms are reference counted so they can be added and removed as products
+    change. Postings are keyed by (trigram, term length) so a lookup only
+    touches terms of a similar length. Shared trigrams are counted through
+    those postings to collect a handful of candidates, and only those are
+    reranked with SequenceMatcher; nothing is compared against the whole
+    vocabulary.
+    """
+
+    def __init__(self, candidates=20, length_slack=2):
+        self.candidates = candidates
+        self.length_slack = length_slack
+        self._counts = Counter()
+        self._postings = {}
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, term):
+        return term in self._counts
+
+    def add(self, terms):
+        """Add one reference to each term"""
+        for term in terms:
+            self._counts[term] += 1
+            if self._counts[term] == 1:
+                for gram in trigrams(term):
+                    self._postings.setdefault((gram, len(term)), set()).add(term)
+
+    def remove(self, terms):
+        """Drop one reference to each term, forgetting terms no longer used"""
+        for term in terms:
+            if term not in self._counts:
+                continue
+            self._counts[term] -= 1
+            if self._counts[term] <= 0:
+                del self._counts[term]
+                for gram in trigrams(term):
+                    key = (gram, len(term))
+                    postings = self._postings[key]
+                    postings.discard(term)
+                    if not postings:
+                        del self._postings[key]
+
+    def lookup(self, term, limit=5, threshold=0.7):
+        """Return [(candidate, similarity)] for term, best first"""
+        if len(term) < MIN_FUZZY_LENGTH:
+            return []
+        grams = trigrams(term)
+        shared = Counter()
+        lengths = range(len(term) - self.length_slack, len(term) + self.length_slack + 1)
+        for gram in grams:
+            for length in lengths:
+                postings = self._postings.get((gram, length))
+                if postings:
+                    shared.update(postings)
+        if not shared:
+            return []
+
+        # Rank by trigram Jaccard similarity, then confirm with an edit-based ratio
+        scored = []
+        for candidate, overlap in shared.most_common(self.candidates):
+            jaccard = overlap / (len(grams) + len(trigrams(candidate)) - overlap)
+            ratio = SequenceMatcher(None, term, candidate).ratio()
+            similarity = max(jaccard, ratio)
+            if similarity >= threshold and candidate != term:
+                scored.append((candidate, round(similarity, 3)))
+        scored.sort(key=lambda item: (-item[1], -self._counts[item[0]], item[0]))
+        return scored[:limit]
+
+    def best(self, term, threshold=0.7):
+        """Return the single best correction for term, or None"""
+        matches = self.lookup(term, limit=1, threshold=threshold)
+        return matches[0][0] if matches else None
@@ -0,0 +1,65 @@
+import re
+
+# Sentinel key marking the end of a phrase inside the trie. Tokens are always
+# non-empty strings, so None can never collide with a real child token.
+_TERMINAL = None
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Token trie that finds every registered phrase in a message in one scan.
+
+    Phrases are matched on whole tokens, so "pc" never fires inside "spec" and
+    "air" never fires inside "repair". The cost of a scan depends on the
+    length of the message and the longest phrase, not on how many phrases
+    are registered.
+    """
+
+    def __init__(self):
+        self._root = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, phrase, payload):
+        """Register a phrase; every payload stored for it is returned on a hit"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_TERMINAL, []).append(payload)
+        self._size += 1
+
+    def add_mapping(self, kind, mapping):
+        """Register a {value: [synonyms]} mapping as (kind, value) payloads"""
+        for value, synonyms in mapping.items():
+            for synonym in synonyms:
+                self.add(synonym, (kind, value))
+
+    def scan(self, tokens):
+        """Return the payloads of every phrase found in tokens, in message order"""
+        hits = []
+        root = self._root
+        count = len(tokens)
+        for start in range(count):
+            node = root.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                payloads = node.get(_TERMINAL)
+                if payloads:
+                    hits.extend(payloads)
+                if position == count:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return hits
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MessageAnalysis:
+    """
+    Immutable result of parsing a single chat message.
+
+    Built once per message by ChatbotEngine.analyze and handed to every
+    handler, so no stage of the pipeline has to re-parse the text.
+    """
+    text: str
+    normalized: str
+    tokens: Tuple[str, ...]
+    intent: str
+    categories: Tuple[str, ...] = ()
+    brands: Tuple[str, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    features: Tuple[str, ...] = ()
+    price_min: Optional[float] = None
+    price_max: Optional[float] = None
+    explicit_search: bool = False
+
+    @property
+    def has_product_filters(self):
+        """True when the message names a category, a feature or a price bound"""
+        return (bool(self.categories) or bool(self.features)
+                or self.price_min is not None or self.price_max is not None)
+
+    def cache_key(self):
+        """Everything that determines the engine's response, minus the raw text"""
+        return (self.intent, self.explicit_search, self.categories, self.brands,
+                self.keywords, self.features, self.price_min, self.price_max)
+
+    def to_entities(self):
+        """Return the entities in the dict shape used by chat responses"""
+        return {
+            'categories': list(self.categories),
+            'brands': list(self.brands),
+            'price_min': self.price_min,
+            'price_max': self.price_max,
+            'keywords': list(self.keywords),
+            'features': list(self.features),
+            'intent': self.intent
+        }
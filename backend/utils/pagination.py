@@ -0,0 +1,60 @@
+import base64
+import json
+from sqlalchemy import and_, literal, or_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another ordering"""
+
+
+def encode_cursor(ordering, values):
+    """Encode the sort key of the last row seen as an opaque URL-safe token"""
+    payload = json.dumps({'o': ordering, 'k': list(values)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, ordering, size):
+    """Return the sort key stored in token, checking it was issued for ordering"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload['k']
+        valid = payload['o'] == ordering and isinstance(values, list) and len(values) == size
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise InvalidCursor('Invalid cursor for this query')
+    return values
+
+
+def keyset_filter(order, values):
+    """
+    Condition selecting rows that sort strictly after values.
+
+    order is a list of (expression, descending) pairs ending in a unique
+    column. Expands to (a > x) OR (a = x AND b > y) OR ..., which unlike a
+    row-value comparison supports mixed ASC/DESC directions.
+    """
+    clauses = []
+    for position, (expression, descending) in enumerate(order):
+        # Anonymous binds, so expressions such as bm25(...) never name a parameter
+        value = literal(values[position])
+        after = expression < value if descending else expression > value
+        equal = [order[i][0] == literal(values[i]) for i in range(position)]
+        clauses.append(and_(*equal, after) if equal else after)
+    return or_(*clauses)
+
+
+def keyset_page(query, order, cursor, ordering, per_page, key):
+    """
+    Fetch one page after cursor; returns (rows, next_cursor).
+
+    One extra row is read to tell whether another page exists, so the last
+    page returns next_cursor None without a COUNT(*).
+    """
+    if cursor:
+        query = query.filter(keyset_filter(order, decode_cursor(cursor, ordering, len(order))))
+    query = query.order_by(*[expression.desc() if descending else expression.asc() for expression, descending in order])
+    rows = query.limit(per_page + 1).all()
+    next_cursor = encode_cursor(ordering, key(rows[per_page - 1])) if len(rows) > per_page else None
+    return rows[:per_page], next_cursor
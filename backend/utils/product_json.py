@@ -0,0 +1,125 @@
+import json
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from utils.catalog_sync import subscribe
+from utils.projection import PRODUCT_FIELDS
+from utils.response_cache import ResponseCache
+from config.config import Config
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder is used without it
+    orjson = None
+
+# Set by configure(); 'orjson' only when the package is importable
+_encoder = 'orjson' if orjson is not None else 'stdlib'
+
+
+def configure(encoder='auto'):
+    """Choose the encoder: 'auto' (orjson when installed), 'orjson' or 'stdlib'"""
+    global _encoder
+    if encoder == 'orjson' and orjson is None:
+        print("Warning: JSON_ENCODER=orjson but orjson is not installed; using the stdlib encoder")
+    _encoder = 'orjson' if encoder in ('auto', 'orjson') and orjson is not None else 'stdlib'
+    return _encoder
+
+
+def dumps(obj, default=None):
+    """Encode obj as compact, key-sorted UTF-8 JSON bytes"""
+    if _encoder == 'orjson':
+        return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=default, separators=(',', ':'), sort_keys=True, ensure_ascii=False).encode()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes jsonify() payloads with dumps() unless pretty printing"""
+
+    def dumps(self, obj, **kwargs):
+        if _encoder == 'orjson' and 'indent' not in kwargs:
+            return dumps(obj, default=self.default).decode()
+        return super().dumps(obj, **kwargs)
+
+
+class ProductFragments:
+    """
+    Cache of pre-encoded product JSON objects keyed by (id, updated_at, shape).
+
+    Product responses are assembled by joining cached fragments, so an
+    unchanged product is serialized once rather than on every request. A
+    change bumps updated_at and therefore the key, so stale fragments are
+    never served; they simply age out of the LRU. Statements that bypass
+    the ORM clear the cache, since they may change rows in place.
+    """
+
+    def __init__(self, max_entries=10000, ttl=3600):
+        self.cache = ResponseCache(max_entries=max_entries, ttl=ttl)
+
+    def clear(self):
+        self.cache.clear()
+
+    def on_catalog_change(self, upserts, deletes, reload=False):
+        if reload:
+            self.clear()
+
+    def _fragment(self, key, build):
+        fragment = self.cache.get(key)
+        if fragment is None:
+            fragment = dumps(build())
+            self.cache.set(key, fragment)
+        return fragment
+
+    def product(self, product):
+        """Fragment of a Product entity in the full to_dict() shape"""
+        return self._fragment((product.id, product.updated_at, None), product.to_dict)
+
+    def row(self, row, projection):
+        """Fragment of a projection row; the row must also select id and updated_at"""
+        mapping = row._mapping
+        return self._fragment((mapping['id'], mapping['updated_at'], projection), lambda: projection.from_row(row))
+
+    def record(self, record, projection=None):
+        """
+        Fragment of a product dict such as a catalog index record.
+
+        Keys outside the product fields, like relevance or match_tier, vary
+        per request; they are encoded separately and spliced in.
+        """
+        updated_at = record.get('updated_at')
+        if projection is None:
+            base = self._fragment((record['id'], updated_at, None),
+                                  lambda: {field: record[field] for field in PRODUCT_FIELDS})
+        else:
+            base = self._fragment((record['id'], updated_at, projection),
+                                  lambda: projection.from_record({field: record[field] for field in PRODUCT_FIELDS}))
+        extras = {key: value for key, value in record.items() if key not in PRODUCT_FIELDS}
+        return with_extras(base, extras)
+
+
+def with_extras(fragment, extras):
+    """Add the keys of extras to an encoded JSON object"""
+    if not extras:
+        return fragment
+    encoded = dumps(extras)
+    return fragment[:-1] + (b',' if fragment != b'{}' else b'') + encoded[1:]
+
+
+def fragments_response(payload, fragments, key='products'):
+    """
+    Build a JSON response of payload plus a key holding the encoded fragments.
+
+    Only the small envelope goes through the encoder; the array is joined
+    from bytes that were encoded when each product was first seen.
+    """
+    envelope = dumps(payload, default=current_app.json.default)
+    body = b'{"' + key.encode() + b'":[' + b','.join(fragments) + b']'
+    body += b'}' if envelope == b'{}' else b',' + envelope[1:]
+    return current_app.response_class(body + b'\n', mimetype='application/json')
+
+
+def fragment_response(fragment):
+    """JSON response whose body is a single pre-encoded fragment"""
+    return current_app.response_class(fragment + b'\n', mimetype='application/json')
+
+
+product_fragments = ProductFragments(max_entries=Config.PRODUCT_JSON_CACHE_SIZE, ttl=Config.PRODUCT_JSON_CACHE_TTL)
+subscribe(product_fragments.on_catalog_change)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Tuple
+from sqlalchemy import func
+from models.database import Product
+from utils.features import decode_features
+
+# Every field of Product.to_dict(), in its order
+PRODUCT_FIELDS = ('id', 'sku', 'name', 'description', 'price', 'category', 'brand', 'stock_quantity',
+                  'image_url', 'rating', 'features', 'created_at', 'updated_at')
+
+# Fields a product card renders; drops the features list and timestamps
+CARD_FIELDS = ('id', 'name', 'description', 'price', 'category', 'brand', 'stock_quantity', 'image_url', 'rating')
+
+# Cards show a few clamped lines of description, so longer text is cut before it leaves the database
+CARD_DESCRIPTION_LENGTH = 160
+
+_DATETIME_FIELDS = ('created_at', 'updated_at')
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    A subset of product fields to select and serialize.
+
+    Rows are read as plain column tuples instead of ORM entities, and only
+    the requested timestamps are formatted. With truncate set (the card
+    view) the description is shortened to CARD_DESCRIPTION_LENGTH.
+    """
+    fields: Tuple[str, ...]
+    truncate: bool = False
+
+    def columns(self, extra=()):
+        """Labelled columns for the fields plus any extra ones the caller needs, such as sort keys"""
+        columns = []
+        for field in dict.fromkeys(self.fields + tuple(extra)):
+            column = getattr(Product, field)
+            if field == 'description' and self.truncate:
+                column = func.substr(column, 1, CARD_DESCRIPTION_LENGTH)
+            columns.append(column.label(field))
+        return columns
+
+    def from_row(self, row):
+        """Serialize a row selected with columns()"""
+        mapping = row._mapping
+        result = {field: mapping[field] for field in self.fields}
+        for field in _DATETIME_FIELDS:
+            if result.get(field) is not None:
+                result[field] = result[field].isoformat()
+        if 'features' in result:
+            result['features'] = decode_features(result['features'])
+        return result
+
+    def from_record(self, record):
+        """Project a to_dict() style product dict, keeping extra keys such as relevance"""
+        result = {field: record[field] for field in self.fields}
+        if self.truncate and result.get('description'):
+            result['description'] = result['description'][:CARD_DESCRIPTION_LENGTH]
+        for key, value in record.items():
+            if key not in PRODUCT_FIELDS:
+                result[key] = value
+        return result
+
+
+CARD = Projection(CARD_FIELDS, truncate=True)
+
+
+def parse_projection(fields=None, view=None):
+    """
+    Build a Projection from fields= and view= request arguments.
+
+    Returns None for the full to_dict() shape. view=card selects the card
+    projection; fields=a,b,c selects exactly those fields and wins over
+    view. Raises ValueError on unknown names.
+    """
+    if fields:
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+        unknown = [name for name in names if name not in PRODUCT_FIELDS]
+        if unknown or not names:
+            raise ValueError(f"Unknown fields: {', '.join(unknown) or fields}")
+        return Projection(names, truncate=view == 'card')
+    if view in (None, '', 'full'):
+        return None
+    if view == 'card':
+        return CARD
+    raise ValueError("view must be 'full' or 'card'")
@@ -0,0 +1,200 @@
+from bisect import bisect_left
+from collections import Counter
+import json
+import math
+from utils.keyword_matcher import tokenize
+
+# Per-field weights for BM25F; a hit in the name counts three times a hit in the description
+FIELD_BOOSTS = {
+    'name': 3.0,
+    'brand': 2.0,
+    'features': 1.5,
+    'description': 1.0
+}
+
+# Query terms shorter than this only match exactly, longer ones also match as prefixes
+MIN_PREFIX_LENGTH = 3
+
+# Merged query term tables kept between changes; the cache is emptied when it fills up
+QUERY_TERM_CACHE_SIZE = 4096
+
+
+def feature_text(features):
+    """Flatten the JSON features column, or its decoded list, into plain searchable text"""
+    if not features:
+        return ''
+    if isinstance(features, (list, dict)):
+        values = features
+    else:
+        try:
+            values = json.loads(features)
+        except (TypeError, ValueError):
+            return str(features)
+    if isinstance(values, dict):
+        return ' '.join(f'{key} {value}' for key, value in values.items())
+    if isinstance(values, list):
+        return ' '.join(str(value) for value in values)
+    return str(values)
+
+
+def blend_with_rating(score, rating, rating_weight):
+    """Boost a relevance score by up to rating_weight for a 5-star product"""
+    return score * (1.0 + rating_weight * (rating or 0.0) / 5.0)
+
+
+class BM25Scorer:
+    """
+    BM25F relevance scores over product name, brand, features and description.
+
+    Term postings, per-document field lengths and field length totals are
+    maintained on every add/remove, so document frequencies and average
+    lengths are always current without a rebuild. Per-term score tables,
+    and per query term the merged table of its expansions, are computed on
+    first use and dropped whenever the collection changes. Documents are
+    identified by the caller's slot numbers.
+    """
+
+    def __init__(self, boosts=None, k1=1.2, b=0.75):
+        self.boosts = dict(boosts or FIELD_BOOSTS)
+        self.fields = tuple(self.boosts)
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._vocabulary = None
+        self._lengths = {}
+        self._terms = {}
+        self._total_lengths = [0] * len(self.fields)
+        self._term_scores = {}
+        self._query_terms = {}
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def _field_tokens(self, record):
+        for field in self.fields:
+            text = feature_text(record.get(field)) if field == 'features' else (record.get(field) or '')
+            yield tokenize(text)
+
+    def add(self, slot, record):
+        """Index a product dict under slot"""
+        frequencies = {}
+        lengths = []
+        for position, tokens in enumerate(self._field_tokens(record)):
+            lengths.append(len(tokens))
+            self._total_lengths[position] += len(tokens)
+            for token, count in Counter(tokens).items():
+                per_field = frequencies.get(token)
+                if per_field is None:
+                    frequencies[token] = [(position, count)]
+                else:
+                    per_field.append((position, count))
+        postings = self._postings
+        for token, per_field in frequencies.items():
+            if token not in postings:
+                postings[token] = {}
+                self._vocabulary = None
+            postings[token][slot] = tuple(per_field)
+        self._lengths[slot] = tuple(lengths)
+        self._terms[slot] = tuple(frequencies)
+        self._term_scores.clear()
+        self._query_terms.clear()
+
+    def remove(self, slot):
+        """Forget the product stored under slot"""
+        lengths = self._lengths.pop(slot, None)
+        if lengths is None:
+            return
+        for position, length in enumerate(lengths):
+            self._total_lengths[position] -= length
+        self._term_scores.clear()
+        self._query_terms.clear()
+        for token in self._terms.pop(slot):
+            postings = self._postings[token]
+            del postings[slot]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+
+    def idf(self, term):
+        """Inverse document frequency of a term from the live document counts"""
+        document_count = len(self._lengths)
+        frequency = len(self._postings.get(term, ()))
+        return math.log(1.0 + (document_count - frequency + 0.5) / (frequency + 0.5))
+
+    def expand(self, term):
+        """Indexed terms a query term matches: itself, plus prefix completions"""
+        if len(term) < MIN_PREFIX_LENGTH:
+            return [term] if term in self._postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        matches = []
+        position = bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(term):
+            matches.append(self._vocabulary[position])
+            position += 1
+        return matches
+
+    def term_scores(self, term):
+        """Return the cached {slot: BM25F contribution} table for one indexed term"""
+        table = self._term_scores.get(term)
+        if table is not None:
+            return table
+        document_count = len(self._lengths)
+        weights = [self.boosts[field] for field in self.fields]
+        averages = [max(total / document_count, 1e-9) for total in self._total_lengths]
+        k1, b = self.k1, self.b
+        idf = self.idf(term)
+        table = {}
+        for slot, frequencies in self._postings[term].items():
+            lengths = self._lengths[slot]
+            weighted = 0.0
+            for position, frequency in frequencies:
+                weighted += weights[position] * frequency / (1.0 - b + b * lengths[position] / averages[position])
+            table[slot] = idf * weighted / (k1 + weighted)
+        self._term_scores[term] = table
+        return table
+
+    def query_term(self, term):
+        """
+        Return {slot: contribution} for one query term, or None when it matches nothing.
+
+        Each document gets the term's best-scoring expansion, so "phone"
+        matching both "phone" and "phones" is not double counted.
+        """
+        if term in self._query_terms:
+            return self._query_terms[term]
+        best = None
+        shared = True
+        for expansion in self.expand(term):
+            table = self.term_scores(expansion)
+            if best is None:
+                best = table
+                continue
+            if shared:
+                # Cached tables are shared, so only copy once a merge is needed
+                best = dict(best)
+                shared = False
+            for slot, contribution in table.items():
+                if contribution > best.get(slot, 0.0):
+                    best[slot] = contribution
+        if len(self._query_terms) >= QUERY_TERM_CACHE_SIZE:
+            self._query_terms.clear()
+        self._query_terms[term] = best
+        return best
+
+    def query_terms(self, query):
+        """The distinct terms of a query string or term list that match something"""
+        terms = dict.fromkeys(tokenize(query) if isinstance(query, str) else query)
+        return [term for term in terms if self.query_term(term)]
+
+    def score(self, query):
+        """Return {slot: score} for every document matching any query term"""
+        scores = None
+        for term in self.query_terms(query):
+            table = self.query_term(term)
+            if scores is None:
+                scores = dict(table)
+                continue
+            for slot, contribution in table.items():
+                scores[slot] = scores.get(slot, 0.0) + contribution
+        return scores or {}
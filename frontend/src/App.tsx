@@ -1,6 +1,7 @@
 import { useEffect, useState } from 'react';
 import ChatInterface from './components/ChatInterface';
 import ProductGrid from './components/ProductGrid';
+import { productApi } from './services/api';
 import { Product } from './types';
 
 function App() {
@@ -18,6 +19,12 @@ function App() {
   const handleProductSelect = (product: Product) => {
     setSelectedProduct(product);
     console.log('Selected product:', product);
+    // Chat replies carry compact cards (no features, shortened description); load the full product
+    if (product.features === undefined) {
+      productApi.getById(product.id)
+        .then((full) => setSelectedProduct((current) => (current && current.id === full.id ? full : current)))
+        .catch((error) => console.error('Error loading product details:', error));
+    }
   };
 
   const toggleDarkMode = () => {
@@ -228,13 +235,13 @@ function App() {
                     </p>
                   </div>
                   
-                  {selectedProduct.features && (
+                  {selectedProduct.features && selectedProduct.features.length > 0 && (
                     <div>
                       <h3 className={`text-xl font-semibold mb-3 ${isDarkMode ? 'text-white' : 'text-gray-900'}`}>
                         Features
                       </h3>
                       <div className="grid grid-cols-2 gap-2">
-                        {JSON.parse(selectedProduct.features).map((feature: string, index: number) => (
+                        {selectedProduct.features.map((feature, index) => (
                           <div
                             key={index}
                             className={`px-3 py-2 rounded-lg text-sm ${
@@ -8,6 +8,7 @@ export const ENDPOINTS = {
   PRODUCTS: `${API_BASE_URL}/api/products`,
   PRODUCT_SEARCH: `${API_BASE_URL}/api/products/search`,
   PRODUCT_DETAIL: (id: number) => `${API_BASE_URL}/api/products/${id}`,
+  PRODUCT_BATCH: `${API_BASE_URL}/api/products/batch`,
   CATEGORIES: `${API_BASE_URL}/api/products/categories`,
   BRANDS: `${API_BASE_URL}/api/products/brands`,
   
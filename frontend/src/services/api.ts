@@ -2,10 +2,11 @@ import axios from 'axios';
 import { ENDPOINTS } from '../config/api';
 import {
     AuthResponse,
-    ChatMessage,
+    ChatHistory,
     ChatResponse,
     ChatSession,
     Product,
+    ProductBatchResponse,
     ProductSearchParams,
     ProductSearchResponse,
     User
@@ -59,6 +60,14 @@ export const productApi = {
     return response.data as Product;
   },
 
+  // One request for many products; long id lists go in a POST body instead of the URL
+  getBatch: async (ids: number[]): Promise<ProductBatchResponse> => {
+    const response = ids.length <= 50
+      ? await api.get(ENDPOINTS.PRODUCT_BATCH, { params: { ids: ids.join(',') } })
+      : await api.post(ENDPOINTS.PRODUCT_BATCH, { ids });
+    return response.data as ProductBatchResponse;
+  },
+
   getCategories: async (): Promise<string[]> => {
     const response = await api.get(ENDPOINTS.CATEGORIES);
     return (response.data as { categories: string[] }).categories;
@@ -80,9 +89,12 @@ export const chatApi = {
     return response.data as ChatResponse;
   },
 
-  getHistory: async (sessionId: string): Promise<{ messages: ChatMessage[]; session_info: ChatSession }> => {
-    const response = await api.get(ENDPOINTS.CHAT_HISTORY(sessionId));
-    return response.data as { messages: ChatMessage[]; session_info: ChatSession };
+  getHistory: async (
+    sessionId: string,
+    params?: { limit?: number; before?: number; after?: number; since?: number }
+  ): Promise<ChatHistory> => {
+    const response = await api.get(ENDPOINTS.CHAT_HISTORY(sessionId), { params });
+    return response.data as ChatHistory;
   },
 
   getSessions: async (): Promise<ChatSession[]> => {
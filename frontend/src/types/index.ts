@@ -2,6 +2,7 @@
 
 export interface Product {
   id: number;
+  sku?: string | null;
   name: string;
   description: string;
   price: number;
@@ -10,7 +11,7 @@ export interface Product {
   stock_quantity: number;
   image_url?: string;
   rating: number;
-  features?: string;
+  features?: string[];
   created_at?: string;
   updated_at?: string;
 }
@@ -31,6 +32,16 @@ export interface ChatSession {
   created_at: string;
   updated_at: string;
   message_count: number;
+  last_message_at?: string | null;
+}
+
+export interface ChatHistory {
+  session_id: string;
+  messages: ChatMessage[];
+  session_info: ChatSession;
+  has_more: boolean;
+  oldest_id: number | null;
+  newest_id: number | null;
 }
 
 export interface User {
@@ -45,7 +56,7 @@ export interface ChatResponse {
   type: string;
   products?: Product[];
   session_id: string;
-  message_id: number;
+  message_id: number | null;
 }
 
 export interface AuthResponse {
@@ -73,6 +84,12 @@ export interface ProductSearchResponse {
   query?: string;
 }
 
+export interface ProductBatchResponse {
+  products: (Product | null)[];
+  missing: number[];
+  requested: number;
+}
+
 export interface ApiError {
   error: string;
 }
@@ -0,0 +1,87 @@
+from collections import Counter
+
+import pytest
+
+from models.database import Product, ProductFeature
+from utils.catalog_generator import CatalogGenerator, write_products
+from utils.catalog_index import catalog_index
+from utils.features import feature_rows
+from utils.fts import fts_enabled
+
+
+def _stable(row):
+    return {key: value for key, value in row.items() if key not in ('created_at', 'updated_at')}
+
+
+def test_generator_is_deterministic_and_prefix_stable():
+    """Test that a seed always yields the same products and shorter runs are prefixes"""
+    short = [_stable(row) for row in CatalogGenerator(7).products(50)]
+    long = [_stable(row) for row in CatalogGenerator(7).products(200)]
+    assert short == long[:50]
+    assert short != [_stable(row) for row in CatalogGenerator(8).products(50)]
+    assert len({row['sku'] for row in long}) == 200
+    assert [_stable(row) for row in CatalogGenerator(7).products(150, start=50)] == long[50:]
+
+
+def test_generated_distributions_look_like_a_catalog():
+    """Test brand skew, price and rating ranges, and the stock mix"""
+    rows = list(CatalogGenerator().products(3000))
+    brands = Counter(row['brand'] for row in rows)
+    top, share = brands.most_common(1)[0][0], brands.most_common(1)[0][1] / len(rows)
+    assert len(brands) > 100 and share < 0.2 and brands[top] > 10 * sorted(brands.values())[len(brands) // 2]
+    assert all(row['price'] >= 1 for row in rows)
+    ratings = [row['rating'] for row in rows]
+    assert min(ratings) >= 1 and max(ratings) <= 5 and 3.8 < sum(ratings) / len(ratings) < 4.5
+    assert 0.03 < sum(row['stock_quantity'] == 0 for row in rows) / len(rows) < 0.15
+    assert all(row['created_at'] <= row['updated_at'] for row in rows)
+
+
+def test_write_products_bulk_inserts_searchable_rows(app, client):
+    """Test that generated products land with feature rows and reach the index and FTS"""
+    write_products(500, replace=True, batch_size=200)
+    assert Product.query.count() == 500
+    assert ProductFeature.query.count() >= 500 * 3
+    product = Product.query.order_by(Product.id).first()
+    assert product.sku == 'GEN-42-0000000'
+    # One reload notice marks the index stale instead of publishing every row
+    catalog_index.ensure_loaded()
+    assert product.id in {p['id'] for p in catalog_index.search_text(product.name, limit=5)[1]}
+
+    if fts_enabled():
+        response = client.get('/api/products/search', query_string={'q': product.name, 'backend': 'fts'})
+        assert product.id in {p['id'] for p in response.get_json()['products']}
+
+
+def test_appending_continues_skus_and_moves_the_catalog_stamp(app, client):
+    """Test that a second run without replace adds new skus stamped now, so validators and exports see them"""
+    app.config['EXPORT_OVERLAP_SECONDS'] = 0
+    write_products(100, replace=True, batch_size=40)
+    first = client.get('/api/products/')
+    watermark = client.get('/api/products/export').headers['X-Export-Watermark']
+    write_products(50, batch_size=40)
+    assert Product.query.count() == 150
+    assert Product.query.order_by(Product.id.desc()).first().sku == 'GEN-42-0000149'
+
+    listing = client.get('/api/products/', headers={'If-None-Match': first.headers['ETag']})
+    assert listing.status_code == 200 and listing.get_json()['total'] == 150
+    exported = client.get(f'/api/products/export?updated_since={watermark}').get_data().splitlines()
+    assert len(exported) == 50
+
+
+def test_failed_batch_is_rolled_back(app, monkeypatch):
+    """Test that a batch failing midway leaves only the committed batches and a usable session"""
+    import utils.catalog_generator as generator
+    calls = []
+
+    def failing(product_id, features):
+        calls.append(product_id)
+        if len(calls) > 40:
+            raise RuntimeError('disk full')
+        return feature_rows(product_id, features)
+
+    monkeypatch.setattr(generator, 'feature_rows', failing)
+    with pytest.raises(RuntimeError):
+        write_products(100, replace=True, batch_size=40)
+    assert Product.query.count() == 40
+    catalog_index.ensure_loaded()
+    assert len(catalog_index._slot_by_id) == 40
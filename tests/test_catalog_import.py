@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from models.database import Product, ProductFeature
+from utils.catalog_import import import_products, read_csv, read_jsonl
+from utils.catalog_index import catalog_index
+
+CSV_FEED = (
+    'sku,name,description,price,category,brand,stock_quantity,rating,features\n'
+    'ZX-1,Zephyrine Kettle,Gooseneck kettle,79.5,Kitchen,Zephyr,12,4.4,1.2L Capacity|Temperature Hold\n'
+    'ZX-2,Zephyrine Grinder,Burr grinder,129,Kitchen,Zephyr,3,4.7,\n'
+    'ZX-3,Broken Row,,not-a-price,Kitchen,Zephyr,,,\n'
+)
+
+
+@pytest.fixture
+def token(app):
+    app.config['IMPORT_API_TOKEN'] = 'feed-secret'
+    return {'Authorization': 'Bearer feed-secret'}
+
+
+def test_import_requires_the_token(app, client):
+    """Test that the endpoint is off without a token and rejects wrong ones"""
+    assert client.post('/api/products/import?format=csv', data=CSV_FEED).status_code == 403
+    app.config['IMPORT_API_TOKEN'] = 'feed-secret'
+    response = client.post('/api/products/import?format=csv', data=CSV_FEED, headers={'Authorization': 'Bearer no'})
+    assert response.status_code == 401
+
+
+def test_csv_import_upserts_on_sku(client, token):
+    """Test that a feed creates products, a second load updates them, and bad rows are reported"""
+    report = client.post('/api/products/import', data=CSV_FEED, content_type='text/csv', headers=token).get_json()
+    assert (report['created'], report['updated'], report['skipped']) == (2, 0, 1)
+    assert report['errors'] == ['line 4: price must be a number'] and report['rows_per_second'] > 0
+
+    kettle = Product.query.filter_by(sku='ZX-1').one()
+    assert kettle.category_key == 'kitchen' and kettle.to_dict()['features'] == ['1.2L Capacity', 'Temperature Hold']
+    assert ProductFeature.query.filter_by(product_id=kettle.id, feature_key='capacity').one().normalized_value == '1.2l'
+
+    updated_feed = CSV_FEED.replace('79.5', '69.5')
+    report = client.post('/api/products/import', data=updated_feed, content_type='text/csv', headers=token).get_json()
+    assert (report['created'], report['updated']) == (0, 2)
+    assert Product.query.filter_by(sku='ZX-1').one().price == 69.5
+    assert Product.query.filter_by(sku='ZX-1').count() == 1
+
+
+def test_import_updates_search_without_a_rebuild(client, token, monkeypatch):
+    """Test that imported batches reach the catalog index, FTS and caches incrementally"""
+    catalog_index.ensure_loaded()
+    client.get('/api/products/search?q=zephyrine')
+    monkeypatch.setattr(catalog_index, 'rebuild', lambda *args: pytest.fail('index was rebuilt'))
+    client.post('/api/products/import?format=csv', data=CSV_FEED, headers=token)
+    for backend in ('index', 'fts', 'sql'):
+        names = {p['name'] for p in client.get(f'/api/products/search?q=zephyrine&backend={backend}')
+                 .get_json()['products']}
+        assert names == {'Zephyrine Kettle', 'Zephyrine Grinder'}, backend
+
+
+def test_imports_from_another_process_reach_a_running_server(app, client, monkeypatch):
+    """Test that a CLI import, whose publish stays in its own process, is picked up from the stamp"""
+    catalog_index.ensure_loaded()
+    client.get('/api/products/search?q=zephyrine')
+    monkeypatch.setattr('utils.catalog_import.publish', lambda *args, **kwargs: None)
+    import_products(read_csv(io.StringIO(CSV_FEED)))
+    names = {p['name'] for p in client.get('/api/products/search?q=zephyrine').get_json()['products']}
+    assert names == {'Zephyrine Kettle', 'Zephyrine Grinder'}
+
+
+def test_jsonl_batches_are_committed_separately(app):
+    """Test that every batch_size rows form one transaction and malformed lines are skipped"""
+    lines = [json.dumps({'sku': f'B{i}', 'name': f'Bulk {i}', 'price': i, 'category': 'Bulk',
+                         'features': ['8GB RAM']}) for i in range(25)]
+    batches = []
+    report = import_products(read_jsonl(io.StringIO('\n'.join(lines + ['{oops']))), batch_size=10,
+                             on_batch=lambda report: batches.append(report.created))
+    assert batches == [10, 20, 25]
+    assert report.skipped == 1 and Product.query.filter_by(category='Bulk').count() == 25
+    assert ProductFeature.query.filter_by(feature_key='ram', normalized_value='8gb').count() == 25
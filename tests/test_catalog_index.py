@@ -0,0 +1,157 @@
+import pytest
+
+from models.database import db, Product
+from utils.catalog_generator import write_products
+from utils.catalog_index import catalog_index
+from utils.chatbot_engine import ChatbotEngine
+from utils.relevance import blend_with_rating
+
+
+def _ids(products):
+    return [product['id'] for product in products]
+
+
+@pytest.mark.parametrize('message', [
+    'show me laptops under $1000',
+    'apple phones',
+    'noise canceling wireless headphones',
+    'cheap books',
+    'premium products',
+    'books between $10 and $30',
+    'something completely unknown xyzzy',
+])
+def test_index_search_matches_sql_backend(app, message):
+    """Test that the index returns the same products as the SQL cascade"""
+    index_engine = ChatbotEngine(search_backend='index', search_mode='cascade')
+    sql_engine = ChatbotEngine(search_backend='sql', search_mode='cascade')
+    from_index = index_engine.process_message(message)
+    from_sql = sql_engine.process_message(message)
+    assert from_index['response'] == from_sql['response']
+    assert _ids(from_index.get('products', [])) == _ids(from_sql.get('products', []))
+
+
+@pytest.mark.parametrize('message', [
+    'show me laptops under $1000',
+    'apple phones',
+    'cheap books',
+    'something completely unknown xyzzy',
+])
+def test_ranked_index_matches_sql_tiers(app, message):
+    """Test that ranked index and SQL searches agree on tiers; only relevance ordering differs"""
+    from_index = ChatbotEngine(search_backend='index').process_message(message)
+    from_sql = ChatbotEngine(search_backend='sql').process_message(message)
+    assert from_index['response'] == from_sql['response']
+    assert [p['match_tier'] for p in from_index.get('products', [])] == \
+        [p['match_tier'] for p in from_sql.get('products', [])]
+
+
+def test_index_follows_product_commits(app):
+    """Test that inserts, updates and deletes reach a loaded index incrementally"""
+    catalog_index.ensure_loaded()
+    product = Product(name='Zorblax Hyperphone', description='Test device', price=123.0,
+                      category='Smartphones', brand='Zorblax', rating=5.0)
+    db.session.add(product)
+    db.session.commit()
+    assert _ids(catalog_index.search(keywords=['zorblax'])) == [product.id]
+
+    product.price = 2000.0
+    db.session.commit()
+    assert catalog_index.search(keywords=['zorblax'], price_max=1000) == []
+    assert catalog_index.search(keywords=['zorblax'])[0]['price'] == 2000.0
+
+    db.session.delete(product)
+    db.session.commit()
+    assert catalog_index.search(keywords=['zorblax']) == []
+
+
+def test_index_ignores_rolled_back_changes(app):
+    """Test that a rollback leaves the index untouched"""
+    catalog_index.ensure_loaded()
+    size = len(catalog_index)
+    db.session.add(Product(name='Ghost Item', description='Never committed', price=1.0, category='Books'))
+    db.session.flush()
+    db.session.rollback()
+    assert len(catalog_index) == size
+
+
+def test_index_reloads_after_bulk_delete(app):
+    """Test that bulk statements the ORM cannot track trigger a rebuild"""
+    catalog_index.ensure_loaded()
+    Product.query.delete()
+    db.session.commit()
+    catalog_index.ensure_loaded()
+    assert len(catalog_index) == 0
+
+
+@pytest.fixture
+def small_catalog(app):
+    Product.query.delete()
+    db.session.add_all([
+        Product(name='Budget Laptop', description='Everyday notebook', price=400.0,
+                category='Laptops', brand='Acme', rating=4.0),
+        Product(name='Gaming Laptop', description='RGB gaming rig', price=1800.0,
+                category='Laptops', brand='Acme', rating=4.8),
+        Product(name='Gaming Mouse', description='Wireless gaming mouse', price=60.0,
+                category='Accessories', brand='Clicky', rating=4.9),
+        Product(name='Paperback Novel', description='A long story', price=15.0,
+                category='Books', brand='Press', rating=4.2),
+    ])
+    db.session.commit()
+    return app
+
+
+@pytest.mark.parametrize('backend', ['index', 'sql'])
+def test_ranked_search_returns_only_the_best_tier(small_catalog, backend):
+    """Test that a ranked search stops at the strictest tier reached, like the cascade"""
+    engine = ChatbotEngine(search_backend=backend, search_mode='ranked')
+    result = engine.process_message('gaming laptops under $1000')
+    tiers = [(p['name'], p['match_tier']) for p in result['products']]
+    assert tiers == [('Budget Laptop', 'category_price')]
+    assert result['response'].startswith('I found 1 product in laptops')
+
+
+@pytest.mark.parametrize('backend', ['index', 'sql'])
+def test_ranked_search_returns_a_single_exact_hit_alone(small_catalog, backend):
+    """Test that one exact match is not padded with price or popular fillers"""
+    engine = ChatbotEngine(search_backend=backend, search_mode='ranked')
+    result = engine.process_message('show me a paperback under $50')
+    assert [(p['name'], p['match_tier']) for p in result['products']] == [('Paperback Novel', 'exact')]
+    assert result['response'].startswith('I found 1 product under $50')
+
+
+@pytest.mark.parametrize('backend', ['index', 'sql'])
+def test_ranked_search_reports_popular_fallback(small_catalog, backend):
+    """Test that a message matching nothing is reported as a popular fallback"""
+    engine = ChatbotEngine(search_backend=backend, search_mode='ranked')
+    result = engine.process_message('find xyzzy plugh')
+    assert {p['match_tier'] for p in result['products']} == {'popular'}
+    assert result['products'][0]['name'] == 'Gaming Mouse'
+    assert "couldn't find an exact match" in result['response']
+
+
+def _reference_search(query, offset=0, limit=20, after=None, rating_weight=0.2, **filters):
+    """search_text's ordering computed by scoring every match"""
+    records = catalog_index._records
+    items = [(blend_with_rating(score, records[slot].get('rating'), rating_weight), slot)
+             for slot, score in catalog_index._matching(query, filters.get('category'), filters.get('brand'),
+                                                        filters.get('price_min'), filters.get('price_max'))]
+    total = len(items)
+    items.sort(key=lambda item: (-item[0],) + catalog_index._rank[item[1]])
+    if after is not None:
+        items = [item for item in items if (-item[0],) + catalog_index._rank[item[1]] > tuple(after)]
+    return total, [records[slot]['id'] for _, slot in items[offset:offset + limit]]
+
+
+@pytest.mark.parametrize('query', ['wireless headphones', 'gaming laptop', 'running shoes', 'pro', 'usb c charger',
+                                   'wireless gaming mouse'])
+def test_pruned_relevance_search_matches_full_scoring(app, query):
+    """Test that reading impact-ordered postings returns exactly what scoring every match would"""
+    write_products(3000, replace=True)
+    catalog_index.ensure_loaded()
+    for kwargs in ({}, {'offset': 40, 'limit': 10}, {'rating_weight': 1.0}, {'rating_weight': -0.5},
+                   {'category': 'laptops'}, {'price_min': 20.0, 'price_max': 300.0}, {'limit': 1}):
+        total, products, last_key = catalog_index.search_text(query, **kwargs)
+        assert (total, _ids(products)) == _reference_search(query, **kwargs)
+        if last_key is not None:
+            _, following, _ = catalog_index.search_text(query, after=last_key, limit=15)
+            assert _ids(following) == _reference_search(query, after=last_key, limit=15)[1]
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from models.database import db, ChatArchive, ChatMessage, ChatResponseTemplate, ChatSession
+from models.migrations import upgrade
+from utils.chat_retention import read_archive, run_retention
+
+
+def _age(session_id, days):
+    ChatSession.query.filter_by(session_id=session_id).update(
+        {'updated_at': datetime.utcnow() - timedelta(days=days)})
+    db.session.commit()
+
+
+def test_fixed_replies_are_stored_once(client):
+    """Test that help replies reference one template row and history still shows the text"""
+    for _ in range(2):
+        client.post('/api/chat/message', json={'message': 'help', 'session_id': 'templated'})
+    client.post('/api/chat/message', json={'message': 'show me laptops', 'session_id': 'templated'})
+
+    rows = ChatMessage.query.order_by(ChatMessage.id).all()
+    assert [row.response == '' for row in rows] == [True, True, False]
+    assert rows[0].template_id == rows[1].template_id and ChatResponseTemplate.query.count() == 1
+    history = client.get('/api/chat/history/templated').get_json()['messages']
+    assert history[0]['response'] == history[1]['response'] == ChatResponseTemplate.query.one().text
+
+
+def test_idle_sessions_are_archived_in_batches(client):
+    """Test that only sessions past the TTL are archived, one compressed document each"""
+    for session_id in ('old-1', 'old-2', 'recent'):
+        client.post('/api/chat/message', json={'message': 'help', 'session_id': session_id})
+        client.post('/api/chat/message', json={'message': 'show me phones', 'session_id': session_id})
+    _age('old-1', 100)
+    _age('old-2', 95)
+
+    report = run_retention(days=90, batch_size=1)
+    assert (report.sessions, report.messages, report.batches) == (2, 4, 2)
+    assert [s.session_id for s in ChatSession.query.all()] == ['recent']
+    assert ChatMessage.query.count() == 2 and ChatArchive.query.count() == 2
+
+    archived = read_archive('old-1')
+    assert [m['message'] for m in archived['messages']] == ['help', 'show me phones']
+    assert archived['messages'][0]['response'] == ChatResponseTemplate.query.one().text
+
+    # The cached key is dropped, so the id starts a fresh session
+    client.post('/api/chat/message', json={'message': 'hello', 'session_id': 'old-1'})
+    assert ChatSession.query.filter_by(session_id='old-1').one().message_count == 1
+
+
+def test_purge_batches_follow_message_counts(client):
+    """Test that purge mode deletes without archiving and caps messages per batch"""
+    for n in range(3):
+        for _ in range(2):
+            client.post('/api/chat/message', json={'message': 'hello', 'session_id': f'purged-{n}'})
+        _age(f'purged-{n}', 200)
+    report = run_retention(days=90, mode='purge', max_messages=4)
+    assert (report.sessions, report.batches, report.archived_bytes) == (3, 2, 0)
+    assert ChatSession.query.count() == 0 and ChatArchive.query.count() == 0
+
+
+def test_upgrade_moves_stored_replies_to_templates(tmp_path):
+    """Test that migrating existing chat tables references repeated fixed replies"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, description TEXT NOT NULL, '
+            'price FLOAT NOT NULL, category VARCHAR(100) NOT NULL, brand VARCHAR(100), stock_quantity INTEGER, '
+            'image_url VARCHAR(300), rating FLOAT, features TEXT, created_at DATETIME, updated_at DATETIME)'))
+        connection.execute(text(
+            'CREATE TABLE chat_sessions (id INTEGER PRIMARY KEY, user_id INTEGER, session_id VARCHAR(100) NOT NULL, '
+            'created_at DATETIME, updated_at DATETIME)'))
+        connection.execute(text(
+            'CREATE TABLE chat_messages (id INTEGER PRIMARY KEY, session_id INTEGER NOT NULL, message TEXT NOT NULL, '
+            'response TEXT NOT NULL, message_type VARCHAR(50), timestamp DATETIME)'))
+        connection.execute(text(
+            "INSERT INTO chat_messages (session_id, message, response, message_type) VALUES "
+            "(1, 'help', 'Help text', 'help'), (1, 'help', 'Help text', 'help'), (1, 'phones', 'Found 3', 'product_search')"))
+    upgrade(engine)
+    with engine.connect() as connection:
+        rows = connection.execute(text('SELECT response, template_id FROM chat_messages ORDER BY id')).all()
+        templates = connection.execute(text('SELECT id, text FROM chat_response_templates')).all()
+    assert [tuple(row) for row in templates] == [(1, 'Help text')]
+    assert [tuple(row) for row in rows] == [('', 1), ('', 1), ('Found 3', None)]
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import event, select
+
+from models.database import db, ChatMessage, ChatSession
+from utils.chat_sessions import session_resolver, upsert_session
+
+
+def test_cached_sessions_resolve_without_queries(client):
+    """Test that only the first message of a session reads or creates its row"""
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        client.post('/api/chat/message', json={'message': 'hello', 'session_id': 'cached'})
+        assert any(s.startswith('INSERT INTO chat_sessions') for s in statements)
+
+        statements.clear()
+        client.post('/api/chat/message', json={'message': 'hello again', 'session_id': 'cached'})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    session_statements = [s for s in statements if 'chat_sessions' in s]
+    assert len(session_statements) == 1 and session_statements[0].startswith('UPDATE chat_sessions')
+    assert ChatSession.query.filter_by(session_id='cached').one().message_count == 2
+
+
+@pytest.mark.parametrize('returning', [True, False])
+def test_upsert_is_idempotent(app, monkeypatch, returning):
+    """Test that get-or-create returns the existing key instead of failing, with and without RETURNING"""
+    monkeypatch.setattr(db.session.get_bind().dialect, 'insert_returning', returning)
+    first = upsert_session('raced')
+    db.session.commit()
+    # Another process created the session after this one's cache missed
+    assert upsert_session('raced') == first
+    db.session.commit()
+    assert ChatSession.query.filter_by(session_id='raced').count() == 1
+
+
+def test_forget_drops_deleted_sessions(app):
+    """Test that a forgotten session is looked up again"""
+    resolver = session_resolver()
+    resolver.resolve('gone')
+    ChatSession.query.filter_by(session_id='gone').delete()
+    db.session.commit()
+    resolver.resolve('gone')
+    assert ChatSession.query.filter_by(session_id='gone').count() == 0
+
+    resolver.forget(['gone'])
+    resolver.resolve('gone')
+    assert ChatSession.query.filter_by(session_id='gone').count() == 1
+
+
+def _delete_elsewhere(session_id):
+    """Delete a session like a retention job in another process, bypassing this process's resolver"""
+    sessions, messages = ChatSession.__table__, ChatMessage.__table__
+    with db.engine.begin() as connection:
+        ids = select(sessions.c.id).where(sessions.c.session_id == session_id).scalar_subquery()
+        connection.execute(messages.delete().where(messages.c.session_id == ids))
+        connection.execute(sessions.delete().where(sessions.c.session_id == session_id))
+
+
+def test_message_recreates_a_session_deleted_elsewhere(client):
+    """Test that a cached key of a purged session is dropped instead of orphaning the message"""
+    client.post('/api/chat/message', json={'message': 'hello', 'session_id': 'purged'})
+    _delete_elsewhere('purged')
+
+    response = client.post('/api/chat/message', json={'message': 'still here?', 'session_id': 'purged'})
+    assert response.status_code == 200 and response.get_json()['message_id']
+    history = client.get('/api/chat/history/purged').get_json()
+    assert [m['message'] for m in history['messages']] == ['still here?']
+    assert history['session_info']['message_count'] == 1
+    assert ChatMessage.query.count() == 1 and ChatSession.query.count() == 1
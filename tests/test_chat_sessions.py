@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, text
+
+from models.database import db, ChatSession
+from models.migrations import upgrade
+
+
+def _add_sessions(count, user_id=None, messages=2, start=datetime(2026, 1, 1)):
+    for i in range(count):
+        chat_session = ChatSession(session_id=f'{user_id}-{i}', user_id=user_id, updated_at=start + timedelta(minutes=i))
+        db.session.add(chat_session)
+        db.session.flush()
+        for n in range(messages):
+            ChatSession.add_message(chat_session.id, f'hello {n}', 'hi')
+        # add_message touches updated_at; pin it so the order is known
+        chat_session.updated_at = start + timedelta(minutes=i)
+    db.session.commit()
+
+
+def test_messages_maintain_session_counters(client):
+    """Test that posting and resetting keep message_count and last_message_at current"""
+    for text_ in ('hello', 'show me laptops'):
+        client.post('/api/chat/message', json={'message': text_, 'session_id': 'counted'})
+    info = client.get('/api/chat/history/counted').get_json()['session_info']
+    assert info['message_count'] == 2 and info['last_message_at']
+
+    client.post('/api/chat/reset/counted')
+    listed = client.get('/api/chat/sessions').get_json()['sessions']
+    assert [(s['session_id'], s['message_count'], s['last_message_at']) for s in listed] == [('counted', 0, None)]
+
+
+def test_sessions_page_by_cursor_without_loading_messages(app, client):
+    """Test keyset pages in updated_at order, the user filter, and that messages are never queried"""
+    _add_sessions(5, user_id=None)
+    _add_sessions(3, user_id=7, start=datetime(2026, 2, 1))
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    seen, cursor = [], ''
+    try:
+        while cursor is not None:
+            page = client.get('/api/chat/sessions', query_string={'per_page': 3, 'cursor': cursor}).get_json()
+            seen += [s['session_id'] for s in page['sessions']]
+            assert all(s['message_count'] == 2 for s in page['sessions'])
+            cursor = page['next_cursor']
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    assert seen == [f'7-{i}' for i in (2, 1, 0)] + [f'None-{i}' for i in (4, 3, 2, 1, 0)]
+    assert not any('chat_messages' in statement for statement in statements)
+
+    mine = client.get('/api/chat/sessions?user_id=7').get_json()['sessions']
+    assert [s['session_id'] for s in mine] == ['7-2', '7-1', '7-0']
+    assert client.get('/api/chat/sessions?cursor=bogus').status_code == 400
+
+
+def test_upgrade_backfills_session_counters(tmp_path):
+    """Test that migrating existing chat tables counts their messages"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, description TEXT NOT NULL, '
+            'price FLOAT NOT NULL, category VARCHAR(100) NOT NULL, brand VARCHAR(100), stock_quantity INTEGER, '
+            'image_url VARCHAR(300), rating FLOAT, features TEXT, created_at DATETIME, updated_at DATETIME)'))
+        connection.execute(text(
+            'CREATE TABLE chat_sessions (id INTEGER PRIMARY KEY, user_id INTEGER, session_id VARCHAR(100) NOT NULL, '
+            'created_at DATETIME, updated_at DATETIME)'))
+        connection.execute(text(
+            'CREATE TABLE chat_messages (id INTEGER PRIMARY KEY, session_id INTEGER NOT NULL, message TEXT NOT NULL, '
+            'response TEXT NOT NULL, message_type VARCHAR(50), timestamp DATETIME)'))
+        connection.execute(text("INSERT INTO chat_sessions (id, session_id) VALUES (1, 'a'), (2, 'b')"))
+        connection.execute(text(
+            "INSERT INTO chat_messages (session_id, message, response, timestamp) VALUES "
+            "(1, 'x', 'y', '2026-01-01 10:00:00'), (1, 'x', 'y', '2026-01-02 10:00:00')"))
+    upgrade(engine)
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            'SELECT session_id, message_count, last_message_at FROM chat_sessions ORDER BY id')).all()
+    assert [tuple(row) for row in rows] == [('a', 2, '2026-01-02 10:00:00'), ('b', 0, None)]
+
+
+def _history_session(count):
+    chat_session = ChatSession(session_id='long')
+    db.session.add(chat_session)
+    db.session.flush()
+    for n in range(count):
+        ChatSession.add_message(chat_session.id, f'turn {n}', 'ok')
+    db.session.commit()
+
+
+def test_history_pages_back_with_before(client):
+    """Test that history returns the latest page and before= walks to the start in order"""
+    _history_session(7)
+    page = client.get('/api/chat/history/long?limit=3').get_json()
+    turns = [m['message'] for m in page['messages']]
+    assert turns == ['turn 4', 'turn 5', 'turn 6'] and page['has_more']
+    while page['has_more']:
+        page = client.get(f"/api/chat/history/long?limit=3&before={page['oldest_id']}").get_json()
+        turns = [m['message'] for m in page['messages']] + turns
+    assert turns == [f'turn {n}' for n in range(7)]
+    assert client.get('/api/chat/history/long?before=x').status_code == 400
+
+
+def test_history_delta_sync_and_etag(client):
+    """Test that since= returns only new turns and an unchanged session answers 304"""
+    _history_session(2)
+    first = client.get('/api/chat/history/long')
+    newest = first.get_json()['newest_id']
+    delta = client.get(f'/api/chat/history/long?since={newest}')
+    assert delta.get_json()['messages'] == [] and not delta.get_json()['has_more']
+    assert client.get(f'/api/chat/history/long?since={newest}',
+                      headers={'If-None-Match': delta.headers['ETag']}).status_code == 304
+
+    client.post('/api/chat/message', json={'message': 'hello', 'session_id': 'long'})
+    fresh = client.get(f'/api/chat/history/long?since={newest}', headers={'If-None-Match': delta.headers['ETag']})
+    assert fresh.status_code == 200 and [m['message'] for m in fresh.get_json()['messages']] == ['hello']
+    assert client.get('/api/chat/history/missing').status_code == 404
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from models.database import db, ChatMessage, ChatSession
+from utils.chat_writer import ChatWriter
+
+
+@pytest.fixture
+def writer(app):
+    writer = ChatWriter(app, batch_size=3, interval=60)
+    app.extensions['chat_writer'] = writer
+    yield writer
+    writer.close()
+    del app.extensions['chat_writer']
+
+
+def test_messages_are_queued_and_read_your_writes(client, writer):
+    """Test that replies return before the insert and history flushes the queue first"""
+    for text in ('hello', 'show me laptops'):
+        response = client.post('/api/chat/message', json={'message': text, 'session_id': 'queued'}).get_json()
+        assert response['message_id'] is None
+    assert len(writer) == 2 and ChatMessage.query.count() == 0
+
+    history = client.get('/api/chat/history/queued').get_json()
+    assert [m['message'] for m in history['messages']] == ['hello', 'show me laptops']
+    assert history['session_info']['message_count'] == 2 and history['session_info']['last_message_at']
+    assert len(writer) == 0 and writer.batches == 1
+
+
+def test_worker_writes_full_batches_and_close_drains(client, writer):
+    """Test the size threshold in the background thread and the final flush on close"""
+    writer.start()
+    for n in range(4):
+        client.post('/api/chat/message', json={'message': f'turn {n}', 'session_id': 'batched'})
+    deadline = time.monotonic() + 5
+    while writer.written < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.written == 3 and len(writer) == 1
+
+    writer.close()
+    assert writer.written == 4
+    assert ChatSession.query.filter_by(session_id='batched').one().message_count == 4
+
+
+def _session(session_id):
+    chat_session = ChatSession(session_id=session_id)
+    db.session.add(chat_session)
+    db.session.commit()
+    return chat_session.id
+
+
+def test_failing_row_is_dropped_without_blocking_the_queue(app, writer):
+    """Test that a row the database rejects is dropped and the rest of its batch written"""
+    pk = _session('poisoned')
+    writer.append(pk, 'before', 'ok')
+    writer.append(pk, None, 'message is NOT NULL')
+    writer.append(pk, 'after', 'ok')
+    assert writer.flush() == 2
+    assert writer.dropped == 1 and len(writer) == 0
+
+    writer.append(pk, 'later', 'ok')
+    assert writer.flush() == 1
+    assert [m.message for m in ChatMessage.query.order_by(ChatMessage.id)] == ['before', 'after', 'later']
+    db.session.expire_all()
+    assert db.session.get(ChatSession, pk).message_count == 3
+
+
+def test_transient_errors_are_retried_as_one_batch(app, writer, monkeypatch):
+    """Test that a lock timeout is retried a bounded number of times before falling back"""
+    pk = _session('locked')
+    writer.retry_delay = 0
+    write, calls = writer._write, []
+
+    def flaky(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise OperationalError('INSERT', {}, Exception('database is locked'))
+        write(rows)
+
+    monkeypatch.setattr(writer, '_write', flaky)
+    writer.append(pk, 'one', 'ok')
+    writer.append(pk, 'two', 'ok')
+    assert writer.flush() == 2 and calls == [2, 2] and writer.dropped == 0
+
+
+def test_queued_messages_recreate_a_session_deleted_elsewhere(client, writer):
+    """Test that a batch for a session purged by another process is written against a new session row"""
+    client.post('/api/chat/message', json={'message': 'hello', 'session_id': 'purged'})
+    writer.flush()
+    table = ChatSession.__table__
+    with db.engine.begin() as connection:
+        connection.execute(ChatMessage.__table__.delete())
+        connection.execute(table.delete().where(table.c.session_id == 'purged'))
+
+    client.post('/api/chat/message', json={'message': 'still here?', 'session_id': 'purged'})
+    history = client.get('/api/chat/history/purged').get_json()
+    assert [m['message'] for m in history['messages']] == ['still here?']
+    assert history['session_info']['message_count'] == 1 and ChatMessage.query.count() == 1
+
+    client.post('/api/chat/message', json={'message': 'and again', 'session_id': 'purged'})
+    writer.flush()
+    assert ChatSession.query.filter_by(session_id='purged').one().message_count == 2
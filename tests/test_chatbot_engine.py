@@ -0,0 +1,81 @@
+import pytest
+
+from utils.chatbot_engine import ChatbotEngine
+from utils.keyword_matcher import KeywordMatcher, tokenize
+
+
+@pytest.fixture
+def engine():
+    return ChatbotEngine()
+
+
+def test_keyword_matcher_respects_word_boundaries():
+    """Test that phrases only match whole tokens"""
+    matcher = KeywordMatcher()
+    matcher.add('pc', ('category', 'laptops'))
+    matcher.add('air', ('brand', 'nike'))
+    assert matcher.scan(tokenize('what are the specs, can you repair it?')) == []
+    assert matcher.scan(tokenize('a gaming PC')) == [('category', 'laptops')]
+
+
+def test_keyword_matcher_finds_multi_token_phrases():
+    """Test that overlapping single and multi token phrases are all returned"""
+    matcher = KeywordMatcher()
+    matcher.add('gaming', ('category', 'gaming'))
+    matcher.add('gaming laptops', ('compound', ('laptops', 'gaming')))
+    matcher.add('laptops', ('category', 'laptops'))
+    hits = matcher.scan(tokenize('cheap gaming laptops'))
+    assert hits == [('category', 'gaming'), ('compound', ('laptops', 'gaming')), ('category', 'laptops')]
+
+
+def test_extract_entities_avoids_substring_false_positives(engine):
+    """Test that headphones no longer implies smartphones via 'phone'"""
+    analysis = engine.analyze('noise cancelling headphones for repair specs')
+    assert analysis.categories == ('headphones',)
+    assert analysis.brands == ()
+
+
+def test_extract_entities_prefers_compound_categories(engine):
+    """Test that a compound category suppresses its individual synonyms"""
+    analysis = engine.analyze('show me gaming laptops from dell')
+    assert analysis.categories == ('laptops',)
+    assert 'gaming' in analysis.keywords
+    assert analysis.brands == ('dell',)
+
+
+def _count_calls(monkeypatch, target, name, counts):
+    original = getattr(target, name)
+
+    def counted(*args, **kwargs):
+        counts[name] = counts.get(name, 0) + 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(target, name, counted)
+
+
+@pytest.mark.parametrize('message', [
+    'show me laptops under $1000',
+    'is it in stock',
+    'tell me the specs',
+    'qwerty zxcvb',
+])
+def test_process_message_parses_each_stage_once(app, engine, monkeypatch, message):
+    """Test that a request analyzes, scans, extracts and detects intent exactly once"""
+    counts = {}
+    for name in ('analyze', '_extract_entities', '_detect_intent'):
+        _count_calls(monkeypatch, engine, name, counts)
+    _count_calls(monkeypatch, engine.keyword_matcher, 'scan', counts)
+
+    engine.process_message(message)
+
+    assert counts == {'analyze': 1, '_extract_entities': 1, '_detect_intent': 1, 'scan': 1}
+
+
+def test_message_analysis_is_immutable(engine):
+    """Test that handlers cannot mutate the shared analysis"""
+    analysis = engine.analyze('Cheap Samsung phones')
+    assert analysis.normalized == 'cheap samsung phones'
+    assert analysis.tokens == ('cheap', 'samsung', 'phones')
+    assert analysis.price_max == 200
+    with pytest.raises(AttributeError):
+        analysis.intent = 'general'
@@ -0,0 +1,56 @@
+import gzip
+import json
+
+import pytest
+
+from utils import compression
+
+
+def test_large_json_is_gzipped_when_accepted(client):
+    """Test that a catalog page above the threshold is compressed and still decodes"""
+    response = client.get('/api/products/?per_page=20', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(json.loads(gzip.decompress(response.get_data()))['products']) == 18
+    assert response.headers['ETag'].startswith('W/')
+
+
+def test_small_or_unaccepted_responses_stay_identity(app, client):
+    """Test the size threshold and clients that send no Accept-Encoding"""
+    assert 'Content-Encoding' not in client.get('/api/products/?per_page=20').headers
+    assert 'Content-Encoding' not in client.get('/health', headers={'Accept-Encoding': 'gzip'}).headers
+    app.config['COMPRESSION_MIN_SIZE'] = 0
+    assert client.get('/health', headers={'Accept-Encoding': 'gzip'}).headers['Content-Encoding'] == 'gzip'
+
+
+def test_revalidation_matches_compressed_etag(client):
+    """Test that a 304 answers the weak ETag of a compressed response"""
+    headers = {'Accept-Encoding': 'gzip'}
+    etag = client.get('/api/products/?per_page=20', headers=headers).headers['ETag']
+    response = client.get('/api/products/?per_page=20', headers=dict(headers, **{'If-None-Match': etag}))
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+
+def test_routes_can_override_the_level(app, client, monkeypatch):
+    """Test that @compression settings replace the config for their route"""
+    levels = []
+    original = compression.compress
+
+    def spy(data, encoding, gzip_level=6, brotli_quality=5):
+        levels.append(gzip_level)
+        return original(data, encoding, gzip_level, brotli_quality)
+
+    monkeypatch.setattr(compression, 'compress', spy)
+    app.config['COMPRESSION_MIN_SIZE'] = 0
+    client.post('/api/chat/message', json={'message': 'show me electronics'}, headers={'Accept-Encoding': 'gzip'})
+    client.get('/api/products/categories', headers={'Accept-Encoding': 'gzip'})
+    assert levels == [app.config['CHAT_COMPRESSION_GZIP_LEVEL'], app.config['COMPRESSION_GZIP_LEVEL']]
+
+
+@pytest.mark.skipif(compression.brotli is None, reason='brotli is not installed')
+def test_brotli_is_preferred_when_available(client):
+    """Test that br wins over gzip at equal quality"""
+    response = client.get('/api/products/?per_page=20', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert json.loads(compression.brotli.decompress(response.get_data()))['products']
@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import event
+
+from models.database import db, CatalogState, Product
+
+
+@pytest.fixture
+def serialized(monkeypatch):
+    """Count Product.to_dict calls to prove 304s skip serialization"""
+    calls = []
+    original = Product.to_dict
+
+    def to_dict(self):
+        calls.append(self.id)
+        return original(self)
+
+    monkeypatch.setattr(Product, 'to_dict', to_dict)
+    return calls
+
+
+@pytest.mark.parametrize('url', [
+    '/api/products/',
+    '/api/products/?category=books',
+    '/api/products/search?q=phone',
+    '/api/products/categories',
+    '/api/products/brands',
+    '/api/products/1',
+])
+def test_matching_etag_returns_304_without_serializing(client, serialized, url):
+    """Test that revalidation with the current ETag skips rows and JSON"""
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers['ETag'] and first.headers['Last-Modified']
+    assert 'no-cache' in first.headers['Cache-Control']
+
+    serialized.clear()
+    second = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert serialized == []
+
+
+def test_etag_changes_with_updates_and_deletes(client):
+    """Test that edits and deletes both invalidate the listing ETag"""
+    etag = client.get('/api/products/').headers['ETag']
+    product = db.session.get(Product, 2)
+    product.price += 1
+    db.session.commit()
+    updated = client.get('/api/products/', headers={'If-None-Match': etag})
+    assert updated.status_code == 200
+    assert updated.headers['ETag'] != etag
+
+    db.session.delete(db.session.get(Product, 3))
+    db.session.commit()
+    deleted = client.get('/api/products/', headers={'If-None-Match': updated.headers['ETag']})
+    assert deleted.status_code == 200
+
+
+def test_catalog_stamp_reads_indexes_not_filtered_counts(client):
+    """Test that revalidating a filtered listing neither scans with LIKE nor counts rows"""
+    etag = client.get('/api/products/?category=books&include_total=false').headers['ETag']
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement.lower())
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        response = client.get('/api/products/?category=books&include_total=false', headers={'If-None-Match': etag})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    assert response.status_code == 304
+    assert statements and not any(' like ' in s or 'count(' in s for s in statements)
+
+
+def test_bulk_deletes_persist_a_deletion_count(client):
+    """Test that deletes the ORM cannot track still move the stamp, through the database"""
+    etag = client.get('/api/products/categories').headers['ETag']
+    Product.query.filter(Product.id == 4).delete()
+    db.session.commit()
+    assert db.session.get(CatalogState, 1).deletions == 1
+    assert client.get('/api/products/categories', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_detail_etag_only_tracks_its_product(client):
+    """Test that editing one product leaves another product's ETag valid"""
+    etag = client.get('/api/products/1').headers['ETag']
+    product = db.session.get(Product, 2)
+    product.stock_quantity += 1
+    db.session.commit()
+    assert client.get('/api/products/1', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/api/products/2', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_if_modified_since_is_honoured(client):
+    """Test Last-Modified revalidation for clients that do not send ETags"""
+    first = client.get('/api/products/categories')
+    response = client.get('/api/products/categories', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 304
+
+
+def test_query_arguments_are_part_of_the_etag(client):
+    """Test that different pages of the same catalog do not share an ETag"""
+    first = client.get('/api/products/?page=1&per_page=5').headers['ETag']
+    second = client.get('/api/products/?page=2&per_page=5').headers['ETag']
+    assert first != second
+    response = client.get('/api/products/?page=2&per_page=5', headers={'If-None-Match': first})
+    assert response.status_code == 200
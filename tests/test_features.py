@@ -0,0 +1,159 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from models.database import db, Product, ProductFeature
+from models.migrations import upgrade
+from utils.catalog_index import catalog_index
+from utils import fts
+from utils.chatbot_engine import ChatbotEngine
+from utils.enhanced_seed_data import seed_comprehensive_products
+from utils.features import parse_features, split_feature
+
+
+@pytest.fixture
+def laptops(app):
+    db.session.add_all([
+        Product(name='Quillbook Workstation', price=2100.0, category='Laptops', brand='Quill',
+                description='Portable workstation.', rating=4.6,
+                features=json.dumps(['48GB RAM', '2TB SSD', '16-inch Display'])),
+        Product(name='Quillbook Air', price=1100.0, category='Laptops', brand='Quill',
+                description='Light everyday laptop.', rating=4.8,
+                features=json.dumps(['16GB RAM', '512GB SSD', 'Fanless'])),
+    ])
+    db.session.commit()
+    return app
+
+
+def test_features_split_into_key_and_value():
+    """Test that quantities become values and everything else a tag"""
+    assert split_feature('48GB RAM') == ('ram', '48gb')
+    assert split_feature('16-inch Display') == ('display', '16 inch')
+    assert split_feature('Bluetooth 5.3') == ('bluetooth', '5.3')
+    assert split_feature('5G') == ('5g', '')
+    assert parse_features('{"RAM": "48GB"}') == [('ram', '48gb')]
+    assert parse_features(None) == []
+
+
+def test_rows_follow_product_writes(laptops):
+    """Test that setting features rewrites the product's feature rows"""
+    product = Product.query.filter_by(name='Quillbook Air').one()
+    assert ('ram', '16gb') in {(row.feature_key, row.normalized_value) for row in product.feature_rows}
+    product.features = json.dumps(['Fanless'])
+    db.session.commit()
+    assert [(row.feature_key, row.normalized_value) for row in
+            ProductFeature.query.filter_by(product_id=product.id)] == [('fanless', '')]
+
+
+def test_features_are_returned_as_arrays(client, laptops):
+    """Test that products carry the decoded feature list, including projections"""
+    product = Product.query.filter_by(name='Quillbook Air').one()
+    assert client.get(f'/api/products/{product.id}').get_json()['features'] == ['16GB RAM', '512GB SSD', 'Fanless']
+    data = client.get('/api/products/search?q=quillbook&fields=name,features').get_json()
+    assert all(isinstance(p['features'], list) for p in data['products'])
+
+
+@pytest.mark.parametrize('backend', ['index', 'sql', 'fts'])
+def test_search_filters_by_feature(client, laptops, backend):
+    """Test that every feature= phrase must match on every backend"""
+    def names(*features):
+        query = ''.join(f'&feature={feature}' for feature in features)
+        return [p['name'] for p in client.get(f'/api/products/search?q=quillbook&backend={backend}{query}')
+                .get_json()['products']]
+
+    assert names('48gb ram') == ['Quillbook Workstation']
+    assert names('ram 16GB', 'fanless') == ['Quillbook Air']
+    assert set(names('ssd')) == {'Quillbook Workstation', 'Quillbook Air'}
+    assert names('48gb ram', 'fanless') == []
+
+
+def test_facets_accept_feature_filters(client, laptops):
+    """Test that facet counts respect feature= like search does"""
+    assert client.get('/api/products/facets?q=quillbook&feature=2tb').get_json()['total'] == 1
+
+
+@pytest.mark.parametrize('backend,mode', [('index', 'ranked'), ('sql', 'ranked'), ('index', 'cascade'),
+                                          ('sql', 'cascade')])
+def test_chat_matches_requested_features(laptops, backend, mode):
+    """Test that 'with ...' phrases known to the catalog pick out the products having them"""
+    engine = ChatbotEngine(search_backend=backend, search_mode=mode, cache_size=0)
+    response = engine.process_message('show me a quill laptop with 48GB RAM')
+    assert response['entities']['features'] == ['48gb ram']
+    assert [p['name'] for p in response['products']] == ['Quillbook Workstation']
+
+    # Phrases no product has are dropped instead of emptying the results
+    response = engine.process_message('show me quill laptops with my discount')
+    assert response['entities']['features'] == []
+    assert response['products']
+
+
+@pytest.mark.parametrize('mode', ['ranked', 'cascade'])
+def test_sql_keywords_match_feature_rows_without_fts(laptops, monkeypatch, mode):
+    """Test that a word only found in features matches through product_features, not the JSON column"""
+    monkeypatch.setattr(fts, 'fts_enabled', lambda engine=None: False)
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement.lower())
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        response = ChatbotEngine(search_backend='sql', search_mode=mode, cache_size=0).process_message(
+            'show me fanless laptops')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    assert [p['name'] for p in response['products']] == ['Quillbook Air']
+    assert any('product_features' in statement for statement in statements)
+    assert not any('products.features like' in statement for statement in statements)
+
+
+@pytest.mark.parametrize('backend,mode', [('index', 'ranked'), ('sql', 'ranked'), ('index', 'cascade'),
+                                          ('sql', 'cascade')])
+def test_chat_features_count_as_a_match_on_seed_data(app, backend, mode):
+    """Test that a known feature is a match signal and its words still search the text"""
+    engine = ChatbotEngine(search_backend=backend, search_mode=mode, cache_size=0)
+    response = engine.process_message('headphones with noise canceling')
+    assert response['entities']['features'] == ['noise canceling']
+    assert [p['name'] for p in response['products']] == ['Sony WH-1000XM5 Headphones']
+    assert "couldn't find" not in response['response']
+
+
+@pytest.mark.parametrize('backend,mode', [('index', 'ranked'), ('sql', 'ranked'), ('index', 'cascade'),
+                                          ('sql', 'cascade')])
+def test_chat_features_never_empty_a_matched_category(app, backend, mode):
+    """Test that a feature only other categories have leaves the requested category's products"""
+    seed_comprehensive_products()
+    engine = ChatbotEngine(search_backend=backend, search_mode=mode, cache_size=0)
+    response = engine.process_message('show me laptops with a good battery')
+    assert response['entities']['features'] == ['battery']
+    assert response['products'] and {p['category'] for p in response['products']} == {'Laptops'}
+    assert "couldn't find" not in response['response'] and 'with battery' not in response['response']
+
+
+def test_index_tracks_feature_changes(laptops):
+    """Test that the catalog index's feature lookups follow commits"""
+    catalog_index.ensure_loaded()
+    assert not catalog_index.has_feature('thunderbolt')
+    product = Product.query.filter_by(name='Quillbook Air').one()
+    product.features = json.dumps(['Thunderbolt 4'])
+    db.session.commit()
+    assert catalog_index.has_feature('thunderbolt') and catalog_index.has_feature('thunderbolt 4')
+    assert not catalog_index.has_feature('fanless')
+
+
+def test_upgrade_backfills_features(tmp_path):
+    """Test that migrating an existing database parses stored features"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, description TEXT NOT NULL, '
+            'price FLOAT NOT NULL, category VARCHAR(100) NOT NULL, brand VARCHAR(100), stock_quantity INTEGER, '
+            'image_url VARCHAR(300), rating FLOAT, features TEXT, created_at DATETIME, updated_at DATETIME)'))
+        connection.execute(text(
+            "INSERT INTO products (name, description, price, category, features) VALUES "
+            "('Laptop', 'A laptop', 10, 'Laptops', :features)"), {'features': json.dumps(['32GB RAM', 'Backlit'])})
+    upgrade(engine)
+    with engine.connect() as connection:
+        rows = connection.execute(text('SELECT feature_key, normalized_value FROM product_features ORDER BY id')).all()
+    assert [tuple(row) for row in rows] == [('ram', '32gb'), ('backlit', '')]
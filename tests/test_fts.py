@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from models.database import db, Product
+from utils import fts
+from utils.chatbot_engine import ChatbotEngine
+
+
+@pytest.fixture
+def catalog(app):
+    if not fts.fts_enabled():
+        pytest.skip('SQLite was built without FTS5')
+    db.session.add_all([
+        Product(name='QuietPro Noise Cancelling Headphones', price=249.0, category='Headphones', brand='Hush',
+                description='Wireless over-ear headphones.',
+                rating=4.2, features=json.dumps(['Hushfoam Cancelling', 'Bluetooth 5.3'])),
+        Product(name='Trailblazer Running Shoes', price=89.0, category='Shoes', brand='Stride',
+                description='Featherweight shoes for long distance trailrunning.',
+                rating=4.5, features=json.dumps(['Breathable mesh'])),
+    ])
+    db.session.commit()
+    return app
+
+
+def test_triggers_keep_index_in_sync(catalog):
+    """Test that inserts, updates and deletes reach the FTS table"""
+    assert fts.search('trailblazer')[0] == 1
+    shoe = Product.query.filter_by(brand='Stride').one()
+    shoe.name = 'Pathfinder Running Shoes'
+    db.session.commit()
+    assert fts.search('trailblazer')[0] == 0
+    assert fts.search('pathfinder')[0] == 1
+    db.session.delete(shoe)
+    db.session.commit()
+    assert fts.search('pathfinder')[0] == 0
+
+
+def test_match_expression_uses_prefixes_and_escapes_input():
+    """Test that every term is a quoted prefix and FTS syntax is dropped"""
+    assert fts.match_expression('noise-cancel "OR" NEAR(') == '"noise"* AND "cancel"* AND "or"* AND "near"*'
+    assert fts.match_expression('wireless', ('name', 'brand')) == '{name brand}: ("wireless"*)'
+    assert fts.match_expression('!!') is None
+
+
+def test_search_endpoint_uses_fts_with_highlights(client, catalog):
+    """Test prefix matching, bm25 relevance and highlighted snippets"""
+    data = client.get('/api/products/search?q=hushfoa&backend=fts&highlight=1').get_json()
+    assert data['backend'] == 'fts'
+    assert data['total'] == 1
+    product = data['products'][0]
+    assert product['brand'] == 'Hush'
+    assert product['relevance'] > 0
+    assert '<mark>Hushfoam</mark>' in product['highlight']['snippet']
+
+
+def test_search_endpoint_falls_back_without_fts(client, catalog, monkeypatch):
+    """Test that backend=fts uses the ILIKE path when FTS5 is not ready"""
+    monkeypatch.setattr(fts, 'fts_enabled', lambda engine=None: False)
+    data = client.get('/api/products/search?q=trailrunning&backend=fts').get_json()
+    assert data['backend'] == 'sql'
+    assert [p['brand'] for p in data['products']] == ['Stride']
+
+
+def test_chatbot_sql_backend_filters_keywords_with_fts(catalog):
+    """Test that the SQL search paths match keywords through FTS5"""
+    engine = ChatbotEngine(search_backend='sql', search_mode='cascade')
+    results = engine._query_database(keywords=['featherweight', 'trailrun'], keyword_and=True)
+    assert [p['brand'] for p in results] == ['Stride']
+    ranked = engine._rank_database(keywords=['featherweight'])
+    assert [(p['brand'], p['match_tier']) for p in ranked] == [('Stride', 'exact')]
+
+
+def test_keyword_filters_keep_separate_match_parameters(catalog):
+    """Test that AND-ed keyword filters bind their own MATCH expressions"""
+    engine = ChatbotEngine(search_backend='sql', search_mode='cascade')
+    assert engine._query_database(keywords=['featherweight', 'quietpro'], keyword_and=True) == []
+    results = engine._query_database(keywords=['featherweight', 'quietpro'])
+    assert sorted(p['brand'] for p in results) == ['Hush', 'Stride']
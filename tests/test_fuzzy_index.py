@@ -0,0 +1,77 @@
+import pytest
+
+from utils.chatbot_engine import ChatbotEngine
+from utils.fuzzy_index import TrigramIndex
+
+
+@pytest.fixture
+def vocabulary():
+    index = TrigramIndex()
+    index.add(['laptop', 'iphone', 'headphones', 'phone', 'samsung', 'galaxy'])
+    return index
+
+
+@pytest.mark.parametrize('typo, expected', [
+    ('labtop', 'laptop'),
+    ('iphnoe', 'iphone'),
+    ('headphnes', 'headphones'),
+    ('samsnug', 'samsung'),
+])
+def test_trigram_index_corrects_typos(vocabulary, typo, expected):
+    """Test that common misspellings resolve to the intended catalog term"""
+    assert vocabulary.best(typo) == expected
+
+
+def test_trigram_index_ignores_unrelated_terms(vocabulary):
+    """Test that nothing is returned when no term is similar enough"""
+    assert vocabulary.lookup('bicycle') == []
+
+
+def test_trigram_index_forgets_removed_terms(vocabulary):
+    """Test that reference counted terms disappear once unused"""
+    vocabulary.add(['laptop'])
+    vocabulary.remove(['laptop'])
+    assert vocabulary.best('labtop') == 'laptop'
+    vocabulary.remove(['laptop'])
+    assert 'laptop' not in vocabulary
+    assert vocabulary.best('labtop') is None
+
+
+def test_search_endpoint_falls_back_to_fuzzy_matches(client):
+    """Test that a misspelled query is retried with corrected terms"""
+    data = client.get('/api/products/search?q=iphnoe').get_json()
+    assert data['corrected_query'] == 'iphone'
+    assert data['total'] > 0
+    assert all('iphone' in p['name'].lower() for p in data['products'])
+
+
+def test_corrected_search_pages_past_the_first(client):
+    """Test that later pages and cursors of a misspelled query keep using the correction"""
+    first = client.get('/api/products/search?q=cameraa&per_page=1').get_json()
+    assert first['corrected_query'] == 'camera' and first['total'] == 2 and first['pages'] == 2
+    second = client.get('/api/products/search?q=cameraa&per_page=1&page=2').get_json()
+    assert second['corrected_query'] == 'camera' and second['total'] == 2
+    assert [p['id'] for p in second['products']] != [p['id'] for p in first['products']] != []
+
+    walked, cursor = [], ''
+    while cursor is not None:
+        page = client.get('/api/products/search', query_string={'q': 'cameraa', 'per_page': 1,
+                                                                'cursor': cursor}).get_json()
+        walked += [p['id'] for p in page['products']]
+        cursor = page['next_cursor']
+    assert walked == [p['id'] for p in first['products'] + second['products']]
+    assert client.get('/api/products/search?q=cameraa&page=3&per_page=1').get_json()['products'] == []
+
+
+def test_search_endpoint_skips_fuzzy_when_exact_matches(client):
+    """Test that correct queries are not rewritten"""
+    data = client.get('/api/products/search?q=iphone').get_json()
+    assert data['corrected_query'] is None
+
+
+def test_chatbot_corrects_misspelled_keywords(app):
+    """Test that the chatbot keyword path uses fuzzy matches instead of the popular fallback"""
+    result = ChatbotEngine().process_message('find headphnes')
+    assert result['entities']['corrections'] == {'headphnes': 'headphones'}
+    assert 'Headphones' in result['products'][0]['name']
+    assert "couldn't find an exact match" not in result['response']
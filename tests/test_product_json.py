@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from models.database import db, Product
+from utils import product_json
+from utils.product_json import product_fragments, with_extras
+
+
+@pytest.fixture
+def to_dict_calls(monkeypatch):
+    calls = []
+    original = Product.to_dict
+
+    def to_dict(self):
+        calls.append(self.id)
+        return original(self)
+
+    monkeypatch.setattr(Product, 'to_dict', to_dict)
+    return calls
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def encoder(request):
+    if request.param == 'orjson' and product_json.orjson is None:
+        pytest.skip('orjson is not installed')
+    product_json.configure(request.param)
+    yield request.param
+    product_json.configure('auto')
+
+
+def test_fragments_match_to_dict(client, encoder):
+    """Test that assembled list responses decode to the to_dict() payload"""
+    product_fragments.clear()
+    data = client.get('/api/products/?per_page=5').get_json()
+    expected = [product.to_dict() for product in Product.query.limit(5)]
+    assert data['products'] == expected
+    assert data['total'] == Product.query.count()
+    assert client.get('/api/products/1').get_json() == db.session.get(Product, 1).to_dict()
+
+
+def test_unchanged_products_are_encoded_once(client, to_dict_calls):
+    """Test that a repeated listing reuses fragments instead of calling to_dict()"""
+    product_fragments.clear()
+    client.get('/api/products/?per_page=5')
+    assert len(to_dict_calls) == 5
+    to_dict_calls.clear()
+    client.get('/api/products/?per_page=5')
+    assert to_dict_calls == []
+
+
+def test_updates_produce_new_fragments(client):
+    """Test that an edit changes updated_at and so the cached fragment used"""
+    client.get('/api/products/1')
+    product = db.session.get(Product, 1)
+    product.name = 'Renamed Product'
+    db.session.commit()
+    assert client.get('/api/products/1').get_json()['name'] == 'Renamed Product'
+
+
+def test_bulk_statements_clear_the_cache(app):
+    """Test that ORM bulk updates, which may keep updated_at, drop every fragment"""
+    product_fragments.product(db.session.get(Product, 1))
+    assert len(product_fragments.cache) > 0
+    Product.query.filter(Product.id == 1).update({'stock_quantity': 0})
+    db.session.commit()
+    assert len(product_fragments.cache) == 0
+
+
+def test_extras_are_spliced_into_fragments(encoder):
+    """Test that per-request keys are appended to a cached object"""
+    assert json.loads(with_extras(b'{"id":1}', {'relevance': 1.5})) == {'id': 1, 'relevance': 1.5}
+    assert json.loads(with_extras(b'{}', {'match_tier': 'exact'})) == {'match_tier': 'exact'}
+    assert with_extras(b'{"id":1}', {}) == b'{"id":1}'
+
+
+def test_search_and_chat_keep_ranking_extras(client):
+    """Test that relevance and match tiers survive fragment assembly"""
+    search = client.get('/api/products/search?q=headphones').get_json()
+    assert search['products'] and all('relevance' in p for p in search['products'])
+    chat = client.post('/api/chat/message', json={'message': 'show me electronics', 'view': 'full'}).get_json()
+    assert chat['products'] and all('match_tier' in p and 'features' in p for p in chat['products'])
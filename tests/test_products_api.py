@@ -0,0 +1,232 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from models.database import db, CatalogState, Product
+from utils.catalog_index import catalog_index
+
+
+@pytest.fixture
+def headphones(app):
+    db.session.add_all([
+        Product(name='Studio Open-Back Headphones', price=299.0, category='Headphones', brand='Acme',
+                description='Open-back design that lets outside noise in for a natural soundstage.',
+                rating=4.9, features=json.dumps(['Open-back', 'Wired'])),
+        Product(name='QuietPro Noise Cancelling Headphones', price=249.0, category='Headphones', brand='Hush',
+                description='Wireless over-ear headphones.',
+                rating=4.2, features=json.dumps(['Noise Cancelling', 'Bluetooth 5.3'])),
+    ])
+    db.session.commit()
+    return app
+
+
+def test_search_ranks_by_relevance(client, headphones):
+    """Test that a matching product outranks a better rated partial match"""
+    response = client.get('/api/products/search?q=noise cancelling&category=headphones')
+    assert response.status_code == 200
+    names = [p['name'] for p in response.get_json()['products']]
+    assert names == ['QuietPro Noise Cancelling Headphones', 'Studio Open-Back Headphones']
+
+
+def test_search_can_still_sort_by_rating(client, headphones):
+    """Test that sort=rating keeps the original rating DESC, price ASC order"""
+    response = client.get('/api/products/search?q=noise&category=headphones&sort=rating')
+    names = [p['name'] for p in response.get_json()['products']]
+    assert names == ['Studio Open-Back Headphones', 'QuietPro Noise Cancelling Headphones']
+
+
+def test_search_matches_feature_terms(client, headphones):
+    """Test that terms only present in the features JSON are searchable"""
+    data = client.get('/api/products/search?q=bluetooth').get_json()
+    assert data['total'] == 1
+    assert data['products'][0]['brand'] == 'Hush'
+    assert data['products'][0]['relevance'] > 0
+
+
+def test_relevance_statistics_follow_catalog_changes(app, headphones):
+    """Test that document frequencies update incrementally on delete"""
+    catalog_index.ensure_loaded()
+    scorer = catalog_index._relevance
+    before = len(scorer._postings['headphones'])
+    db.session.delete(Product.query.filter_by(brand='Hush').one())
+    db.session.commit()
+    assert len(scorer._postings['headphones']) == before - 1
+    assert 'bluetooth' not in scorer._postings
+
+
+def walk_cursor(client, url):
+    """Follow next_cursor from the first page to the last, returning every product id"""
+    ids, cursor = [], ''
+    while cursor is not None:
+        data = client.get(f'{url}&cursor={cursor}').get_json()
+        ids.extend(p['id'] for p in data['products'])
+        cursor = data['next_cursor']
+    return ids
+
+
+@pytest.mark.parametrize('params', [
+    'backend=sql&sort=rating',
+    'backend=index&sort=relevance',
+    'backend=fts&sort=relevance',
+    'backend=fts&sort=rating',
+])
+def test_search_cursor_pages_match_offset_pages(client, headphones, params):
+    """Test that keyset pages return the same sequence as page/per_page"""
+    url = f'/api/products/search?q=headphones&per_page=1&{params}'
+    total = client.get(url).get_json()['total']
+    by_page = [client.get(f'{url}&page={page}').get_json()['products'][0]['id'] for page in range(1, total + 1)]
+    assert total >= 2
+    assert walk_cursor(client, url) == by_page
+
+
+def test_list_cursor_covers_every_product_once(client, headphones):
+    """Test that cursor pagination over the listing visits each product exactly once"""
+    ids = walk_cursor(client, '/api/products/?per_page=5&include_total=false')
+    assert ids == sorted(ids)
+    assert len(ids) == Product.query.count()
+
+
+def test_include_total_false_skips_the_count(client, headphones):
+    """Test that totals are omitted on request while page mode keeps working"""
+    data = client.get('/api/products/?page=2&per_page=5&include_total=false').get_json()
+    assert data['total'] is None and data['pages'] is None
+    assert len(data['products']) == 5
+    data = client.get('/api/products/search?q=headphones&include_total=false').get_json()
+    assert data['total'] is None and data['products']
+
+
+def test_cursor_from_another_ordering_is_rejected(client, headphones):
+    """Test that a cursor cannot be replayed against a different sort"""
+    url = '/api/products/search?q=headphones&per_page=1&backend=sql&sort=rating'
+    cursor = client.get(f'{url}&cursor=').get_json()['next_cursor']
+    response = client.get(f'/api/products/search?q=headphones&backend=index&cursor={cursor}')
+    assert response.status_code == 400
+    assert client.get('/api/products/?cursor=not-a-cursor').status_code == 400
+
+
+def test_facets_count_buckets_in_one_response(client, headphones):
+    """Test that facets cover categories, brands, prices and ratings for a query"""
+    data = client.get('/api/products/facets?q=headphones&category=headphones').get_json()
+    assert data['total'] == 2
+    assert data['categories'] == [{'value': 'Headphones', 'count': 2}]
+    assert {b['value'] for b in data['brands']} == {'Acme', 'Hush'}
+    buckets = {(b['min'], b['max']): b['count'] for b in data['price_buckets']}
+    assert buckets[(100, 250)] == 1 and buckets[(250, 500)] == 1
+    bands = {b['min']: b['count'] for b in data['rating_bands']}
+    assert bands[4.5] == 1 and bands[4.0] == 1
+    assert sum(b['count'] for b in data['price_buckets']) == data['total']
+
+
+def test_facets_follow_the_catalog_version(client, headphones):
+    """Test that cached facets are recomputed after a product changes"""
+    from api.products import facets_cache
+    first = client.get('/api/products/facets').get_json()
+    hits = facets_cache.hits
+    assert client.get('/api/products/facets').get_json() == first
+    assert facets_cache.hits == hits + 1
+
+    db.session.delete(Product.query.filter_by(brand='Hush').one())
+    db.session.commit()
+    second = client.get('/api/products/facets').get_json()
+    assert second['catalog_version'] > first['catalog_version']
+    assert second['total'] == first['total'] - 1
+
+
+def test_commits_from_other_processes_reach_the_index(client, headphones):
+    """Test that rows written outside this process's sessions are picked up from the persisted stamp"""
+    def found():
+        search = client.get('/api/products/search?q=zorblax').get_json()['total']
+        facets = client.get('/api/products/facets?q=zorblax').get_json()['total']
+        chat = client.post('/api/chat/message', json={'message': 'show me zorblax'}).get_json()
+        return search, facets, [p['name'] for p in chat['products'] if p['match_tier'] == 'exact']
+
+    assert found() == (0, 0, [])
+    # A Core connection bypasses the session events, like an import run in another process
+    table = Product.__table__
+    with db.engine.begin() as connection:
+        connection.execute(table.insert().values(name='Zorblax Speaker', description='Portable speaker.', price=59.0,
+                                                 category='Audio', rating=4.0, updated_at=datetime.utcnow()))
+    assert found() == (1, 1, ['Zorblax Speaker'])
+
+    with db.engine.begin() as connection:
+        connection.execute(table.delete().where(table.c.name == 'Zorblax Speaker'))
+        CatalogState.record_deletion(connection)
+    assert found() == (0, 0, [])
+
+
+def test_card_view_returns_compact_products(client, headphones):
+    """Test that view=card drops features and timestamps and clips descriptions"""
+    from utils.projection import CARD_FIELDS, CARD_DESCRIPTION_LENGTH
+    product = Product.query.filter_by(brand='Acme').one()
+    product.description = 'x' * 500
+    db.session.commit()
+    for url in ('/api/products/?view=card&per_page=50', '/api/products/?view=card&cursor=&per_page=50'):
+        products = client.get(url).get_json()['products']
+        assert all(set(p) == set(CARD_FIELDS) for p in products)
+        card = next(p for p in products if p['id'] == product.id)
+        assert card['description'] == 'x' * CARD_DESCRIPTION_LENGTH
+    assert client.get(f'/api/products/{product.id}?view=card').get_json()['description'] == 'x' * CARD_DESCRIPTION_LENGTH
+
+
+@pytest.mark.parametrize('backend', ['index', 'fts', 'sql'])
+def test_search_fields_select_a_subset(client, headphones, backend):
+    """Test that fields= applies to every search backend and keeps ranking extras"""
+    data = client.get(f'/api/products/search?q=headphones&backend={backend}&sort=rating&fields=id,name').get_json()
+    assert data['products']
+    assert all(set(p) - {'relevance', 'highlight'} == {'id', 'name'} for p in data['products'])
+
+
+def test_unknown_fields_are_rejected(client, headphones):
+    """Test that a typo in fields= is a 400 rather than a silent full payload"""
+    assert client.get('/api/products/?fields=id,nmae').status_code == 400
+    assert client.get('/api/products/1?view=tiny').status_code == 400
+    assert client.get('/api/products/999999?fields=id').status_code == 404
+
+
+def test_chat_products_default_to_cards(client, headphones):
+    """Test that chat responses carry card projections unless asked for full products"""
+    from utils.projection import CARD_FIELDS
+    card = client.post('/api/chat/message', json={'message': 'show me headphones'}).get_json()
+    assert card['products'] and all(set(CARD_FIELDS) <= set(p) and 'features' not in p for p in card['products'])
+    full = client.post('/api/chat/message', json={'message': 'show me headphones', 'view': 'full'}).get_json()
+    assert all('features' in p for p in full['products'])
+
+
+def test_batch_returns_requested_order_with_misses(client, headphones):
+    """Test that batch results follow the ids given and mark unknown ones"""
+    data = client.get('/api/products/batch?ids=3,999999,1,3').get_json()
+    assert [p and p['id'] for p in data['products']] == [3, None, 1]
+    assert data['missing'] == [999999]
+    assert data['requested'] == 3
+
+
+def test_batch_post_matches_get_and_uses_one_query(client, headphones):
+    """Test the POST variant and that every id is resolved in a single SELECT"""
+    from sqlalchemy import event
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM products' in statement and 'max(' not in statement.lower():
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        posted = client.post('/api/products/batch?view=card', json={'ids': [5, 2, 4]}).get_json()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    assert len(statements) == 1 and ' IN ' in statements[0]
+    fetched = client.get('/api/products/batch?ids=5,2,4&view=card').get_json()
+    assert posted == fetched
+    assert 'features' not in posted['products'][0]
+
+
+def test_batch_rejects_bad_and_oversized_requests(app, client, headphones):
+    """Test validation of ids and the configurable batch limit"""
+    assert client.get('/api/products/batch').status_code == 400
+    assert client.get('/api/products/batch?ids=1,two').status_code == 400
+    assert client.post('/api/products/batch', json={'ids': '1,2'}).status_code == 400
+    app.config['PRODUCT_BATCH_MAX'] = 2
+    response = client.get('/api/products/batch?ids=1,2,3')
+    assert response.status_code == 400
+    assert 'At most 2' in response.get_json()['error']
@@ -0,0 +1,75 @@
+from models.database import db, Product
+from utils.chatbot_engine import ChatbotEngine
+from utils.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_response_cache_evicts_least_recently_used():
+    """Test that the cache stays bounded and evicts the oldest entry"""
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_response_cache_expires_entries():
+    """Test that entries are misses once their TTL has passed"""
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=10, ttl=30, clock=clock)
+    cache.set('a', 1)
+    clock.now = 29
+    assert cache.get('a') == 1
+    clock.now = 30
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_equivalent_messages_share_a_cache_entry(app):
+    """Test that different phrasings with the same analysis hit the cache"""
+    engine = ChatbotEngine()
+    first = engine.process_message('Show me laptops under $1000')
+    second = engine.process_message('  show me LAPTOPS under 1000 ')
+    assert first == second
+    stats = engine.response_cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+def test_product_writes_invalidate_cached_responses(app):
+    """Test that a product commit makes cached searches miss"""
+    engine = ChatbotEngine()
+    engine.process_message('find zorblax')
+    db.session.add(Product(name='Zorblax Speaker', description='Loud', price=50.0,
+                           category='Electronics', brand='Zorblax', rating=4.0))
+    db.session.commit()
+    result = engine.process_message('find zorblax')
+    assert result['products'][0]['name'] == 'Zorblax Speaker'
+    assert engine.response_cache.stats()['hits'] == 0
+
+
+def test_static_responses_skip_the_engine(app, monkeypatch):
+    """Test that greetings and help never parse the message or use the cache"""
+    engine = ChatbotEngine()
+    monkeypatch.setattr(engine, 'analyze', lambda message: (_ for _ in ()).throw(AssertionError))
+    assert engine.process_message('hello there')['type'] == 'greeting'
+    assert engine.process_message('help')['type'] == 'help'
+    assert engine.response_cache.stats()['misses'] == 0
+
+
+def test_cache_stats_endpoint(client):
+    """Test that the cache counters are exposed over the API"""
+    response = client.get('/api/chat/cache/stats')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['enabled'] is True
+    assert {'hits', 'misses', 'evictions'} <= set(data)
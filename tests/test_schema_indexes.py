@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+from models.database import db, Product, ProductFeature
+from models.migrations import upgrade, MIGRATIONS
+from utils.chatbot_engine import ChatbotEngine
+
+
+def query_plans(run):
+    """Run a callable and return the EXPLAIN QUERY PLAN details of every SELECT it issued"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        run()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    connection = db.session.connection()
+    return [
+        ' | '.join(row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+        for statement, parameters in statements
+    ]
+
+
+@pytest.fixture
+def sql_engine(app):
+    return ChatbotEngine(search_backend='sql', search_mode='cascade')
+
+
+def test_keys_are_normalized_on_write(app):
+    """Test that category and brand keys follow ORM writes"""
+    product = Product(name='Widget', description='A widget', price=5.0, category=' Gadgets ', brand='ACME')
+    db.session.add(product)
+    db.session.commit()
+    assert (product.category_key, product.brand_key) == ('gadgets', 'acme')
+    product.brand = None
+    db.session.commit()
+    assert product.brand_key is None
+
+
+def test_keys_default_for_core_inserts(app):
+    """Test that bulk inserts that skip the ORM still get keys"""
+    db.session.execute(Product.__table__.insert(), [
+        {'name': 'Bulk', 'description': 'Bulk row', 'price': 1.0, 'category': 'Bulk Goods', 'brand': 'Loose'},
+    ])
+    row = db.session.execute(text("SELECT category_key, brand_key FROM products WHERE name = 'Bulk'")).one()
+    assert tuple(row) == ('bulk goods', 'loose')
+
+
+def test_category_query_uses_composite_index(sql_engine):
+    """Test that category filters and the rating sort are served by one index"""
+    plans = query_plans(lambda: sql_engine._query_database(categories=['electronics'], price_max=1000))
+    assert 'ix_products_category_key_rating_price' in plans[0]
+    assert 'TEMP B-TREE' not in plans[0]
+
+
+def test_brand_query_uses_brand_index(sql_engine):
+    """Test that brand filters look up the (brand_key, price) index"""
+    plans = query_plans(lambda: sql_engine._query_database(brands=['apple', 'sony'], price_min=100))
+    assert 'ix_products_brand_key_price' in plans[0]
+
+
+def test_popular_fallback_reads_rating_index(sql_engine):
+    """Test that the unfiltered fallback walks the rating index instead of sorting"""
+    plans = query_plans(lambda: sql_engine._query_database())
+    assert 'ix_products_rating_price' in plans[0]
+    assert 'TEMP B-TREE' not in plans[0]
+
+
+def test_feature_keywords_use_feature_indexes(app):
+    """Test that keyword lookups in product_features are index searches, not scans"""
+    plans = query_plans(lambda: db.session.execute(ProductFeature.keyword_product_ids('noise')).all())
+    assert 'USING COVERING INDEX ix_product_features_key_value' in plans[0]
+    assert 'INDEX ix_product_features_value' in plans[0]
+    assert 'SCAN product_features' not in plans[0]
+
+
+def test_chatbot_sql_results_match_categories_by_key(sql_engine):
+    """Test that equality on keys finds the seeded category"""
+    results = sql_engine._query_database(categories=['Electronics'])
+    assert results and all(p['category'] == 'Electronics' for p in results)
+
+
+def test_upgrade_migrates_a_legacy_products_table(tmp_path):
+    """Test that an existing table gains keys, a backfill and indexes exactly once"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, description TEXT NOT NULL, '
+            'price FLOAT NOT NULL, category VARCHAR(100) NOT NULL, brand VARCHAR(100), stock_quantity INTEGER, '
+            'image_url VARCHAR(300), rating FLOAT, features TEXT, created_at DATETIME, updated_at DATETIME)'))
+        connection.execute(text(
+            "INSERT INTO products (name, description, price, category, brand) VALUES "
+            "('Phone', 'A phone', 10, 'Smartphones', 'Apple'), ('Shirt', 'A shirt', 5, 'Clothing', NULL)"))
+
+    assert upgrade(engine) == [version for version, _, _ in MIGRATIONS]
+    assert upgrade(engine) == []
+
+    with engine.connect() as connection:
+        keys = connection.execute(text('SELECT category_key, brand_key FROM products ORDER BY id')).all()
+    assert [tuple(row) for row in keys] == [('smartphones', 'apple'), ('clothing', None)]
+    indexes = {index['name'] for index in inspect(engine).get_indexes('products')}
+    assert {index.name for index in Product.__table__.indexes} <= indexes
+
+
+def test_ranked_query_is_restricted_by_indexes(app):
+    """Test that the default ranked search narrows rows through indexes instead of scanning products"""
+    engine = ChatbotEngine(search_backend='sql')
+    plans = query_plans(lambda: engine._rank_database(categories=['electronics'], brands=['apple'],
+                                                      price_max=1000))
+    assert plans[0].startswith('MULTI-INDEX OR')
+    for index in ('ix_products_category_key_rating_price', 'ix_products_brand_key_price', 'ix_products_price',
+                  'ix_products_rating_price'):
+        assert index in plans[0]